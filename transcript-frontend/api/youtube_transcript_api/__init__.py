@@ -1,10 +1,14 @@
 # ruff: noqa: F401
 from ._api import YouTubeTranscriptApi
+from ._async_api import AsyncYouTubeTranscriptApi, AsyncTranscript
 from ._transcripts import (
     TranscriptList,
+    TranscriptListSource,
+    TranscriptFormat,
     Transcript,
     FetchedTranscript,
     FetchedTranscriptSnippet,
+    TranscriptFetchResult,
 )
 from ._errors import (
     YouTubeTranscriptApiException,
@@ -1,14 +1,36 @@
+import copy
+import threading
 import warnings
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Optional, Iterable, Union
+from typing import Callable, Optional, Iterable, Iterator, List, Union, Deque
 
 from http.cookiejar import MozillaCookieJar, LoadError
 
 from requests import Session
-
+from requests.adapters import BaseAdapter, HTTPAdapter
+
+from .caching import (
+    TranscriptListCache,
+    SQLiteTranscriptStore,
+    ErrorCache,
+    RequestCoalescer,
+)
+from .json_backends import JsonBackend, get_default_json_backend
 from .proxies import ProxyConfig, GenericProxyConfig
-
-from ._transcripts import TranscriptListFetcher, FetchedTranscript, TranscriptList
+from .rate_limiting import RateLimiter
+from .retries import RetryPolicy
+
+from ._transcripts import (
+    TranscriptListFetcher,
+    TranscriptListSource,
+    TranscriptFormat,
+    FetchedTranscript,
+    FetchedTranscriptSnippet,
+    TranscriptFetchResult,
+    TranscriptList,
+)
 
 from ._errors import CookiePathInvalid, CookieInvalid
 
@@ -24,17 +46,84 @@ def _load_cookie_jar(cookies: Union[Path, str]) -> MozillaCookieJar:
         raise CookiePathInvalid(cookies)
 
 
+class _ThreadFetchers:
+    """
+    The fetchers of the worker threads of a single `fetch_many` call. Each worker
+    thread gets its own copy of the `Session`, made the way `requests` pickles
+    sessions, so it keeps the class, headers, hooks, proxies, auth and all other
+    settings of the original. Cookies are shared between all of them, as cookie jars
+    are thread-safe. Plain `HTTPAdapter`s are copied along with their settings, like
+    `max_retries`, so each thread keeps its own connection pool. Any other adapter
+    mounted on the session is shared, as its state can't be copied reliably.
+    """
+
+    def __init__(
+        self,
+        http_client: Session,
+        create_fetcher: Callable[[Session], TranscriptListFetcher],
+    ):
+        self._http_client = http_client
+        self._create_fetcher = create_fetcher
+        self._thread_local = threading.local()
+        self._lock = threading.Lock()
+        self._adapters: List[BaseAdapter] = []
+
+    def get(self) -> TranscriptListFetcher:
+        fetcher = getattr(self._thread_local, "fetcher", None)
+        if fetcher is None:
+            fetcher = self._thread_local.fetcher = self._create_fetcher(
+                self._copy_http_client()
+            )
+        return fetcher
+
+    def close(self) -> None:
+        """
+        Closes the connection pools of the copied adapters, while the shared ones are
+        left open, as they still belong to the original session.
+        """
+        with self._lock:
+            adapters, self._adapters = self._adapters, []
+        for adapter in adapters:
+            adapter.close()
+
+    def _copy_http_client(self) -> Session:
+        http_client = copy.copy(self._http_client)
+        http_client.headers = self._http_client.headers.copy()
+        http_client.proxies = self._http_client.proxies.copy()
+        http_client.adapters = OrderedDict()
+        for prefix, adapter in self._http_client.adapters.items():
+            if type(adapter) is HTTPAdapter:
+                adapter = copy.copy(adapter)
+                with self._lock:
+                    self._adapters.append(adapter)
+            http_client.mount(prefix, adapter)
+        return http_client
+
+
 class YouTubeTranscriptApi:
     def __init__(
         self,
         cookie_path: Optional[Union[Path, str]] = None,
         proxy_config: Optional[ProxyConfig] = None,
         http_client: Optional[Session] = None,
+        stream_watch_page: bool = False,
+        transcript_list_source: TranscriptListSource = TranscriptListSource.WATCH_PAGE,
+        transcript_list_cache: Optional[TranscriptListCache] = None,
+        transcript_store: Optional[SQLiteTranscriptStore] = None,
+        error_cache: Optional[ErrorCache] = None,
+        request_coalescer: Optional[RequestCoalescer] = None,
+        json_backend: Optional[JsonBackend] = None,
+        transcript_format: TranscriptFormat = TranscriptFormat.XML,
+        lazy_parsing: bool = False,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
     ):
         """
         Note on thread-safety: As this class will initialize a `requests.Session`
         object, it is not thread-safe. Make sure to initialize an instance of
         `YouTubeTranscriptApi` per thread, if used in a multi-threading scenario!
+        If you want to fetch the transcripts of multiple videos in parallel, you can
+        use `fetch_many`, which manages a thread pool for you.
 
         :param cookie_path: Path to a text file containing YouTube authorization cookies
         :param proxy_config: an optional ProxyConfig object, defining proxies used for
@@ -45,6 +134,60 @@ class YouTubeTranscriptApi:
         :param http_client: You can optionally pass in a requests.Session object, if you
             manually want to share cookies between different instances of
             `YouTubeTranscriptApi`, overwrite defaults, specify SSL certificates, etc.
+            `fetch_many` gives each of its worker threads a copy of this session,
+            which shares its cookies and any adapters mounted on it, except for
+            plain `HTTPAdapter`s, which are copied with their settings.
+        :param stream_watch_page: If this is set, the download of the video's watch
+            page is aborted as soon as the data required to list its transcripts has
+            been received, which is usually about halfway through the page. This saves
+            traffic, which is especially useful if you are using proxies that are
+            billed by traffic. However, the connection used can't be reused afterward.
+        :param transcript_list_source: Where the list of available transcripts is
+            retrieved from. By default, it is scraped from the video's watch page. Using
+            `TranscriptListSource.INNERTUBE` requests it from YouTube's player API
+            instead, which is faster and requires less traffic. Should the player API
+            fail to provide the list, the watch page is used as a fallback.
+        :param transcript_list_cache: an optional `TranscriptListCache`, which keeps
+            the lists of transcripts available for recently requested videos in
+            memory, so they don't have to be retrieved from YouTube again every time
+            the transcripts of a popular video are requested.
+        :param transcript_store: an optional `SQLiteTranscriptStore`, which persists
+            fetched transcripts, so they are served without any requests to YouTube
+            when they are fetched again, even after a restart.
+        :param error_cache: an optional `ErrorCache`, which remembers videos that
+            have failed with a permanent error, like `VideoUnavailable` or
+            `TranscriptsDisabled`, and raises the same error again right away, without
+            making any requests to YouTube.
+        :param request_coalescer: an optional `RequestCoalescer`. If it is set,
+            concurrent requests for the same video, for example in `fetch_many` or
+            in a web server sharing a coalescer between its threads, only hit YouTube
+            once and all of them receive the same transcript or exception.
+        :param json_backend: the `JsonBackend` used to decode the data received from
+            YouTube. Defaults to orjson if it is installed and to the standard
+            library otherwise, see `json_backends.get_default_json_backend`.
+        :param transcript_format: The format transcripts are downloaded in. By
+            default, this is YouTube's timedtext XML, which is also the fastest to
+            parse. `TranscriptFormat.SRV3` is the smallest to download, while
+            `TranscriptFormat.JSON3` is about twice the size. Transcripts are still
+            downloaded as XML if formatting is preserved or if a response can't be
+            parsed. The transcripts fetched are the same, whichever format is used.
+        :param lazy_parsing: If enabled, fetched transcripts keep the timedtext XML
+            they have been downloaded as and only parse it once their snippets are
+            accessed. The XML is available as `FetchedTranscript.payload`, so
+            transcripts which are only stored or forwarded are never parsed. Errors in
+            the XML are raised once the snippets are accessed. Transcripts are always
+            downloaded as XML if this is enabled.
+        :param retry_policy: an optional `RetryPolicy`, which retries requests that
+            have failed with a transient HTTP status, like 429 or 503, after an
+            exponentially growing, randomized delay. Each request is retried on its
+            own, so a failed transcript download doesn't request the watch page again.
+            If the proxy config retries blocked requests, these retries are delayed
+            by the policy as well.
+        :param rate_limiter: an optional `RateLimiter`, which every request to
+            YouTube waits for before it is sent, so requests are sent at a steady
+            rate instead of as fast as possible. Share a single limiter between all
+            instances and threads of a process, including the workers of
+            `fetch_many`, to limit the rate of the whole process.
         """
         http_client = Session() if http_client is None else http_client
         http_client.headers.update({"Accept-Language": "en-US"})
@@ -54,7 +197,43 @@ class YouTubeTranscriptApi:
             http_client.proxies = proxy_config.to_requests_dict()
             if proxy_config.prevent_keeping_connections_alive:
                 http_client.headers.update({"Connection": "close"})
-        self._fetcher = TranscriptListFetcher(http_client, proxy_config=proxy_config)
+        self._http_client = http_client
+        self._proxy_config = proxy_config
+        self._stream_watch_page = stream_watch_page
+        self._transcript_list_source = transcript_list_source
+        self._transcript_list_cache = transcript_list_cache
+        self._transcript_store = transcript_store
+        self._error_cache = error_cache
+        self._request_coalescer = request_coalescer
+        self._json_backend = (
+            get_default_json_backend() if json_backend is None else json_backend
+        )
+        self._transcript_format = transcript_format
+        self._lazy_parsing = lazy_parsing
+        self._retry_policy = retry_policy
+        self._rate_limiter = (
+            None
+            if rate_limiter is None
+            else rate_limiter.with_proxy_config(proxy_config)
+        )
+        self._fetcher = self._create_fetcher(http_client)
+
+    def _create_fetcher(self, http_client: Session) -> TranscriptListFetcher:
+        return TranscriptListFetcher(
+            http_client,
+            proxy_config=self._proxy_config,
+            stream_watch_page=self._stream_watch_page,
+            source=self._transcript_list_source,
+            cache=self._transcript_list_cache,
+            store=self._transcript_store,
+            error_cache=self._error_cache,
+            coalescer=self._request_coalescer,
+            json_backend=self._json_backend,
+            transcript_format=self._transcript_format,
+            lazy_parsing=self._lazy_parsing,
+            retry_policy=self._retry_policy,
+            rate_limiter=self._rate_limiter,
+        )
 
     def fetch(
         self,
@@ -75,11 +254,166 @@ class YouTubeTranscriptApi:
             it fails to do so. This defaults to ["en"].
         :param preserve_formatting: whether to keep select HTML text formatting
         """
-        return (
-            self.list(video_id)
-            .find_transcript(languages)
-            .fetch(preserve_formatting=preserve_formatting)
+        return self._fetch_with(self._fetcher, video_id, languages, preserve_formatting)
+
+    def _fetch_with(
+        self,
+        fetcher: TranscriptListFetcher,
+        video_id: str,
+        languages: Iterable[str],
+        preserve_formatting: bool,
+    ) -> FetchedTranscript:
+        if self._transcript_store is None:
+            return (
+                fetcher.fetch(video_id)
+                .find_transcript(languages)
+                .fetch(preserve_formatting=preserve_formatting)
+            )
+        languages = tuple(languages)
+        fetched_transcript = self._transcript_store.find(
+            video_id, languages, preserve_formatting
         )
+        if fetched_transcript is None:
+            transcript = fetcher.fetch(video_id).find_transcript(languages)
+            fetched_transcript = transcript.fetch(
+                preserve_formatting=preserve_formatting
+            )
+            self._transcript_store.put_selection(
+                video_id, languages, transcript.language_code, transcript.is_generated
+            )
+        return fetched_transcript
+
+    def stream(
+        self,
+        video_id: str,
+        languages: Iterable[str] = ("en",),
+        preserve_formatting: bool = False,
+    ) -> Iterator[FetchedTranscriptSnippet]:
+        """
+        Retrieves the transcript for a single video like `fetch` does, but yields its
+        snippets while it is still being downloaded. This is a shortcut for calling:
+        `YouTubeTranscriptApi().list(video_id).find_transcript(languages).stream(preserve_formatting=preserve_formatting)`
+
+        The download is stopped if you stop iterating early, so this is cheaper than
+        `fetch` if you only need the beginning of a transcript:
+
+        ```
+        for snippet in ytt_api.stream(video_id):
+            if snippet.start > 60:
+                break
+            print(snippet.text)
+        ```
+
+        :param video_id: the ID of the video you want to retrieve the transcript for.
+            Make sure that this is the actual ID, NOT the full URL to the video!
+        :param languages: A list of language codes in a descending priority. This
+            defaults to ["en"].
+        :param preserve_formatting: whether to keep select HTML text formatting
+        """
+        if self._transcript_store is None:
+            yield from (
+                self._fetcher.fetch(video_id)
+                .find_transcript(languages)
+                .stream(preserve_formatting=preserve_formatting)
+            )
+            return
+        languages = tuple(languages)
+        fetched_transcript = self._transcript_store.find(
+            video_id, languages, preserve_formatting
+        )
+        if fetched_transcript is not None:
+            yield from fetched_transcript
+            return
+        transcript = self._fetcher.fetch(video_id).find_transcript(languages)
+        self._transcript_store.put_selection(
+            video_id, languages, transcript.language_code, transcript.is_generated
+        )
+        yield from transcript.stream(preserve_formatting=preserve_formatting)
+
+    def fetch_many(
+        self,
+        video_ids: Iterable[str],
+        languages: Iterable[str] = ("en",),
+        max_workers: int = 8,
+        ordered: bool = False,
+        preserve_formatting: bool = False,
+    ) -> Iterator[TranscriptFetchResult]:
+        """
+        Retrieves the transcripts of multiple videos in parallel, using a pool of
+        `max_workers` threads. A `TranscriptFetchResult` is yielded for each video.
+        A video failing doesn't stop the others, instead its result holds the
+        exception that has been raised:
+
+        ```
+        ytt_api = YouTubeTranscriptApi()
+        for result in ytt_api.fetch_many(video_ids, max_workers=16):
+            if result.exception is None:
+                print(result.video_id, result.transcript)
+        ```
+
+        `video_ids` is consumed lazily and at most `2 * max_workers` videos are
+        submitted to the pool without their results having been yielded, so memory
+        usage stays flat, no matter how many videos are fetched.
+
+        :param video_ids: the IDs of the videos you want to retrieve transcripts for
+        :param languages: A list of language codes in a descending priority. This
+            defaults to ["en"].
+        :param max_workers: the number of threads fetching transcripts in parallel
+        :param ordered: By default, results are yielded as soon as they are done. If
+            this is set, they are yielded in the order of `video_ids` instead.
+        :param preserve_formatting: whether to keep select HTML text formatting
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        languages = tuple(languages)
+        max_in_flight = 2 * max_workers
+        video_id_iterator = iter(video_ids)
+        in_flight: Deque["Future[TranscriptFetchResult]"] = deque()
+        thread_fetchers = _ThreadFetchers(self._http_client, self._create_fetcher)
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            while True:
+                for video_id in video_id_iterator:
+                    in_flight.append(
+                        executor.submit(
+                            self._fetch_result,
+                            video_id,
+                            languages,
+                            preserve_formatting,
+                            thread_fetchers,
+                        )
+                    )
+                    if len(in_flight) >= max_in_flight:
+                        break
+                if not in_flight:
+                    return
+                if ordered:
+                    yield in_flight.popleft().result()
+                    continue
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    in_flight.remove(future)
+                    yield future.result()
+        finally:
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=True)
+            thread_fetchers.close()
+
+    def _fetch_result(
+        self,
+        video_id: str,
+        languages: Iterable[str],
+        preserve_formatting: bool,
+        thread_fetchers: _ThreadFetchers,
+    ) -> TranscriptFetchResult:
+        try:
+            transcript = self._fetch_with(
+                thread_fetchers.get(), video_id, languages, preserve_formatting
+            )
+        except Exception as exception:
+            return TranscriptFetchResult(video_id, exception=exception)
+        return TranscriptFetchResult(video_id, transcript=transcript)
 
     def list(
         self,
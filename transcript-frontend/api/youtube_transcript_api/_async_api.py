@@ -0,0 +1,506 @@
+import asyncio
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Optional,
+    Set,
+    TypeVar,
+    Union,
+)
+
+try:  # pragma: no cover
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+from .caching import TranscriptListCache, ErrorCache, RequestCoalescer
+from .json_backends import JsonBackend
+from .proxies import ProxyConfig
+from .rate_limiting import RateLimiter
+from .retries import RetryPolicy
+
+from ._api import _load_cookie_jar
+from ._errors import (
+    CouldNotRetrieveTranscript,
+    YouTubeRequestFailed,
+    YouTubeDataUnparsable,
+    RequestBlocked,
+    FailedToCreateConsentCookie,
+)
+from ._settings import WATCH_URL, INNERTUBE_API_URL, INNERTUBE_CONTEXT
+from ._transcripts import (
+    FetchedTranscript,
+    FetchedTranscriptSnippet,
+    Transcript,
+    TranscriptFetchResult,
+    TranscriptKey,
+    TranscriptList,
+    TranscriptListFetcher,
+    TranscriptListSource,
+    TranscriptFormat,
+    _TranscriptPullParser,
+    _WatchPage,
+    _WatchPageReader,
+    _get_encoding,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from httpx import AsyncClient, Response
+
+T = TypeVar("T")
+
+
+def _raise_http_errors(response: "Response", video_id: str) -> "Response":
+    try:
+        response.raise_for_status()
+        return response
+    except httpx.HTTPStatusError as error:
+        raise YouTubeRequestFailed(video_id, error)
+
+
+async def _acall_with_retries(
+    retry_policy: Optional[RetryPolicy], function: Callable[[], Awaitable[T]]
+) -> T:
+    if retry_policy is None:
+        return await function()
+    return await retry_policy.acall(function)
+
+
+async def _await_rate_limiter(rate_limiter: Optional[RateLimiter], url: str) -> None:
+    if rate_limiter is not None:
+        await rate_limiter.aacquire(url)
+
+
+class AsyncTranscript(Transcript):
+    """
+    The asyncio counterpart of `Transcript`, which is returned by the `TranscriptList`
+    objects created by `AsyncYouTubeTranscriptApi`. Its `fetch` method has to be
+    awaited and its `stream` method is an asynchronous generator.
+    """
+
+    __slots__ = ()
+
+    async def fetch(self, preserve_formatting: bool = False) -> FetchedTranscript:
+        """
+        Loads the actual transcript data.
+        :param preserve_formatting: whether to keep select HTML text formatting
+        """
+        key = self._key(preserve_formatting)
+        if self._coalescer is None:
+            return await self._download(key)
+        return await self._coalescer.acall(key, lambda: self._download(key))
+
+    async def stream(  # type: ignore[override]
+        self, preserve_formatting: bool = False
+    ) -> AsyncIterator[FetchedTranscriptSnippet]:
+        """
+        Yields the snippets while the transcript is still being downloaded. See
+        `Transcript.stream`.
+        :param preserve_formatting: whether to keep select HTML text formatting
+        """
+        response = await _acall_with_retries(self._retry_policy, self._open_stream)
+        try:
+            parser = _TranscriptPullParser(preserve_formatting)
+            async for chunk in response.aiter_bytes(self.STREAM_CHUNK_SIZE):
+                parser.feed(chunk)
+                for snippet in parser.read_snippets():
+                    yield snippet
+            parser.close()
+            for snippet in parser.read_snippets():
+                yield snippet
+        finally:
+            await response.aclose()
+
+    async def _open_stream(self) -> "Response":  # type: ignore[override]
+        await _await_rate_limiter(self._rate_limiter, self._url)
+        response = await self._http_client.send(
+            self._http_client.build_request("GET", self._url), stream=True
+        )
+        try:
+            return _raise_http_errors(response, self.video_id)
+        except YouTubeRequestFailed:
+            await response.aclose()
+            raise
+
+    async def _download(self, key: TranscriptKey) -> FetchedTranscript:
+        transcript_format = self._negotiate_format(key.preserve_formatting)
+        if transcript_format is not TranscriptFormat.XML:
+            response = await self._get(self._format_url(transcript_format))
+            fetched_transcript = self._build_fetched_transcript_or_none(
+                response.content, transcript_format
+            )
+            if fetched_transcript is not None:
+                return fetched_transcript
+        return self._build_xml_fetched_transcript(
+            await self._get(self._url), key.preserve_formatting
+        )
+
+    async def _get(self, url: str) -> "Response":  # type: ignore[override]
+        async def get() -> "Response":
+            await _await_rate_limiter(self._rate_limiter, url)
+            return _raise_http_errors(await self._http_client.get(url), self.video_id)
+
+        return await _acall_with_retries(self._retry_policy, get)
+
+
+class AsyncTranscriptListFetcher(TranscriptListFetcher):
+    """
+    The asyncio counterpart of `TranscriptListFetcher`. It only replaces the methods
+    doing I/O, everything that parses and validates the data YouTube returns is shared
+    with the blocking implementation.
+    """
+
+    async def fetch(self, video_id: str) -> TranscriptList:
+        captions_json = self._get_cached_captions_json(video_id)
+        if captions_json is None:
+            if self._coalescer is None:
+                captions_json = await self._fetch_and_cache_captions_json(video_id)
+            else:
+                captions_json = await self._coalescer.acall(
+                    self._coalescing_key(video_id),
+                    lambda: self._fetch_and_cache_captions_json(video_id),
+                )
+        return TranscriptList.build(
+            self._http_client,
+            video_id,
+            captions_json,
+            transcript_class=AsyncTranscript,
+            coalescer=self._coalescer,
+            transcript_format=self._transcript_format,
+            json_backend=self._json_backend,
+            lazy_parsing=self._lazy_parsing,
+            retry_policy=self._retry_policy,
+            rate_limiter=self._rate_limiter,
+        )
+
+    async def _fetch_and_cache_captions_json(self, video_id: str) -> Dict:
+        try:
+            captions_json = await self._fetch_captions_json(video_id)
+        except CouldNotRetrieveTranscript as exception:
+            self._cache_error(video_id, exception)
+            raise
+        self._cache_captions_json(video_id, captions_json)
+        return captions_json
+
+    async def _fetch_captions_json(self, video_id: str, try_number: int = 0) -> Dict:
+        try:
+            return await self._fetch_captions_json_from_source(video_id)
+        except RequestBlocked as exception:
+            delay = self._get_blocked_retry_delay(try_number)
+            if delay is None:
+                raise exception.with_proxy_config(self._proxy_config)
+        if delay:
+            await asyncio.sleep(delay)
+        return await self._fetch_captions_json(video_id, try_number=try_number + 1)
+
+    async def _fetch_captions_json_from_source(self, video_id: str) -> Dict:
+        if self._source == TranscriptListSource.INNERTUBE:
+            try:
+                return self._extract_captions_json(
+                    await self._fetch_innertube_data(video_id), video_id
+                )
+            except self.INNERTUBE_FALLBACK_EXCEPTIONS:
+                pass
+        return self._extract_captions_json(
+            self._extract_video_data(await self._fetch_video_page(video_id), video_id),
+            video_id,
+        )
+
+    async def _fetch_video_page(self, video_id: str) -> _WatchPage:
+        page = await self._download_watch_page(video_id)
+        if page.requires_consent:
+            self._create_consent_cookie(page, video_id)
+            page = await self._download_watch_page(video_id)
+            if page.requires_consent:
+                raise FailedToCreateConsentCookie(video_id)
+        return page
+
+    async def _fetch_innertube_data(self, video_id: str) -> Dict:
+        async def post() -> "Response":
+            await _await_rate_limiter(self._rate_limiter, INNERTUBE_API_URL)
+            return _raise_http_errors(
+                await self._http_client.post(
+                    INNERTUBE_API_URL,
+                    json={"context": INNERTUBE_CONTEXT, "videoId": video_id},
+                ),
+                video_id,
+            )
+
+        response = await _acall_with_retries(self._retry_policy, post)
+        try:
+            video_data = self._json_backend.loads(response.content)
+        except ValueError:
+            raise YouTubeDataUnparsable(video_id)
+        if not isinstance(video_data, dict):
+            raise YouTubeDataUnparsable(video_id)
+        return video_data
+
+    async def _download_watch_page(self, video_id: str) -> _WatchPage:
+        if self._stream_watch_page:
+            return await _acall_with_retries(
+                self._retry_policy,
+                lambda: self._download_streamed_watch_page(video_id),
+            )
+
+        async def get() -> "Response":
+            url = WATCH_URL.format(video_id=video_id)
+            await _await_rate_limiter(self._rate_limiter, url)
+            return _raise_http_errors(await self._http_client.get(url), video_id)
+
+        response = await _acall_with_retries(self._retry_policy, get)
+        return _WatchPage(response.content, _get_encoding(response))
+
+    async def _download_streamed_watch_page(self, video_id: str) -> _WatchPage:
+        url = WATCH_URL.format(video_id=video_id)
+        await _await_rate_limiter(self._rate_limiter, url)
+        async with self._http_client.stream("GET", url) as response:
+            _raise_http_errors(response, video_id)
+            reader = _WatchPageReader(_get_encoding(response))
+            async for chunk in response.aiter_bytes(self.WATCH_PAGE_CHUNK_SIZE):
+                if reader.feed(chunk):
+                    break
+            return reader.page
+
+
+class AsyncYouTubeTranscriptApi:
+    def __init__(
+        self,
+        cookie_path: Optional[Union[Path, str]] = None,
+        proxy_config: Optional[ProxyConfig] = None,
+        http_client: Optional["AsyncClient"] = None,
+        stream_watch_page: bool = False,
+        transcript_list_source: TranscriptListSource = TranscriptListSource.WATCH_PAGE,
+        max_connections: Optional[int] = 100,
+        transcript_list_cache: Optional[TranscriptListCache] = None,
+        error_cache: Optional[ErrorCache] = None,
+        request_coalescer: Optional[RequestCoalescer] = None,
+        json_backend: Optional[JsonBackend] = None,
+        transcript_format: TranscriptFormat = TranscriptFormat.XML,
+        lazy_parsing: bool = False,
+        retry_policy: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        """
+        The asyncio counterpart of `YouTubeTranscriptApi`, which is built on top of
+        `httpx` (`pip install httpx`). All requests are sent through a single
+        `httpx.AsyncClient`, which pools its connections, so a single process can
+        keep hundreds of fetches in flight. Make sure to close it once you are done,
+        either by calling `aclose()` or by using the instance as an async context
+        manager:
+
+        ```
+        async with AsyncYouTubeTranscriptApi() as ytt_api:
+            transcript = await ytt_api.fetch(video_id)
+        ```
+
+        :param cookie_path: Path to a text file containing YouTube authorization cookies
+        :param proxy_config: an optional ProxyConfig object, defining proxies used for
+            all network requests. As `httpx` only allows for mounting proxies when a
+            client is created, this can't be combined with `http_client`.
+        :param http_client: You can optionally pass in a `httpx.AsyncClient` object,
+            if you manually want to share cookies or connections between different
+            instances of `AsyncYouTubeTranscriptApi`, overwrite defaults, etc. A client
+            passed in is not closed by `aclose()`. Proxies have to be mounted on the
+            client itself, as `proxy_config` can't be applied to it.
+        :param stream_watch_page: see `YouTubeTranscriptApi`
+        :param transcript_list_source: see `YouTubeTranscriptApi`
+        :param max_connections: the maximum number of connections the connection
+            pool may open at once. None removes the limit. This is ignored if a
+            `http_client` is passed in.
+        :param transcript_list_cache: see `YouTubeTranscriptApi`
+        :param error_cache: see `YouTubeTranscriptApi`
+        :param request_coalescer: see `YouTubeTranscriptApi`
+        :param json_backend: see `YouTubeTranscriptApi`
+        :param transcript_format: see `YouTubeTranscriptApi`
+        :param lazy_parsing: see `YouTubeTranscriptApi`
+        :param retry_policy: see `YouTubeTranscriptApi`
+        :param rate_limiter: see `YouTubeTranscriptApi`
+        """
+        if httpx is None:  # pragma: no cover
+            raise ImportError(
+                "AsyncYouTubeTranscriptApi requires httpx, which can be installed "
+                "by running: pip install httpx"
+            )
+        if http_client is not None and proxy_config is not None:
+            raise ValueError(
+                "proxy_config can't be applied to a http_client which is passed in, "
+                "mount the proxies on the http_client instead"
+            )
+        self._owns_http_client = http_client is None
+        if http_client is None:
+            limits = httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            )
+            http_client = httpx.AsyncClient(
+                follow_redirects=True,
+                limits=limits,
+                mounts=self._build_proxy_mounts(proxy_config, limits),
+            )
+        http_client.headers.update({"Accept-Language": "en-US"})
+        if cookie_path is not None:
+            http_client.cookies = _load_cookie_jar(cookie_path)
+        if proxy_config is not None and proxy_config.prevent_keeping_connections_alive:
+            http_client.headers.update({"Connection": "close"})
+        self._http_client = http_client
+        self._fetcher = AsyncTranscriptListFetcher(
+            http_client,
+            proxy_config=proxy_config,
+            stream_watch_page=stream_watch_page,
+            source=transcript_list_source,
+            cache=transcript_list_cache,
+            error_cache=error_cache,
+            coalescer=request_coalescer,
+            json_backend=json_backend,
+            transcript_format=transcript_format,
+            lazy_parsing=lazy_parsing,
+            retry_policy=retry_policy,
+            rate_limiter=(
+                None
+                if rate_limiter is None
+                else rate_limiter.with_proxy_config(proxy_config)
+            ),
+        )
+
+    @staticmethod
+    def _build_proxy_mounts(
+        proxy_config: Optional[ProxyConfig], limits: "httpx.Limits"
+    ) -> Optional[Dict[str, "httpx.AsyncHTTPTransport"]]:
+        if proxy_config is None:
+            return None
+        return {
+            f"{scheme}://": httpx.AsyncHTTPTransport(proxy=proxy_url, limits=limits)
+            for scheme, proxy_url in proxy_config.to_requests_dict().items()
+            if proxy_url
+        }
+
+    async def __aenter__(self) -> "AsyncYouTubeTranscriptApi":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Closes the connection pool, unless the http client has been passed in.
+        """
+        if self._owns_http_client:
+            await self._http_client.aclose()
+
+    async def fetch(
+        self,
+        video_id: str,
+        languages: Iterable[str] = ("en",),
+        preserve_formatting: bool = False,
+    ) -> FetchedTranscript:
+        """
+        Retrieves the transcript for a single video. See `YouTubeTranscriptApi.fetch`.
+
+        :param video_id: the ID of the video you want to retrieve the transcript for.
+            Make sure that this is the actual ID, NOT the full URL to the video!
+        :param languages: A list of language codes in a descending priority.
+        :param preserve_formatting: whether to keep select HTML text formatting
+        """
+        transcript_list = await self.list(video_id)
+        return await transcript_list.find_transcript(languages).fetch(
+            preserve_formatting=preserve_formatting
+        )
+
+    async def stream(
+        self,
+        video_id: str,
+        languages: Iterable[str] = ("en",),
+        preserve_formatting: bool = False,
+    ) -> AsyncIterator[FetchedTranscriptSnippet]:
+        """
+        Yields the snippets of the transcript for a single video while it is still
+        being downloaded. See `YouTubeTranscriptApi.stream`.
+
+        :param video_id: the ID of the video you want to retrieve the transcript for.
+            Make sure that this is the actual ID, NOT the full URL to the video!
+        :param languages: A list of language codes in a descending priority.
+        :param preserve_formatting: whether to keep select HTML text formatting
+        """
+        transcript_list = await self.list(video_id)
+        async for snippet in transcript_list.find_transcript(languages).stream(
+            preserve_formatting=preserve_formatting
+        ):
+            yield snippet
+
+    async def list(self, video_id: str) -> TranscriptList:
+        """
+        Retrieves the list of transcripts which are available for a given video. See
+        `YouTubeTranscriptApi.list`. The `Transcript` objects in the returned list
+        are `AsyncTranscript` objects, so their `fetch` method has to be awaited.
+
+        :param video_id: the ID of the video you want to retrieve the transcript for.
+            Make sure that this is the actual ID, NOT the full URL to the video!
+        """
+        return await self._fetcher.fetch(video_id)
+
+    async def fetch_many(
+        self,
+        video_ids: Iterable[str],
+        languages: Iterable[str] = ("en",),
+        preserve_formatting: bool = False,
+        concurrency: int = 10,
+    ) -> AsyncIterator[TranscriptFetchResult]:
+        """
+        Retrieves the transcripts of multiple videos concurrently and yields a
+        `TranscriptFetchResult` for each video as soon as it is done, so the results
+        are not ordered like `video_ids`. A video failing doesn't stop the others,
+        instead its result holds the exception that has been raised:
+
+        ```
+        async for result in ytt_api.fetch_many(video_ids, concurrency=50):
+            if result.exception is None:
+                print(result.video_id, result.transcript)
+        ```
+
+        `video_ids` is consumed lazily, so never more than `concurrency` videos are
+        in flight at once.
+
+        :param video_ids: the IDs of the videos you want to retrieve transcripts for
+        :param languages: A list of language codes in a descending priority.
+        :param preserve_formatting: whether to keep select HTML text formatting
+        :param concurrency: the maximum number of videos fetched at once
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        languages = tuple(languages)
+        video_id_iterator = iter(video_ids)
+        pending: Set["asyncio.Future[TranscriptFetchResult]"] = set()
+        try:
+            while True:
+                for video_id in video_id_iterator:
+                    pending.add(
+                        asyncio.ensure_future(
+                            self._fetch_result(video_id, languages, preserve_formatting)
+                        )
+                    )
+                    if len(pending) >= concurrency:
+                        break
+                if not pending:
+                    return
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def _fetch_result(
+        self, video_id: str, languages: Iterable[str], preserve_formatting: bool
+    ) -> TranscriptFetchResult:
+        try:
+            transcript = await self.fetch(video_id, languages, preserve_formatting)
+        except Exception as exception:
+            return TranscriptFetchResult(video_id, exception=exception)
+        return TranscriptFetchResult(video_id, transcript=transcript)
@@ -145,6 +145,11 @@ class YouTubeTranscriptCli:
             type=str,
             default="pretty",
             choices=tuple(FormatterLoader.TYPES.keys()),
+            help=(
+                "The format the transcripts are printed in. json is encoded by the standard "
+                "library, exactly like json.dumps does, so non-ASCII characters are escaped, "
+                "even if orjson is installed."
+            ),
         )
         parser.add_argument(
             "--translate",
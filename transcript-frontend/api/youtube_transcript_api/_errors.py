@@ -1,8 +1,8 @@
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
 from typing import Iterable, Optional, List
 
-from requests import HTTPError
-
 from ._settings import WATCH_URL
 from .proxies import ProxyConfig, GenericProxyConfig, WebshareProxyConfig
 
@@ -76,11 +76,47 @@ class YouTubeDataUnparsable(CouldNotRetrieveTranscript):
     )
 
 
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Returns the number of seconds a `Retry-After` header asks to wait, which is given
+    either as a number of seconds or as an HTTP date. Returns None if there is no
+    header or it can't be parsed.
+    """
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
 class YouTubeRequestFailed(CouldNotRetrieveTranscript):
     CAUSE_MESSAGE = "Request to YouTube failed: {reason}"
 
-    def __init__(self, video_id: str, http_error: HTTPError):
+    def __init__(self, video_id: str, http_error: Exception):
+        """
+        :param http_error: the `HTTPError` raised by requests or the
+            `HTTPStatusError` raised by httpx
+        """
         self.reason = str(http_error)
+        response = getattr(http_error, "response", None)
+        # the status code and the seconds YouTube asked to wait before retrying,
+        # which are None if they aren't known
+        self.status_code: Optional[int] = (
+            None if response is None else response.status_code
+        )
+        self.retry_after = (
+            None
+            if response is None
+            else _parse_retry_after(response.headers.get("Retry-After"))
+        )
         super().__init__(video_id)
 
     @property
@@ -1 +1,3 @@
 WATCH_URL = "https://www.youtube.com/watch?v={video_id}"
+INNERTUBE_API_URL = "https://www.youtube.com/youtubei/v1/player?prettyPrint=false"
+INNERTUBE_CONTEXT = {"client": {"clientName": "ANDROID", "clientVersion": "20.10.38"}}
@@ -1,10 +1,32 @@
+import codecs
 import json
-from dataclasses import dataclass, asdict
+import time
+from array import array
+from json.decoder import scanstring
+from json.encoder import encode_basestring, encode_basestring_ascii
+from dataclasses import dataclass, fields, replace
+from math import isfinite
 from enum import Enum
-from itertools import chain
+from itertools import accumulate, chain
 
 from html import unescape
-from typing import List, Dict, Iterator, Iterable, Pattern, Optional
+from typing import (
+    Callable,
+    List,
+    Dict,
+    Iterator,
+    Iterable,
+    Match,
+    Optional,
+    Tuple,
+    Any,
+    Type,
+    TypeVar,
+    NamedTuple,
+    Sequence,
+    Union,
+    TYPE_CHECKING,
+)
 
 from defusedxml import ElementTree
 
@@ -12,8 +34,10 @@ import re
 
 from requests import HTTPError, Session, Response
 
+from .json_backends import JsonBackend, get_default_json_backend
 from .proxies import ProxyConfig
 from ._errors import (
+    CouldNotRetrieveTranscript,
     VideoUnavailable,
     YouTubeRequestFailed,
     NoTranscriptFound,
@@ -28,11 +52,43 @@ from ._errors import (
     VideoUnplayable,
     YouTubeDataUnparsable,
 )
-from ._settings import WATCH_URL
+from ._settings import WATCH_URL, INNERTUBE_API_URL, INNERTUBE_CONTEXT
 
+if TYPE_CHECKING:  # pragma: no cover
+    from .caching import (
+        TranscriptListCache,
+        SQLiteTranscriptStore,
+        ErrorCache,
+        RequestCoalescer,
+    )
+    from .rate_limiting import RateLimiter
+    from .retries import RetryPolicy
+
+T = TypeVar("T")
+
+
+class _FrozenSlots:
+    """
+    Base class of the frozen dataclasses with `__slots__`, which saves the attribute
+    dict of each instance. It makes them picklable and copyable, which doesn't work
+    out of the box, as unpickling assigns the slots using `setattr`, which frozen
+    dataclasses don't allow.
+    """
+
+    __slots__ = ()
+
+    def __getstate__(self) -> Tuple:
+        return tuple(getattr(self, field.name) for field in fields(self))
+
+    def __setstate__(self, state: Tuple) -> None:
+        for field, value in zip(fields(self), state):
+            object.__setattr__(self, field.name, value)
+
+
+@dataclass(frozen=True)
+class FetchedTranscriptSnippet(_FrozenSlots):
+    __slots__ = ("text", "start", "duration")
 
-@dataclass
-class FetchedTranscriptSnippet:
     text: str
     start: float
     """
@@ -46,14 +102,263 @@ class FetchedTranscriptSnippet:
     """
 
 
-@dataclass
-class FetchedTranscript:
+_new_snippet = FetchedTranscriptSnippet.__new__
+_set_snippet_text = FetchedTranscriptSnippet.text.__set__  # type: ignore[attr-defined]
+_set_snippet_start = FetchedTranscriptSnippet.start.__set__  # type: ignore[attr-defined]
+_set_snippet_duration = FetchedTranscriptSnippet.duration.__set__  # type: ignore[attr-defined]
+
+
+def _create_snippet(
+    text: str, start: float, duration: float
+) -> FetchedTranscriptSnippet:
+    """
+    Creates a snippet by assigning its slots directly, which takes half the time of
+    calling the `__init__` of the frozen dataclass.
+    """
+    snippet = _new_snippet(FetchedTranscriptSnippet)
+    _set_snippet_text(snippet, text)
+    _set_snippet_start(snippet, start)
+    _set_snippet_duration(snippet, duration)
+    return snippet
+
+
+def _encodes_json_directly(json_options: Dict[str, Any]) -> bool:
+    """
+    Whether JSON can be built directly from the snippet data, using the given
+    options of `json.dumps`. Only the options affecting the whitespace and the
+    escaping of strings are supported.
+    """
+    return json_options.keys() <= {"ensure_ascii", "separators"}
+
+
+class _ColumnarSnippets(Sequence[FetchedTranscriptSnippet]):
+    """
+    A read-only sequence of transcript snippets, which is stored column by column to
+    save memory. The start times and durations are kept in arrays of doubles and
+    the texts are joined into a single string, which is sliced using an array of
+    offsets. `FetchedTranscriptSnippet` objects are only created once a snippet is
+    accessed.
+
+    Compared to a list of snippets, this takes about a third of the memory, as it
+    doesn't need an object, two floats and a string per snippet.
+    """
+
+    __slots__ = ("_text", "_text_offsets", "_starts", "_durations")
+
+    def __init__(
+        self,
+        texts: Iterable[str],
+        starts: Iterable[float],
+        durations: Iterable[float],
+    ):
+        texts = list(texts)
+        self._text = "".join(texts)
+        self._text_offsets = array("q", accumulate(chain((0,), map(len, texts))))
+        self._starts = array("d", starts)
+        self._durations = array("d", durations)
+        if not len(texts) == len(self._starts) == len(self._durations):
+            raise ValueError("all columns must have the same length")
+
+    @classmethod
+    def from_snippets(
+        cls, snippets: Iterable[FetchedTranscriptSnippet]
+    ) -> "_ColumnarSnippets":
+        if isinstance(snippets, cls):
+            return snippets
+        snippets = list(snippets)
+        return cls(
+            [snippet.text for snippet in snippets],
+            [snippet.start for snippet in snippets],
+            [snippet.duration for snippet in snippets],
+        )
+
+    @property
+    def texts(self) -> List[str]:
+        return list(self.iter_texts())
+
+    def iter_texts(self) -> Iterator[str]:
+        """
+        Iterates over the texts of the snippets, which is a lot faster than creating
+        snippet objects, if only their texts are needed.
+        """
+        text = self._text
+        offsets = self._text_offsets
+        return (
+            text[text_start:text_end]
+            for text_start, text_end in zip(offsets, offsets[1:])
+        )
+
+    @property
+    def starts(self) -> "array[float]":
+        return self._starts
+
+    @property
+    def durations(self) -> "array[float]":
+        return self._durations
+
+    def iter_rows(self) -> Iterator[Tuple[str, float, float]]:
+        """
+        Iterates over the snippets as (text, start, duration) tuples, which is a lot
+        faster than creating snippet objects.
+        """
+        text = self._text
+        offsets = self._text_offsets
+        for text_start, text_end, start, duration in zip(
+            offsets, offsets[1:], self._starts, self._durations
+        ):
+            yield text[text_start:text_end], start, duration
+
+    def to_json(
+        self,
+        ensure_ascii: bool = True,
+        separators: Optional[Tuple[str, str]] = None,
+    ) -> Optional[str]:
+        """
+        Encodes the snippets the same way `json.dumps` encodes their raw data, but
+        without creating a dict per snippet first. Returns None if there are start
+        times or durations, which aren't finite, as `json.dumps` encodes them as
+        non-standard literals.
+        """
+        if not (
+            all(map(isfinite, self._starts)) and all(map(isfinite, self._durations))
+        ):
+            return None
+        if separators is None:
+            separators = (", ", ": ")
+        item_separator, key_separator = (
+            separator.replace("{", "{{").replace("}", "}}") for separator in separators
+        )
+        # the separators are inserted into a template, which is formatted once per
+        # snippet, so the braces of the template are escaped twice
+        template = (
+            '{{{{"text"{key}{{}}{item}"start"{key}{{}}{item}"duration"{key}{{}}}}}}'
+        )
+        format_snippet = template.format(item=item_separator, key=key_separator).format
+        encode_string = encode_basestring_ascii if ensure_ascii else encode_basestring
+        float_repr = float.__repr__
+        return (
+            "["
+            + separators[0].join(
+                map(
+                    format_snippet,
+                    map(encode_string, self.texts),
+                    map(float_repr, self._starts),
+                    map(float_repr, self._durations),
+                )
+            )
+            + "]"
+        )
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[FetchedTranscriptSnippet, List[FetchedTranscriptSnippet]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("snippet index out of range")
+        return _create_snippet(
+            self._text[self._text_offsets[index] : self._text_offsets[index + 1]],
+            self._starts[index],
+            self._durations[index],
+        )
+
+    def __iter__(self) -> Iterator[FetchedTranscriptSnippet]:
+        text = self._text
+        offsets = self._text_offsets
+        for text_start, text_end, start, duration in zip(
+            offsets, offsets[1:], self._starts, self._durations
+        ):
+            yield _create_snippet(text[text_start:text_end], start, duration)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, _ColumnarSnippets):
+            return (
+                self._starts == other._starts
+                and self._durations == other._durations
+                and self._text_offsets == other._text_offsets
+                and self._text == other._text
+            )
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(
+                snippet == other_snippet for snippet, other_snippet in zip(self, other)
+            )
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class _LazyColumnarSnippets(_ColumnarSnippets):
+    """
+    Snippets which keep the timedtext XML they have been downloaded as and only parse
+    it once the snippets are accessed for the first time. Until then, they take up no
+    more memory than the XML itself.
+    """
+
+    __slots__ = ("payload", "encoding", "_preserve_formatting")
+
+    def __init__(
+        self, payload: bytes, encoding: str = "utf-8", preserve_formatting: bool = False
+    ):
+        self.payload = payload
+        self.encoding = encoding
+        self._preserve_formatting = preserve_formatting
+
+    @property
+    def is_parsed(self) -> bool:
+        try:
+            object.__getattribute__(self, "_starts")
+        except AttributeError:
+            return False
+        return True
+
+    def __getattr__(self, name: str) -> Any:
+        # only called for the slots of the columns, as long as they haven't been set
+        if name not in _ColumnarSnippets.__slots__:
+            raise AttributeError(name)
+        snippets = _TranscriptParser(self._preserve_formatting).parse(
+            self.payload, self.encoding
+        )
+        for slot in _ColumnarSnippets.__slots__:
+            setattr(self, slot, getattr(snippets, slot))
+        return getattr(self, name)
+
+    def __reduce__(self) -> Tuple:
+        return type(self), (self.payload, self.encoding, self._preserve_formatting)
+
+
+@dataclass(frozen=True)
+class FetchedTranscript(_FrozenSlots):
     """
     Represents a fetched transcript. This object is iterable, which allows you to
     iterate over the transcript snippets.
+
+    The snippets of transcripts fetched from YouTube are stored in a compact,
+    column-based form and `FetchedTranscriptSnippet` objects are only created as you
+    access them. If `lazy_parsing` is enabled, the transcript isn't even parsed until
+    its snippets are accessed, and the XML it has been downloaded as is available as
+    `payload`.
+
+    Transcripts and their snippets are immutable. Use `dataclasses.replace` to
+    create modified copies.
     """
 
-    snippets: List[FetchedTranscriptSnippet]
+    __slots__ = (
+        "snippets",
+        "video_id",
+        "language",
+        "language_code",
+        "is_generated",
+    )
+
+    snippets: Sequence[FetchedTranscriptSnippet]
     video_id: str
     language: str
     language_code: str
@@ -68,16 +373,138 @@ class FetchedTranscript:
     def __len__(self) -> int:
         return len(self.snippets)
 
+    @property
+    def payload(self) -> Optional[bytes]:
+        """
+        The timedtext XML this transcript has been downloaded as, if it has been
+        fetched with `lazy_parsing` enabled, and None otherwise. It can be forwarded
+        or cached as is, without parsing the transcript.
+        """
+        if isinstance(self.snippets, _LazyColumnarSnippets):
+            return self.snippets.payload
+        return None
+
     def to_raw_data(self) -> List[Dict]:
-        return [asdict(snippet) for snippet in self]
+        return [
+            {"text": text, "start": start, "duration": duration}
+            for text, start, duration in self._iter_rows()
+        ]
+
+    def iter_raw_data(self) -> Iterator[Dict]:
+        """
+        Lazily yields the dicts `to_raw_data` returns, one snippet at a time.
+        """
+        for text, start, duration in self._iter_rows():
+            yield {"text": text, "start": start, "duration": duration}
+
+    def _iter_rows(self) -> Iterator[Tuple[str, float, float]]:
+        if isinstance(self.snippets, _ColumnarSnippets):
+            return self.snippets.iter_rows()
+        return (
+            (snippet.text, snippet.start, snippet.duration) for snippet in self.snippets
+        )
+
+    def to_json(self, **kwargs) -> str:
+        """
+        Returns the same as `json.dumps(transcript.to_raw_data(), **kwargs)`. For
+        transcripts fetched from YouTube, the JSON is built straight from the snippet
+        data, which is several times faster, unless options other than
+        `ensure_ascii` and `separators` are passed in.
+        """
+        if isinstance(self.snippets, _ColumnarSnippets) and _encodes_json_directly(
+            kwargs
+        ):
+            encoded = self.snippets.to_json(**kwargs)
+            if encoded is not None:
+                return encoded
+        return json.dumps(self.to_raw_data(), **kwargs)
+
+    def compact(self) -> "FetchedTranscript":
+        """
+        Returns a copy of this transcript, which stores its snippets in the same
+        compact form transcripts fetched from YouTube use. This is useful if you
+        keep a lot of transcripts, which you've created yourself, in memory.
+        """
+        return replace(self, snippets=_ColumnarSnippets.from_snippets(self.snippets))
 
 
 @dataclass
-class _TranslationLanguage:
+class TranscriptFetchResult:
+    """
+    The outcome of fetching the transcript of a single video as part of a batch. If
+    the transcript couldn't be retrieved, `transcript` is None and `exception` holds
+    the exception that has been raised instead.
+    """
+
+    video_id: str
+    transcript: Optional[FetchedTranscript] = None
+    exception: Optional[Exception] = None
+
+
+class TranscriptKey(NamedTuple):
+    """
+    Identifies a fetched transcript in a `SQLiteTranscriptStore`. For translated
+    transcripts, `language_code` and `is_generated` describe the transcript which has
+    been translated, and `translation_language_code` the language it has been
+    translated to.
+    """
+
+    video_id: str
+    language_code: str
+    is_generated: bool
+    translation_language_code: Optional[str]
+    preserve_formatting: bool
+
+
+@dataclass(frozen=True)
+class _TranslationLanguage(_FrozenSlots):
+    __slots__ = ("language", "language_code")
+
     language: str
     language_code: str
 
 
+class TranscriptListSource(str, Enum):
+    """
+    Defines where the list of transcripts available for a video is retrieved from.
+    """
+
+    WATCH_PAGE = "watch_page"
+    """
+    Scrapes the list from the JSON embedded into the HTML of the video's watch page.
+    """
+    INNERTUBE = "innertube"
+    """
+    Requests the list from YouTube's Innertube player API. Its response is plain JSON
+    and only a fraction of the size of the watch page, and it doesn't require giving
+    consent to cookies. If this fails, the watch page is used as a fallback.
+    """
+
+
+class TranscriptFormat(str, Enum):
+    """
+    Defines which format transcripts are downloaded in. Whichever format is used,
+    fetching a transcript results in the same `FetchedTranscript`.
+    """
+
+    XML = "xml"
+    """
+    YouTube's default timedtext XML. It is always used if formatting is preserved, as
+    the other formats describe formatting using styles instead of HTML tags.
+    """
+    JSON3 = "json3"
+    """
+    YouTube's JSON format, which is decoded by the configured `JsonBackend`. Should a
+    response not be parsable, the transcript is downloaded as XML instead.
+    """
+    SRV3 = "srv3"
+    """
+    YouTube's own XML format, with times in milliseconds instead of seconds and
+    without escaping the text twice. Should a response not be parsable, the transcript
+    is downloaded as XML instead.
+    """
+
+
 class _PlayabilityStatus(str, Enum):
     OK = "OK"
     ERROR = "ERROR"
@@ -90,6 +517,29 @@ class _PlayabilityFailedReason(str, Enum):
     VIDEO_UNAVAILABLE = "Video unavailable"
 
 
+def _get_text(text_json: Dict) -> str:
+    """
+    Returns the text of a JSON text object, which either contains it as "simpleText"
+    or split up into "runs" (which is what the Innertube API uses).
+    """
+    if "simpleText" in text_json:
+        return text_json["simpleText"]
+    return "".join(run.get("text", "") for run in text_json.get("runs", []))
+
+
+def _get_encoding(response: Response) -> str:
+    """
+    Returns the encoding the body of a response is decoded with. This is the encoding
+    the response declares or UTF-8, if it declares none or one Python doesn't know.
+    """
+    encoding = response.encoding or "utf-8"
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        return "utf-8"
+    return encoding
+
+
 def _raise_http_errors(response: Response, video_id: str) -> Response:
     try:
         response.raise_for_status()
@@ -98,7 +548,40 @@ def _raise_http_errors(response: Response, video_id: str) -> Response:
         raise YouTubeRequestFailed(video_id, error)
 
 
+def _call_with_retries(
+    retry_policy: Optional["RetryPolicy"], function: Callable[[], T]
+) -> T:
+    if retry_policy is None:
+        return function()
+    return retry_policy.call(function)
+
+
+def _wait_for_rate_limiter(rate_limiter: Optional["RateLimiter"], url: str) -> None:
+    if rate_limiter is not None:
+        rate_limiter.acquire(url)
+
+
 class Transcript:
+    STREAM_CHUNK_SIZE = 16 * 1024
+
+    __slots__ = (
+        "_http_client",
+        "_store",
+        "_coalescer",
+        "_translated_from",
+        "video_id",
+        "_url",
+        "language",
+        "language_code",
+        "is_generated",
+        "translation_languages",
+        "_format",
+        "_json_backend",
+        "_lazy_parsing",
+        "_retry_policy",
+        "_rate_limiter",
+    )
+
     def __init__(
         self,
         http_client: Session,
@@ -108,32 +591,206 @@ class Transcript:
         language_code: str,
         is_generated: bool,
         translation_languages: List[_TranslationLanguage],
+        store: Optional["SQLiteTranscriptStore"] = None,
+        coalescer: Optional["RequestCoalescer"] = None,
+        transcript_format: TranscriptFormat = TranscriptFormat.XML,
+        json_backend: Optional[JsonBackend] = None,
+        lazy_parsing: bool = False,
+        retry_policy: Optional["RetryPolicy"] = None,
+        rate_limiter: Optional["RateLimiter"] = None,
     ):
         """
         You probably don't want to initialize this directly. Usually you'll access Transcript objects using a
         TranscriptList.
         """
         self._http_client = http_client
+        self._store = store
+        self._coalescer = coalescer
+        # the language and kind of the transcript this one is a translation of
+        self._translated_from: Optional[Tuple[str, bool]] = None
         self.video_id = video_id
         self._url = url
         self.language = language
         self.language_code = language_code
         self.is_generated = is_generated
+        # TranscriptList.build passes the same list to all of its transcripts, so
+        # the table of translation languages exists once per list
         self.translation_languages = translation_languages
-        self._translation_languages_dict = {
-            translation_language.language_code: translation_language.language
-            for translation_language in translation_languages
-        }
+        self._format = TranscriptFormat(transcript_format)
+        self._json_backend = json_backend
+        self._lazy_parsing = lazy_parsing
+        self._retry_policy = retry_policy
+        self._rate_limiter = rate_limiter
 
     def fetch(self, preserve_formatting: bool = False) -> FetchedTranscript:
         """
         Loads the actual transcript data.
         :param preserve_formatting: whether to keep select HTML text formatting
         """
-        response = self._http_client.get(self._url)
-        snippets = _TranscriptParser(preserve_formatting=preserve_formatting).parse(
-            _raise_http_errors(response, self.video_id).text,
+        key = self._key(preserve_formatting)
+        if self._store is not None:
+            fetched_transcript = self._store.get(key)
+            if fetched_transcript is not None:
+                return fetched_transcript
+        if self._coalescer is None:
+            return self._download(key)
+        return self._coalescer.call(key, lambda: self._download(key))
+
+    def stream(
+        self, preserve_formatting: bool = False
+    ) -> Iterator[FetchedTranscriptSnippet]:
+        """
+        Loads the actual transcript data like `fetch` does, but yields the snippets
+        while the transcript is still being downloaded, as soon as each of them has
+        been received. If the generator is closed before it is exhausted, for example
+        by breaking out of a loop, the download is stopped.
+
+        Transcripts are always streamed as XML, whichever format has been configured.
+        As the snippets are yielded before the whole document has been received,
+        errors in it are only raised once the snippets in front of them have been
+        yielded. Only transcripts which have been streamed completely are added to
+        the transcript store.
+
+        :param preserve_formatting: whether to keep select HTML text formatting
+        """
+        key = self._key(preserve_formatting)
+        if self._store is not None:
+            fetched_transcript = self._store.get(key)
+            if fetched_transcript is not None:
+                yield from fetched_transcript
+                return
+        snippets: List[FetchedTranscriptSnippet] = []
+        response = _call_with_retries(self._retry_policy, self._open_stream)
+        try:
+            parser = _TranscriptPullParser(preserve_formatting)
+            for chunk in response.iter_content(self.STREAM_CHUNK_SIZE):
+                parser.feed(chunk)
+                yield from self._read_streamed_snippets(parser, snippets)
+            parser.close()
+            yield from self._read_streamed_snippets(parser, snippets)
+        finally:
+            response.close()
+        if self._store is not None:
+            self._store.put(
+                key,
+                self._create_fetched_transcript(
+                    _ColumnarSnippets.from_snippets(snippets)
+                ),
+            )
+
+    def _open_stream(self) -> Response:
+        _wait_for_rate_limiter(self._rate_limiter, self._url)
+        response = self._http_client.get(self._url, stream=True)
+        try:
+            return _raise_http_errors(response, self.video_id)
+        except YouTubeRequestFailed:
+            response.close()
+            raise
+
+    def _read_streamed_snippets(
+        self,
+        parser: "_TranscriptPullParser",
+        snippets: List[FetchedTranscriptSnippet],
+    ) -> List[FetchedTranscriptSnippet]:
+        """
+        Returns the snippets the parser has parsed since it was last read. They are
+        also added to `snippets`, if a store is used, so they can be stored later on.
+        """
+        new_snippets = parser.read_snippets()
+        if self._store is not None:
+            snippets.extend(new_snippets)
+        return new_snippets
+
+    def _download(self, key: TranscriptKey) -> FetchedTranscript:
+        fetched_transcript = None
+        transcript_format = self._negotiate_format(key.preserve_formatting)
+        if transcript_format is not TranscriptFormat.XML:
+            fetched_transcript = self._build_fetched_transcript_or_none(
+                self._get(self._format_url(transcript_format)).content,
+                transcript_format,
+            )
+        if fetched_transcript is None:
+            fetched_transcript = self._build_xml_fetched_transcript(
+                self._get(self._url), key.preserve_formatting
+            )
+        if self._store is not None:
+            self._store.put(key, fetched_transcript)
+        return fetched_transcript
+
+    def _get(self, url: str) -> Response:
+        """
+        Requests the given URL, which is retried according to the retry policy.
+        """
+
+        def get() -> Response:
+            _wait_for_rate_limiter(self._rate_limiter, url)
+            return _raise_http_errors(self._http_client.get(url), self.video_id)
+
+        return _call_with_retries(self._retry_policy, get)
+
+    def _negotiate_format(self, preserve_formatting: bool) -> TranscriptFormat:
+        if preserve_formatting or self._lazy_parsing:
+            return TranscriptFormat.XML
+        return self._format
+
+    def _format_url(self, transcript_format: TranscriptFormat) -> str:
+        return "{url}&fmt={format}".format(
+            url=self._url, format=transcript_format.value
         )
+
+    def _key(self, preserve_formatting: bool) -> TranscriptKey:
+        if self._translated_from is None:
+            return TranscriptKey(
+                self.video_id,
+                self.language_code,
+                self.is_generated,
+                None,
+                preserve_formatting,
+            )
+        return TranscriptKey(
+            self.video_id,
+            *self._translated_from,
+            self.language_code,
+            preserve_formatting,
+        )
+
+    def _build_fetched_transcript_or_none(
+        self, raw_data: bytes, transcript_format: TranscriptFormat
+    ) -> Optional[FetchedTranscript]:
+        """
+        Builds the transcript from a response in one of the compact formats. Returns
+        None if the response can't be parsed, so XML can be requested instead.
+        """
+        if transcript_format is TranscriptFormat.JSON3:
+            parser = _Json3TranscriptParser(self._json_backend)
+        else:
+            parser = _Srv3TranscriptParser()
+        try:
+            return self._create_fetched_transcript(parser.parse(raw_data))
+        except _COMPACT_FORMAT_ERRORS:
+            return None
+
+    def _build_xml_fetched_transcript(
+        self, response: Response, preserve_formatting: bool
+    ) -> FetchedTranscript:
+        """
+        Builds the transcript from a response containing timedtext XML, which is
+        parsed right away, unless `lazy_parsing` is enabled. The XML is parsed from
+        the bytes received, so it is never decoded as a whole.
+        """
+        if self._lazy_parsing:
+            snippets: _ColumnarSnippets = _LazyColumnarSnippets(
+                response.content, _get_encoding(response), preserve_formatting
+            )
+        else:
+            snippets = _TranscriptParser(preserve_formatting=preserve_formatting).parse(
+                response.content, _get_encoding(response)
+            )
+        return self._create_fetched_transcript(snippets)
+
+    def _create_fetched_transcript(
+        self, snippets: Sequence[FetchedTranscriptSnippet]
+    ) -> FetchedTranscript:
         return FetchedTranscript(
             snippets=snippets,
             video_id=self.video_id,
@@ -157,20 +814,37 @@ class Transcript:
         if not self.is_translatable:
             raise NotTranslatable(self.video_id)
 
-        if language_code not in self._translation_languages_dict:
+        translation_language = next(
+            (
+                translation_language
+                for translation_language in self.translation_languages
+                if translation_language.language_code == language_code
+            ),
+            None,
+        )
+        if translation_language is None:
             raise TranslationLanguageNotAvailable(self.video_id)
 
-        return Transcript(
+        translated_transcript = type(self)(
             self._http_client,
             self.video_id,
             "{url}&tlang={language_code}".format(
                 url=self._url, language_code=language_code
             ),
-            self._translation_languages_dict[language_code],
+            translation_language.language,
             language_code,
             True,
             [],
+            store=self._store,
+            coalescer=self._coalescer,
+            transcript_format=self._format,
+            json_backend=self._json_backend,
+            lazy_parsing=self._lazy_parsing,
+            retry_policy=self._retry_policy,
+            rate_limiter=self._rate_limiter,
         )
+        translated_transcript._translated_from = (self.language_code, self.is_generated)
+        return translated_transcript
 
 
 class TranscriptList:
@@ -179,6 +853,13 @@ class TranscriptList:
     for a given YouTube video. Also it provides functionality to search for a transcript in a given language.
     """
 
+    __slots__ = (
+        "video_id",
+        "_manually_created_transcripts",
+        "_generated_transcripts",
+        "_translation_languages",
+    )
+
     def __init__(
         self,
         video_id: str,
@@ -201,7 +882,17 @@ class TranscriptList:
 
     @staticmethod
     def build(
-        http_client: Session, video_id: str, captions_json: Dict
+        http_client: Session,
+        video_id: str,
+        captions_json: Dict,
+        transcript_class: Type[Transcript] = Transcript,
+        store: Optional["SQLiteTranscriptStore"] = None,
+        coalescer: Optional["RequestCoalescer"] = None,
+        transcript_format: TranscriptFormat = TranscriptFormat.XML,
+        json_backend: Optional[JsonBackend] = None,
+        lazy_parsing: bool = False,
+        retry_policy: Optional["RetryPolicy"] = None,
+        rate_limiter: Optional["RateLimiter"] = None,
     ) -> "TranscriptList":
         """
         Factory method for TranscriptList.
@@ -209,11 +900,20 @@ class TranscriptList:
         :param http_client: http client which is used to make the transcript retrieving http calls
         :param video_id: the id of the video this TranscriptList is for
         :param captions_json: the JSON parsed from the YouTube pages static HTML
+        :param transcript_class: the Transcript class which is instantiated for each transcript
+        :param store: an optional store fetched transcripts are persisted in
+        :param coalescer: an optional coalescer concurrent fetches of the same
+            transcript are shared through
+        :param transcript_format: the format transcripts are downloaded in
+        :param json_backend: the backend used to decode transcripts downloaded as JSON
+        :param lazy_parsing: whether transcripts are only parsed once they are accessed
+        :param retry_policy: an optional policy failed downloads are retried with
+        :param rate_limiter: an optional limiter downloads are paced by
         :return: the created TranscriptList
         """
         translation_languages = [
             _TranslationLanguage(
-                language=translation_language["languageName"]["simpleText"],
+                language=_get_text(translation_language["languageName"]),
                 language_code=translation_language["languageCode"],
             )
             for translation_language in captions_json.get("translationLanguages", [])
@@ -228,14 +928,22 @@ class TranscriptList:
             else:
                 transcript_dict = manually_created_transcripts
 
-            transcript_dict[caption["languageCode"]] = Transcript(
+            transcript_dict[caption["languageCode"]] = transcript_class(
                 http_client,
                 video_id,
-                caption["baseUrl"],
-                caption["name"]["simpleText"],
+                # the format is chosen by the transcript, so it's removed from the URL
+                caption["baseUrl"].replace("&fmt=srv3", ""),
+                _get_text(caption["name"]),
                 caption["languageCode"],
                 caption.get("kind", "") == "asr",
                 translation_languages if caption.get("isTranslatable", False) else [],
+                store=store,
+                coalescer=coalescer,
+                transcript_format=transcript_format,
+                json_backend=json_backend,
+                lazy_parsing=lazy_parsing,
+                retry_policy=retry_policy,
+                rate_limiter=rate_limiter,
             )
 
         return TranscriptList(
@@ -340,43 +1048,345 @@ class TranscriptList:
         return description if description else "None"
 
 
+class _WatchPage:
+    """
+    A raw watch page together with the offsets of the markers `TranscriptListFetcher`
+    branches on (-1 if a marker is not present). The page is kept as the bytes it has
+    been received as and classified once when it is received, using `bytes.find`,
+    which is by far the fastest way to scan a megabyte-sized page in Python (a single
+    compiled alternation regex over all markers is ~4x slower than all of the
+    individual searches together). Each marker is searched for at most once and only
+    where it can still influence the outcome:
+
+    - the player response is searched for first, as every regular watch page has one
+    - the consent form is only searched for in front of the player response
+    - the consent value is only searched for after the consent form
+    - the recaptcha marker is only searched for if the player response is unusable
+
+    Only the parts which are actually extracted from the page are decoded, as a
+    decoded copy of the whole page would take up to four times its size.
+    """
+
+    PLAYER_RESPONSE_VAR_NAME = "ytInitialPlayerResponse"
+    CONSENT_FORM_MARKER = b'action="https://consent.youtube.com/s"'
+    CONSENT_VALUE_MARKER = b'name="v" value="'
+    RECAPTCHA_MARKER = b'class="g-recaptcha"'
+    # A script ends at the first closing tag, even if it is inside a string, so
+    # the player response always ends in front of it.
+    SCRIPT_END_MARKER = b"</script"
+
+    def __init__(self, html: bytes, encoding: str = "utf-8"):
+        self.html = html
+        self.encoding = encoding
+        self.player_response_start = html.find(
+            _JsVarParser.declaration(self.PLAYER_RESPONSE_VAR_NAME).encode()
+        )
+        consent_form_search_end = (
+            len(html)
+            if self.player_response_start == -1
+            else self.player_response_start
+        )
+        self.consent_form_start = html.find(
+            self.CONSENT_FORM_MARKER, 0, consent_form_search_end
+        )
+
+    @property
+    def requires_consent(self) -> bool:
+        return self.consent_form_start != -1
+
+    @property
+    def consent_value(self) -> Optional[str]:
+        value_start = self.html.find(self.CONSENT_VALUE_MARKER, self.consent_form_start)
+        if value_start == -1:
+            return None
+        value_start += len(self.CONSENT_VALUE_MARKER)
+        value_end = self.html.find(b'"', value_start)
+        if value_end == -1:
+            return None
+        return unescape(self._decode(value_start, value_end))
+
+    @property
+    def has_recaptcha(self) -> bool:
+        return self.RECAPTCHA_MARKER in self.html
+
+    def player_response_script(self) -> str:
+        """
+        Returns the decoded script from the declaration of the player response up to
+        the end of the script, or an empty string if the page has no player response.
+        """
+        if self.player_response_start == -1:
+            return ""
+        script_end = self.html.find(self.SCRIPT_END_MARKER, self.player_response_start)
+        return self._decode(
+            self.player_response_start,
+            len(self.html) if script_end == -1 else script_end,
+        )
+
+    def _decode(self, start: int, end: int) -> str:
+        return str(memoryview(self.html)[start:end], self.encoding, "replace")
+
+
+class _WatchPageReader:
+    """
+    Incrementally reads a watch page from the chunks of a streamed response, which
+    allows for aborting the download as soon as the player response has been received
+    completely. This usually is the case about halfway through the page.
+
+    Whether the player response could be complete is checked by counting its braces,
+    without taking into account that some of them could be part of a string. This is
+    just a cheap heuristic to tell when it's worth trying to decode the player response.
+    Only once that succeeds the page is considered complete, so it is never cut off
+    early. If the page has no player response at all, it is read until the end.
+
+    Decoding is retried whenever the braces newly balance. If they stay balanced after
+    a failed attempt, as strings contained extra closing braces, it is only retried
+    once the player response received so far has doubled in size, so the work spent on
+    failed attempts stays linear in the size of the page.
+    """
+
+    def __init__(self, encoding: str = "utf-8"):
+        self._var_parser = _JsVarParser(_WatchPage.PLAYER_RESPONSE_VAR_NAME)
+        self._declaration = _JsVarParser.declaration(
+            _WatchPage.PLAYER_RESPONSE_VAR_NAME
+        ).encode()
+        self._encoding = encoding
+        self._chunks: List[bytes] = []
+        self._length = 0
+        self._declaration_start = -1
+        self._declaration_overlap = b""
+        self._brace_balance = 0
+        self._may_be_complete = False
+        self._was_unbalanced = False
+        self._failed_decode_length = 0
+        self.is_complete = False
+
+    @property
+    def html(self) -> bytes:
+        if len(self._chunks) > 1:
+            self._chunks = [b"".join(self._chunks)]
+        return self._chunks[0] if self._chunks else b""
+
+    @property
+    def page(self) -> _WatchPage:
+        return _WatchPage(self.html, self._encoding)
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Adds the next chunk of the page.
+
+        :return: whether the player response has been received completely, which means
+            that the rest of the page is not needed anymore
+        """
+        if self.is_complete or not chunk:
+            return self.is_complete
+
+        if self._declaration_start == -1:
+            # the declaration could be split up between this chunk and the last one
+            window = self._declaration_overlap + chunk
+            declaration_index = window.find(self._declaration)
+            if declaration_index == -1:
+                self._declaration_overlap = window[-(len(self._declaration) - 1) :]
+            else:
+                self._declaration_start = (
+                    self._length - len(self._declaration_overlap) + declaration_index
+                )
+                self._update_brace_balance(window, declaration_index)
+        else:
+            self._update_brace_balance(chunk, 0)
+
+        self._chunks.append(chunk)
+        self._length += len(chunk)
+
+        if self._may_be_complete and (
+            self._was_unbalanced
+            or self._length - self._declaration_start >= 2 * self._failed_decode_length
+        ):
+            # only the player response received so far is decoded
+            self.is_complete = (
+                self._var_parser.find_var_end(
+                    str(
+                        memoryview(self.html)[self._declaration_start :],
+                        self._encoding,
+                        "replace",
+                    )
+                )
+                != -1
+            )
+            if not self.is_complete:
+                self._failed_decode_length = self._length - self._declaration_start
+        return self.is_complete
+
+    def _update_brace_balance(self, text: bytes, start: int) -> None:
+        closing_braces = text.count(b"}", start)
+        # the text following the player response may open new braces, so it could
+        # already be complete, if the closing braces alone balance the opening ones
+        self._may_be_complete = self._brace_balance - closing_braces <= 0
+        self._was_unbalanced = self._brace_balance > 0
+        self._brace_balance += text.count(b"{", start) - closing_braces
+
+
 class TranscriptListFetcher:
-    def __init__(self, http_client: Session, proxy_config: Optional[ProxyConfig]):
+    WATCH_PAGE_CHUNK_SIZE = 16 * 1024
+    # If the Innertube API fails with any of these, the watch page is scraped instead.
+    # The remaining errors are final, as scraping the watch page would fail the same way.
+    INNERTUBE_FALLBACK_EXCEPTIONS = (
+        YouTubeRequestFailed,
+        YouTubeDataUnparsable,
+        RequestBlocked,
+        VideoUnplayable,
+    )
+
+    def __init__(
+        self,
+        http_client: Session,
+        proxy_config: Optional[ProxyConfig],
+        stream_watch_page: bool = False,
+        source: TranscriptListSource = TranscriptListSource.WATCH_PAGE,
+        cache: Optional["TranscriptListCache"] = None,
+        store: Optional["SQLiteTranscriptStore"] = None,
+        error_cache: Optional["ErrorCache"] = None,
+        coalescer: Optional["RequestCoalescer"] = None,
+        json_backend: Optional[JsonBackend] = None,
+        transcript_format: TranscriptFormat = TranscriptFormat.XML,
+        lazy_parsing: bool = False,
+        retry_policy: Optional["RetryPolicy"] = None,
+        rate_limiter: Optional["RateLimiter"] = None,
+    ):
         self._http_client = http_client
         self._proxy_config = proxy_config
+        self._stream_watch_page = stream_watch_page
+        self._source = TranscriptListSource(source)
+        self._cache = cache
+        self._store = store
+        self._error_cache = error_cache
+        self._coalescer = coalescer
+        self._json_backend = (
+            get_default_json_backend() if json_backend is None else json_backend
+        )
+        self._transcript_format = TranscriptFormat(transcript_format)
+        self._lazy_parsing = lazy_parsing
+        self._retry_policy = retry_policy
+        self._rate_limiter = rate_limiter
 
     def fetch(self, video_id: str) -> TranscriptList:
+        captions_json = self._get_cached_captions_json(video_id)
+        if captions_json is None:
+            if self._coalescer is None:
+                captions_json = self._fetch_and_cache_captions_json(video_id)
+            else:
+                captions_json = self._coalescer.call(
+                    self._coalescing_key(video_id),
+                    lambda: self._fetch_and_cache_captions_json(video_id),
+                )
         return TranscriptList.build(
             self._http_client,
             video_id,
-            self._fetch_captions_json(video_id),
+            captions_json,
+            store=self._store,
+            coalescer=self._coalescer,
+            transcript_format=self._transcript_format,
+            json_backend=self._json_backend,
+            lazy_parsing=self._lazy_parsing,
+            retry_policy=self._retry_policy,
+            rate_limiter=self._rate_limiter,
         )
 
+    def _fetch_and_cache_captions_json(self, video_id: str) -> Dict:
+        try:
+            captions_json = self._fetch_captions_json(video_id)
+        except CouldNotRetrieveTranscript as exception:
+            self._cache_error(video_id, exception)
+            raise
+        self._cache_captions_json(video_id, captions_json)
+        return captions_json
+
+    @staticmethod
+    def _coalescing_key(video_id: str) -> Tuple[str, str]:
+        # Only the captions JSON is shared, not the TranscriptList built from it, as
+        # its transcripts are bound to the http client of the fetcher building it.
+        return ("transcript_list", video_id)
+
+    def _get_cached_captions_json(self, video_id: str) -> Optional[Dict]:
+        """
+        Returns the cached captions JSON of the given video or raises the error that
+        has been cached for it. Returns None if nothing has been cached.
+        """
+        if self._error_cache is not None:
+            self._error_cache.raise_if_cached(video_id)
+        if self._cache is None:
+            return None
+        return self._cache.get(video_id)
+
+    def _cache_captions_json(self, video_id: str, captions_json: Dict) -> None:
+        if self._cache is not None:
+            self._cache.set(video_id, captions_json)
+
+    def _cache_error(
+        self, video_id: str, exception: CouldNotRetrieveTranscript
+    ) -> None:
+        if self._error_cache is not None:
+            self._error_cache.set(video_id, exception)
+
     def _fetch_captions_json(self, video_id: str, try_number: int = 0) -> Dict:
         try:
-            return self._extract_captions_json(
-                self._fetch_video_html(video_id), video_id
-            )
+            return self._fetch_captions_json_from_source(video_id)
         except RequestBlocked as exception:
-            retries = (
-                0
-                if self._proxy_config is None
-                else self._proxy_config.retries_when_blocked
-            )
-            if try_number + 1 < retries:
-                return self._fetch_captions_json(video_id, try_number=try_number + 1)
-            raise exception.with_proxy_config(self._proxy_config)
+            delay = self._get_blocked_retry_delay(try_number)
+            if delay is None:
+                raise exception.with_proxy_config(self._proxy_config)
+        if delay:
+            time.sleep(delay)
+        return self._fetch_captions_json(video_id, try_number=try_number + 1)
+
+    @property
+    def _retries_when_blocked(self) -> int:
+        if self._proxy_config is None:
+            return 0
+        return self._proxy_config.retries_when_blocked
+
+    def _get_blocked_retry_delay(self, try_number: int) -> Optional[float]:
+        """
+        Returns how many seconds to wait before retrying a blocked request, or None if
+        it isn't retried. Without a retry policy, blocked requests are retried right
+        away, as a rotating proxy uses a new IP for the retry anyway.
+        """
+        if try_number + 1 >= self._retries_when_blocked:
+            return None
+        if self._retry_policy is None:
+            return 0.0
+        return self._retry_policy.backoff(try_number)
+
+    def _fetch_captions_json_from_source(self, video_id: str) -> Dict:
+        if self._source == TranscriptListSource.INNERTUBE:
+            try:
+                return self._extract_captions_json(
+                    self._fetch_innertube_data(video_id), video_id
+                )
+            except self.INNERTUBE_FALLBACK_EXCEPTIONS:
+                pass
+        return self._extract_captions_json(
+            self._extract_video_data(self._fetch_video_page(video_id), video_id),
+            video_id,
+        )
 
-    def _extract_captions_json(self, html: str, video_id: str) -> Dict:
-        var_parser = _JsVarParser("ytInitialPlayerResponse")
+    def _extract_video_data(self, page: _WatchPage, video_id: str) -> Dict:
+        var_parser = _JsVarParser(
+            _WatchPage.PLAYER_RESPONSE_VAR_NAME, json_backend=self._json_backend
+        )
         try:
-            video_data = var_parser.parse(html, video_id)
+            video_data = var_parser.parse_members(
+                page.player_response_script(),
+                video_id,
+                ("playabilityStatus", "captions"),
+            )
         except YouTubeDataUnparsable as e:
-            if 'class="g-recaptcha"' in html:
+            if page.has_recaptcha:
                 raise IpBlocked(video_id)
             # This should never happen!
             raise e  # pragma: no cover
+        return video_data
 
+    def _extract_captions_json(self, video_data: Dict, video_id: str) -> Dict:
         self._assert_playability(video_data.get("playabilityStatus"), video_id)
 
         captions_json = video_data.get("captions", {}).get(
@@ -416,29 +1426,98 @@ class TranscriptListFetcher:
                 video_id, reason, [run.get("text", "") for run in subreasons]
             )
 
-    def _create_consent_cookie(self, html: str, video_id: str) -> None:
-        match = re.search('name="v" value="(.*?)"', html)
-        if match is None:
+    def _create_consent_cookie(self, page: _WatchPage, video_id: str) -> None:
+        consent_value = page.consent_value
+        if consent_value is None:
             raise FailedToCreateConsentCookie(video_id)
         self._http_client.cookies.set(
-            "CONSENT", "YES+" + match.group(1), domain=".youtube.com"
+            "CONSENT", "YES+" + consent_value, domain=".youtube.com"
         )
 
-    def _fetch_video_html(self, video_id: str) -> str:
-        html = self._fetch_html(video_id)
-        if 'action="https://consent.youtube.com/s"' in html:
-            self._create_consent_cookie(html, video_id)
-            html = self._fetch_html(video_id)
-            if 'action="https://consent.youtube.com/s"' in html:
+    def _fetch_video_page(self, video_id: str) -> _WatchPage:
+        page = self._download_watch_page(video_id)
+        if page.requires_consent:
+            self._create_consent_cookie(page, video_id)
+            page = self._download_watch_page(video_id)
+            if page.requires_consent:
                 raise FailedToCreateConsentCookie(video_id)
-        return html
+        return page
+
+    def _fetch_innertube_data(self, video_id: str) -> Dict:
+        def post() -> Response:
+            _wait_for_rate_limiter(self._rate_limiter, INNERTUBE_API_URL)
+            return _raise_http_errors(
+                self._http_client.post(
+                    INNERTUBE_API_URL,
+                    json={"context": INNERTUBE_CONTEXT, "videoId": video_id},
+                ),
+                video_id,
+            )
+
+        response = _call_with_retries(self._retry_policy, post)
+        try:
+            video_data = self._json_backend.loads(response.content)
+        except ValueError:
+            raise YouTubeDataUnparsable(video_id)
+        if not isinstance(video_data, dict):
+            raise YouTubeDataUnparsable(video_id)
+        return video_data
+
+    def _download_watch_page(self, video_id: str) -> _WatchPage:
+        """
+        Returns the watch page without decoding it, as only the parts which are
+        actually extracted from it have to be decoded and unescaped.
+        """
+        if self._stream_watch_page:
+            return _call_with_retries(
+                self._retry_policy,
+                lambda: self._download_streamed_watch_page(video_id),
+            )
+
+        def get() -> Response:
+            url = WATCH_URL.format(video_id=video_id)
+            _wait_for_rate_limiter(self._rate_limiter, url)
+            return _raise_http_errors(self._http_client.get(url), video_id)
+
+        response = _call_with_retries(self._retry_policy, get)
+        return _WatchPage(response.content, _get_encoding(response))
+
+    def _download_streamed_watch_page(self, video_id: str) -> _WatchPage:
+        """
+        Downloads the watch page only until the player response has been received and
+        closes the connection afterward, which saves about half of the traffic. If the
+        page has no player response, it is downloaded completely.
+        """
+        url = WATCH_URL.format(video_id=video_id)
+        _wait_for_rate_limiter(self._rate_limiter, url)
+        response = self._http_client.get(url, stream=True)
+        try:
+            _raise_http_errors(response, video_id)
+            reader = _WatchPageReader(_get_encoding(response))
+            for chunk in response.iter_content(self.WATCH_PAGE_CHUNK_SIZE):
+                if reader.feed(chunk):
+                    break
+            return reader.page
+        finally:
+            response.close()
+
 
-    def _fetch_html(self, video_id: str) -> str:
-        response = self._http_client.get(WATCH_URL.format(video_id=video_id))
-        return unescape(_raise_http_errors(response, video_id).text)
+class _UnsupportedXml(Exception):
+    """
+    Raised by the tokenizer of `_TranscriptParser` for documents it leaves to
+    defusedxml.
+    """
 
 
 class _TranscriptParser:
+    """
+    Parses the timedtext XML of a transcript. Documents in the form YouTube returns
+    them in are tokenized in a single pass, which only decodes the predefined XML
+    entities and character references, so there is nothing that could be expanded.
+    Anything else, like a DTD, comments or nested elements, is parsed by defusedxml,
+    which keeps rejecting entity declarations.
+    """
+
     _FORMATTING_TAGS = [
         "strong",  # important
         "em",  # emphasized
@@ -451,70 +1530,512 @@ class _TranscriptParser:
         "sub",  # subscript
         "sup",  # superscript
     ]
+    _HTML_REGEX = re.compile(r"<[^>]*>")
+    # matches at the start of the tags which are kept if formatting is preserved
+    _FORMATTING_TAG_REGEX = re.compile(
+        r"</?(?:" + "|".join(_FORMATTING_TAGS) + r")\b", re.IGNORECASE
+    )
+    # a tag which isn't kept ends at the first `>` following a word character, unless
+    # a line break comes first
+    _TAG_END_REGEX = re.compile(r"\w>|\n")
+
+    _XML_HEAD_REGEX = re.compile(
+        r'(?:<\?xml version="1\.0"(?: encoding="utf-8")? ?\?>)?[ \t\n]*<transcript>'
+    )
+    _XML_TAIL = "</transcript>"
+    # characters which either aren't allowed or are normalized in XML documents
+    _XML_UNSUPPORTED_CHARACTERS = (
+        r"\x00-\x08\x0b\x0c\x0e-\x1f\r\ud800-\udfff\ufffe\uffff"
+    )
+    # Matches a `<text>` element, capturing the values of its `start` and `dur`
+    # attributes if these are all it has, its attributes otherwise and its text.
+    # Anything but whitespace between the elements is captured by the last group, as
+    # is any unsupported character.
+    _XML_TEXT_ELEMENT_REGEX = re.compile(
+        r'[ \t\n]*<text(?: start="([^"<&\s{0}]+)"(?: dur="([^"<&\s{0}]+)")?'
+        r'|((?:[ \t\n]+[A-Za-z_][A-Za-z0-9_.-]*[ \t\n]*=[ \t\n]*"[^"<&\s{0}]*")*))'
+        r"[ \t\n]*(?:/>|>([^<{0}]*)</text>)|([^ \t\n])".format(
+            _XML_UNSUPPORTED_CHARACTERS
+        )
+    )
+    _XML_ATTRIBUTE_REGEX = re.compile(r'([^ \t\n=]+)[ \t\n]*=[ \t\n]*"([^"]*)"')
+    _XML_UNSUPPORTED_AMPERSAND_REGEX = re.compile(
+        r"&(?!(?:lt|gt|amp|quot|apos|#[0-9]+|#x[0-9a-fA-F]+);)"
+    )
+    _XML_ENTITY_REGEX = re.compile(
+        r"&(?:(lt|gt|amp|quot|apos)|#([0-9]+)|#x([0-9a-fA-F]+));"
+    )
+    _XML_PREDEFINED_ENTITIES = {
+        "lt": "<",
+        "gt": ">",
+        "amp": "&",
+        "quot": '"',
+        "apos": "'",
+    }
+    # the size of the segments documents are tokenized in
+    _XML_SEGMENT_SIZE = 1024 * 1024
 
     def __init__(self, preserve_formatting: bool = False):
-        self._html_regex = self._get_html_regex(preserve_formatting)
+        self._preserve_formatting = preserve_formatting
 
-    def _get_html_regex(self, preserve_formatting: bool) -> Pattern[str]:
-        if preserve_formatting:
-            formats_regex = "|".join(self._FORMATTING_TAGS)
-            formats_regex = r"<\/?(?!\/?(" + formats_regex + r")\b).*?\b>"
-            html_regex = re.compile(formats_regex, re.IGNORECASE)
+    def parse(
+        self, raw_data: Union[str, bytes], encoding: str = "utf-8"
+    ) -> _ColumnarSnippets:
+        """
+        :param raw_data: the document, either decoded or as the bytes it has been
+            received as, which are only decoded one segment at a time
+        :param encoding: the encoding of the document, if it is passed in as bytes
+        """
+        try:
+            return self._parse_tokens(raw_data, encoding)
+        except (_UnsupportedXml, KeyError, ValueError):
+            # invalid documents are parsed again, so they fail exactly like they
+            # always have
+            if isinstance(raw_data, bytes):
+                raw_data = raw_data.decode(encoding, errors="replace")
+            return self._parse_tree(raw_data)
+
+    def _parse_tree(self, raw_data: str) -> _ColumnarSnippets:
+        texts = []
+        starts = array("d")
+        durations = array("d")
+        for xml_element in ElementTree.fromstring(raw_data):
+            if xml_element.text is not None:
+                texts.append(self._strip_tags(unescape(xml_element.text)))
+                starts.append(float(xml_element.attrib["start"]))
+                durations.append(float(xml_element.attrib.get("dur", "0.0")))
+        return _ColumnarSnippets(texts, starts, durations)
+
+    def _split_segments(
+        self, raw_data: Union[str, bytes], encoding: str
+    ) -> Iterator[str]:
+        """
+        Splits the document into segments of about `_XML_SEGMENT_SIZE` bytes or
+        characters, which end right after a `</text>` tag. Tokens never span a closing
+        tag, so the segments can be tokenized one after the other, without ever
+        holding the tokens of the whole document at once. Bytes are decoded segment by
+        segment, so the document is never decoded as a whole either.
+        """
+        if isinstance(raw_data, bytes):
+            closing_tag: Union[str, bytes] = b"</text>"
+            view = memoryview(raw_data)
         else:
-            html_regex = re.compile(r"<[^>]*>", re.IGNORECASE)
-        return html_regex
+            closing_tag = "</text>"
+        segment_start = 0
+        while True:
+            segment_end = raw_data.find(
+                closing_tag, segment_start + self._XML_SEGMENT_SIZE
+            )
+            segment_end = (
+                len(raw_data) if segment_end == -1 else segment_end + len(closing_tag)
+            )
+            if isinstance(raw_data, bytes):
+                yield str(view[segment_start:segment_end], encoding, "replace")
+            else:
+                yield raw_data[segment_start:segment_end]
+            if segment_end == len(raw_data):
+                return
+            segment_start = segment_end
+
+    def _parse_tokens(
+        self, raw_data: Union[str, bytes], encoding: str
+    ) -> _ColumnarSnippets:
+        texts: List[str] = []
+        starts = array("d")
+        durations = array("d")
+        segments = self._split_segments(raw_data, encoding)
+        segment = next(segments)
+        head = self._XML_HEAD_REGEX.match(segment)
+        if head is None:
+            raise _UnsupportedXml()
+        body_start = head.end()
+        for next_segment in chain(segments, (None,)):
+            if next_segment is None:
+                body_end = len(segment.rstrip(" \t\n")) - len(self._XML_TAIL)
+                if not segment.startswith(self._XML_TAIL, body_end):
+                    raise _UnsupportedXml()
+            else:
+                body_end = len(segment)
+            self._tokenize(segment, body_start, body_end, texts, starts, durations)
+            segment = next_segment
+            body_start = 0
+        return _ColumnarSnippets(texts, starts, durations)
 
-    def parse(self, raw_data: str) -> List[FetchedTranscriptSnippet]:
-        return [
-            FetchedTranscriptSnippet(
-                text=re.sub(self._html_regex, "", unescape(xml_element.text)),
-                start=float(xml_element.attrib["start"]),
-                duration=float(xml_element.attrib.get("dur", "0.0")),
+    def _tokenize(
+        self,
+        segment: str,
+        body_start: int,
+        body_end: int,
+        texts: List[str],
+        starts: "array[float]",
+        durations: "array[float]",
+    ) -> None:
+        """
+        Adds the snippets of the `<text>` elements between `body_start` and
+        `body_end` to the given columns.
+        """
+        if "]]>" in segment or self._XML_UNSUPPORTED_AMPERSAND_REGEX.search(segment):
+            raise _UnsupportedXml()
+
+        segment_starts = []
+        segment_durations = []
+        for (
+            start,
+            duration,
+            raw_attributes,
+            text,
+            unsupported,
+        ) in self._XML_TEXT_ELEMENT_REGEX.findall(segment, body_start, body_end):
+            if unsupported:
+                raise _UnsupportedXml()
+            if start:
+                duration = duration or "0.0"
+            else:
+                attributes = self._parse_attributes(raw_attributes)
+                start = attributes.get("start")
+                duration = attributes.get("dur", "0.0")
+            if text:
+                if start is None:
+                    raise _UnsupportedXml()
+                if "&" in text:
+                    text = self._decode_xml_entities(text)
+                    if "&" in text:
+                        text = unescape(text)
+                texts.append(self._strip_tags(text))
+                segment_starts.append(start)
+                segment_durations.append(duration)
+        starts.extend(map(float, segment_starts))
+        durations.extend(map(float, segment_durations))
+
+    def _parse_attributes(self, raw_attributes: str) -> Dict[str, str]:
+        pairs = self._XML_ATTRIBUTE_REGEX.findall(raw_attributes)
+        attributes = dict(pairs)
+        if len(attributes) != len(pairs) or "xmlns" in attributes:
+            raise _UnsupportedXml()
+        return attributes
+
+    def _decode_xml_entities(self, text: str) -> str:
+        if "&#" in text:
+            # a single pass, as what a character reference is decoded to (like the
+            # `&` of `&#38;amp;`) mustn't be decoded again
+            return self._XML_ENTITY_REGEX.sub(self._decode_xml_entity, text)
+        # without character references every `&` starts one of these, so decoding
+        # `&amp;` last gives the same result as a single pass, without a callback
+        # for every entity
+        return (
+            text.replace("&lt;", "<")
+            .replace("&gt;", ">")
+            .replace("&quot;", '"')
+            .replace("&apos;", "'")
+            .replace("&amp;", "&")
+        )
+
+    def _decode_xml_entity(self, match: Match) -> str:
+        name, decimal, hexadecimal = match.groups()
+        if name is not None:
+            return self._XML_PREDEFINED_ENTITIES[name]
+        code_point = int(decimal) if decimal is not None else int(hexadecimal, 16)
+        if not (
+            code_point in (0x9, 0xA, 0xD)
+            or 0x20 <= code_point <= 0xD7FF
+            or 0xE000 <= code_point <= 0xFFFD
+            or 0x10000 <= code_point <= 0x10FFFF
+        ):
+            raise _UnsupportedXml()
+        return chr(code_point)
+
+    def _strip_tags(self, text: str) -> str:
+        if "<" not in text:
+            return text
+        if not self._preserve_formatting:
+            return self._HTML_REGEX.sub("", text)
+
+        # Removes the same tags as `<\/?(?!\/?(strong|em|...)\b).*?\b>` would, but
+        # without the backtracking. Where a tag ends doesn't depend on where it
+        # starts, so the end found for one tag is reused for the tags in front of it.
+        match_formatting_tag = self._FORMATTING_TAG_REGEX.match
+        search_tag_end = self._TAG_END_REGEX.search
+        parts = []
+        kept_from = 0
+        tag_end = None
+        tag_start = text.find("<")
+        while tag_start != -1:
+            if match_formatting_tag(text, tag_start) is not None:
+                tag_start = text.find("<", tag_start + 1)
+                continue
+            if tag_end is None or tag_end.start() < tag_start:
+                tag_end = search_tag_end(text, tag_start + 1)
+                if tag_end is None:
+                    break
+            if tag_end.group() == "\n":
+                tag_start = text.find("<", tag_end.end())
+            else:
+                parts.append(text[kept_from:tag_start])
+                kept_from = tag_end.end()
+                tag_start = text.find("<", kept_from)
+        if not parts:
+            return text
+        parts.append(text[kept_from:])
+        return "".join(parts)
+
+
+class _TranscriptPullParserTarget:
+    """
+    Handles the events of the expat parser used by `_TranscriptPullParser`. It
+    creates a snippet for every child of the root element the same way
+    `_TranscriptParser` does, as soon as the child has been closed.
+    """
+
+    def __init__(self, strip_tags: Callable[[str], str]):
+        self._strip_tags = strip_tags
+        self._depth = 0
+        # the attributes of the current child, as alternating names and values
+        self._attributes: List[str] = []
+        # like `Element.text`, the text of a child ends where an element is nested
+        self._text_parts: List[str] = []
+        self._in_text = False
+        self.snippets: List[FetchedTranscriptSnippet] = []
+
+    def start(self, tag: str, attributes: List[str]) -> None:
+        self._depth += 1
+        if self._depth == 2:
+            self._attributes = attributes
+            self._text_parts = []
+            self._in_text = True
+        else:
+            self._in_text = False
+
+    def data(self, text: str) -> None:
+        if self._in_text:
+            self._text_parts.append(text)
+
+    def end(self, tag: str) -> None:
+        if self._depth == 2 and self._text_parts:
+            attributes = dict(zip(self._attributes[::2], self._attributes[1::2]))
+            self.snippets.append(
+                _create_snippet(
+                    self._strip_tags(unescape("".join(self._text_parts))),
+                    float(attributes["start"]),
+                    float(attributes.get("dur", "0.0")),
+                )
             )
-            for xml_element in ElementTree.fromstring(raw_data)
-            if xml_element.text is not None
-        ]
+        self._in_text = False
+        self._depth -= 1
+
+    def close(self) -> None:
+        pass
+
+
+class _TranscriptPullParser:
+    """
+    Parses the timedtext XML of a transcript incrementally while it is being
+    downloaded, using defusedxml. The snippets are the same ones `_TranscriptParser`
+    returns, but each of them can be read as soon as its element has been closed.
+    """
+
+    def __init__(self, preserve_formatting: bool = False):
+        self._target = _TranscriptPullParserTarget(
+            _TranscriptParser(preserve_formatting)._strip_tags
+        )
+        self._parser = ElementTree.XMLParser(target=self._target)
+        # The element handlers are replaced with the ones of the target, as building
+        # elements would take a third of the time. The handlers defusedxml installs
+        # to forbid entities and DTDs are kept.
+        expat_parser = self._parser.parser
+        expat_parser.StartElementHandler = self._target.start
+        expat_parser.EndElementHandler = self._target.end
+        expat_parser.CharacterDataHandler = self._target.data
+
+    def feed(self, data: bytes) -> None:
+        self._parser.feed(data)
+
+    def close(self) -> None:
+        self._parser.close()
+
+    def read_snippets(self) -> List[FetchedTranscriptSnippet]:
+        """
+        Returns the snippets which have been parsed since this was last called.
+        """
+        snippets = self._target.snippets
+        self._target.snippets = []
+        return snippets
+
+
+class _Json3TranscriptParser(_TranscriptParser):
+    """
+    Parses transcripts in YouTube's JSON format. Its events either are cues, with the
+    text split into segments, or only define windows or append line breaks to the
+    previous cue, which is what the XML format doesn't contain either.
+    """
+
+    def __init__(self, json_backend: Optional[JsonBackend] = None):
+        super().__init__()
+        self._json_backend = (
+            get_default_json_backend() if json_backend is None else json_backend
+        )
+
+    def parse(self, raw_data: Union[str, bytes]) -> _ColumnarSnippets:
+        texts = []
+        starts = array("d")
+        durations = array("d")
+        for event in self._json_backend.loads(raw_data)["events"]:
+            segments = event.get("segs")
+            if not segments or event.get("aAppend"):
+                continue
+            text = "".join(segment["utf8"] for segment in segments)
+            if text:
+                texts.append(self._strip_tags(text))
+                starts.append(event["tStartMs"] / 1000)
+                durations.append(event.get("dDurationMs", 0) / 1000)
+        return _ColumnarSnippets(texts, starts, durations)
+
+
+class _Srv3TranscriptParser(_TranscriptParser):
+    """
+    Parses transcripts in YouTube's srv3 XML format. The text of its paragraphs can be
+    split into segments, and paragraphs which only append line breaks to the previous
+    one are skipped, as the XML format doesn't contain them either.
+    """
+
+    def parse(self, raw_data: Union[str, bytes]) -> _ColumnarSnippets:
+        body = ElementTree.fromstring(raw_data).find("body")
+        if body is None:
+            raise ValueError("the srv3 document has no body")
+        texts = []
+        starts = array("d")
+        durations = array("d")
+        for paragraph in body.iter("p"):
+            if paragraph.get("a"):
+                continue
+            text = "".join(paragraph.itertext())
+            if text:
+                texts.append(self._strip_tags(text))
+                starts.append(int(paragraph.attrib["t"]) / 1000)
+                durations.append(int(paragraph.get("d", "0")) / 1000)
+        return _ColumnarSnippets(texts, starts, durations)
+
+
+# the errors the parsers of the compact formats raise for responses they can't parse
+_COMPACT_FORMAT_ERRORS = (
+    AttributeError,
+    KeyError,
+    TypeError,
+    ValueError,
+    ElementTree.ParseError,
+)
 
 
 class _JsVarParser:
-    def __init__(self, var_name: str):
+    """
+    Decodes the JSON value of a JavaScript variable embedded into a page. As the
+    value is followed by the rest of the page, it is located and decoded using the
+    `raw_decode` method of the standard library, which none of the faster JSON
+    libraries offer. The `json_backend` is only used to decode values whose bounds
+    are already known.
+    """
+
+    _JSON_DECODER = json.JSONDecoder()
+    _WHITESPACE_REGEX = re.compile(r"[ \t\n\r]*")
+
+    def __init__(self, var_name: str, json_backend: Optional[JsonBackend] = None):
         self._var_name = var_name
+        self._json_backend = (
+            get_default_json_backend() if json_backend is None else json_backend
+        )
+
+    @staticmethod
+    def declaration(var_name: str) -> str:
+        return f"var {var_name}"
 
     def parse(self, raw_html: str, video_id: str) -> Dict:
-        char_iterator = self._create_var_char_iterator(raw_html, video_id)
-        var_string = self._find_var_substring(char_iterator, video_id)
-        return json.loads(var_string)
+        var_start = self._find_var_start(raw_html)
+        if var_start == -1:
+            raise YouTubeDataUnparsable(video_id)
+        try:
+            return self._decode_value(raw_html, var_start)[0]
+        except json.JSONDecodeError:
+            raise YouTubeDataUnparsable(video_id)
 
-    def _create_var_char_iterator(self, raw_html: str, video_id: str) -> Iterator[str]:
-        splitted_html = raw_html.split(f"var {self._var_name}")
-        if len(splitted_html) <= 1:
+    def parse_members(
+        self,
+        raw_html: str,
+        video_id: str,
+        member_names: Iterable[str],
+    ) -> Dict:
+        """
+        Only decodes the given top-level members of the variable's object value.
+        Members are walked in order and the walk stops as soon as all requested members
+        have been found, so nothing following them is ever turned into Python objects.
+        Members in between are decoded one at a time and dropped right away, which
+        keeps the peak memory down to the size of the largest member.
+        """
+        remaining_names = set(member_names)
+        members = {}
+        position = self._find_var_start(raw_html)
+        if position == -1:
             raise YouTubeDataUnparsable(video_id)
-        char_iterator = iter(splitted_html[1])
-        while next(char_iterator) != "{":
-            pass
-        return char_iterator
-
-    def _find_var_substring(self, char_iterator: Iterator[str], video_id: str) -> str:
-        escaped = False
-        in_quotes = False
-        depth = 1
-        chars = ["{"]
-
-        for char in char_iterator:
-            chars.append(char)
-            if escaped:
-                escaped = False
-            elif char == "\\":
-                escaped = True
-            elif char == '"':
-                in_quotes = not in_quotes
-            elif not in_quotes:
-                if char == "{":
-                    depth += 1
-                elif char == "}":
-                    depth -= 1
-            if depth == 0:
-                return "".join(chars)
-
-        # This should never happen!
-        raise YouTubeDataUnparsable(video_id)  # pragma: no cover
+        try:
+            position = self._skip_whitespace(raw_html, position + 1)
+            while remaining_names and raw_html[position] != "}":
+                self._expect(raw_html, position, '"')
+                name, position = scanstring(raw_html, position + 1)
+                position = self._skip_whitespace(raw_html, position)
+                self._expect(raw_html, position, ":")
+                position = self._skip_whitespace(raw_html, position + 1)
+                if name in remaining_names:
+                    members[name], position = self._decode_value(raw_html, position)
+                    remaining_names.discard(name)
+                else:
+                    _, position = self._JSON_DECODER.raw_decode(raw_html, position)
+                position = self._skip_whitespace(raw_html, position)
+                if raw_html[position] == ",":
+                    position = self._skip_whitespace(raw_html, position + 1)
+                else:
+                    self._expect(raw_html, position, "}")
+        except (json.JSONDecodeError, IndexError):
+            raise YouTubeDataUnparsable(video_id)
+        return members
+
+    def _find_var_start(self, raw_html: str) -> int:
+        """
+        Returns the offset of the opening brace of the variable's value or -1, if the
+        page has no such variable. The value itself is decoded in place, so the page
+        never has to be split or copied.
+        """
+        declaration = self.declaration(self._var_name)
+        declaration_start = raw_html.find(declaration)
+        if declaration_start == -1:
+            return -1
+        return raw_html.find("{", declaration_start + len(declaration))
+
+    def find_var_end(self, raw_html: str) -> int:
+        """
+        Returns the offset right after the variable's value or -1, if the value can't
+        be decoded (yet).
+        """
+        var_start = self._find_var_start(raw_html)
+        if var_start == -1:
+            return -1
+        try:
+            _, var_end = self._JSON_DECODER.raw_decode(raw_html, var_start)
+        except json.JSONDecodeError:
+            return -1
+        return var_end
+
+    def _decode_value(self, raw_html: str, position: int) -> Tuple[Any, int]:
+        """
+        Decodes the JSON value starting at `position`, as it would be decoded after
+        unescaping the HTML entities of the whole page. Unescaping is scoped to the
+        source of this value and only happens if it contains any entities at all.
+        """
+        value, end = self._JSON_DECODER.raw_decode(raw_html, position)
+        if raw_html.find("&", position, end) != -1:
+            value = self._json_backend.loads(unescape(raw_html[position:end]))
+        return value, end
+
+    def _skip_whitespace(self, raw_html: str, position: int) -> int:
+        return self._WHITESPACE_REGEX.match(raw_html, position).end()
+
+    def _expect(self, raw_html: str, position: int, char: str) -> None:
+        if raw_html[position] != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", raw_html, position)
@@ -0,0 +1,773 @@
+import asyncio
+import json
+import sqlite3
+import time
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+from urllib.parse import parse_qs, urlparse
+
+from ._errors import (
+    AgeRestricted,
+    CouldNotRetrieveTranscript,
+    InvalidVideoId,
+    TranscriptsDisabled,
+    VideoUnavailable,
+    VideoUnplayable,
+)
+from ._transcripts import (
+    FetchedTranscript,
+    TranscriptKey,
+    _ColumnarSnippets,
+    _LazyColumnarSnippets,
+)
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    A snapshot of the counters of a cache.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    """
+    The number of entries that have been removed because the cache was full or
+    because they have expired. Entries removed using `invalidate` or `clear` are not
+    counted.
+    """
+    size: int
+
+
+def _copy_exception(exception: Exception) -> Exception:
+    """
+    Returns a copy of the exception without its traceback, so raising it doesn't grow
+    the traceback of the original instance, which may be raised in several threads at
+    once. `copy.copy` can't be used, as it calls `__init__` with the exception's
+    `args`, which doesn't match the signatures of this library's exceptions.
+    """
+    copied_exception = exception.__class__.__new__(exception.__class__)
+    copied_exception.__dict__.update(exception.__dict__)
+    copied_exception.args = exception.args
+    return copied_exception
+
+
+class _ExpiringLruCache:
+    """
+    A thread-safe LRU cache whose entries additionally expire at a given point in
+    time. Expired entries are removed lazily, once they are looked up or once they
+    reach the end of the LRU order.
+    """
+
+    def __init__(self, max_size: int):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self._max_size = max_size
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.time():
+                del self._entries[key]
+                self._evictions += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, expires_at: float) -> None:
+        if expires_at <= time.time():
+            return
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+            )
+
+
+class TranscriptListCache:
+    """
+    An in-memory cache for the lists of transcripts available for videos, which saves
+    downloading and parsing the watch page of a video again, every time its
+    transcripts are listed or fetched. It can be passed to `YouTubeTranscriptApi`:
+
+    ```
+    cache = TranscriptListCache(max_size=10_000, ttl=3600)
+    ytt_api = YouTubeTranscriptApi(transcript_list_cache=cache)
+    ```
+
+    Entries are evicted in least recently used order once `max_size` is reached, and
+    expire after `ttl` seconds. The URLs YouTube provides to fetch the transcripts
+    with are only valid for a limited amount of time, so entries expire earlier, if
+    any of their URLs expires before the `ttl` is over.
+
+    The cache is thread-safe, so a single instance can be shared between threads and
+    between multiple `YouTubeTranscriptApi` instances.
+    """
+
+    EXPIRY_MARGIN = 60
+    """
+    The number of seconds before their URLs expire, that entries are evicted at, to
+    leave enough time to fetch a transcript after it has been listed.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 3600):
+        """
+        :param max_size: the maximum number of videos which are cached
+        :param ttl: the maximum number of seconds a video is cached for
+        """
+        self._cache = _ExpiringLruCache(max_size)
+        self._ttl = ttl
+
+    def get(self, video_id: str) -> Optional[Dict]:
+        """
+        Returns the cached captions JSON of the given video or None, if there is none.
+        """
+        return self._cache.get(video_id)
+
+    def set(self, video_id: str, captions_json: Dict) -> None:
+        """
+        Caches the captions JSON of the given video.
+        """
+        expires_at = time.time() + self._ttl
+        url_expires_at = self._get_url_expiry(captions_json)
+        if url_expires_at is not None:
+            expires_at = min(expires_at, url_expires_at - self.EXPIRY_MARGIN)
+        self._cache.set(video_id, captions_json, expires_at)
+
+    def invalidate(self, video_id: str) -> None:
+        """
+        Removes the given video from the cache, so it is fetched again the next time
+        its transcripts are requested.
+        """
+        self._cache.invalidate(video_id)
+
+    def clear(self) -> None:
+        """
+        Removes all videos from the cache.
+        """
+        self._cache.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    def _get_url_expiry(self, captions_json: Dict) -> Optional[float]:
+        """
+        Returns the earliest expiry timestamp of the caption track URLs or None, if
+        none of them carries one.
+        """
+        expiry = None
+        for caption in captions_json.get("captionTracks", []):
+            expire_values = parse_qs(urlparse(caption.get("baseUrl", "")).query).get(
+                "expire"
+            )
+            if not expire_values:
+                continue
+            try:
+                url_expiry = float(expire_values[0])
+            except ValueError:
+                continue
+            expiry = url_expiry if expiry is None else min(expiry, url_expiry)
+        return expiry
+
+
+class ErrorCache:
+    """
+    An in-memory cache for the errors retrieving the lists of transcripts available
+    for videos has failed with. Most of these errors are permanent, like a video
+    being unavailable or having its transcripts disabled, so there is no point in
+    downloading the watch page of such a video again. Instead, the cached exception
+    is raised again right away. It can be passed to `YouTubeTranscriptApi`:
+
+    ```
+    ytt_api = YouTubeTranscriptApi(error_cache=ErrorCache())
+    ```
+
+    How long an error is cached for depends on its exception class, which is looked
+    up in `ttls`, including its base classes. Exceptions which aren't found in there,
+    like `RequestBlocked` or `YouTubeRequestFailed`, are never cached, as they are
+    transient and retrying may very well succeed.
+
+    The cache is thread-safe, so a single instance can be shared between threads and
+    between multiple `YouTubeTranscriptApi` instances.
+    """
+
+    DEFAULT_TTLS: Dict[Type[CouldNotRetrieveTranscript], float] = {
+        VideoUnavailable: 24 * 3600,
+        InvalidVideoId: 24 * 3600,
+        AgeRestricted: 24 * 3600,
+        TranscriptsDisabled: 6 * 3600,
+        VideoUnplayable: 3600,
+    }
+
+    def __init__(
+        self,
+        max_size: int = 10_000,
+        ttls: Optional[Dict[Type[CouldNotRetrieveTranscript], float]] = None,
+    ):
+        """
+        :param max_size: the maximum number of videos errors are cached for
+        :param ttls: maps exception classes onto the number of seconds they are
+            cached for. Defaults to `DEFAULT_TTLS`.
+        """
+        self._cache = _ExpiringLruCache(max_size)
+        self._ttls = self.DEFAULT_TTLS if ttls is None else ttls
+
+    def raise_if_cached(self, video_id: str) -> None:
+        """
+        Raises the exception cached for the given video, if there is one.
+        """
+        exception = self._cache.get(video_id)
+        if exception is not None:
+            raise _copy_exception(exception)
+
+    def set(self, video_id: str, exception: CouldNotRetrieveTranscript) -> None:
+        """
+        Caches the given exception for the given video, if its class has a TTL.
+        """
+        ttl = self._get_ttl(type(exception))
+        if ttl:
+            self._cache.set(video_id, _copy_exception(exception), time.time() + ttl)
+
+    def invalidate(self, video_id: str) -> None:
+        """
+        Removes the error cached for the given video.
+        """
+        self._cache.invalidate(video_id)
+
+    def clear(self) -> None:
+        """
+        Removes all errors from the cache.
+        """
+        self._cache.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        return self._cache.stats
+
+    def _get_ttl(self, exception_class: Type[Exception]) -> Optional[float]:
+        for cls in exception_class.__mro__:
+            if cls in self._ttls:
+                return self._ttls[cls]
+        return None
+
+
+@dataclass(frozen=True)
+class CoalescingStats:
+    """
+    A snapshot of the counters of a `RequestCoalescer`.
+    """
+
+    requests: int
+    coalesced: int
+    """
+    The number of requests which didn't hit YouTube themselves, but have been served
+    the outcome of an identical request that was already in flight.
+    """
+    in_flight: int
+
+
+class RequestCoalescer:
+    """
+    Makes sure that identical requests, which are in flight at the same time, only
+    hit YouTube once ("singleflight"). The first request for a key does the actual
+    work, while all requests with the same key arriving before it is done wait for
+    it and receive its result or the exception it has raised. Once it is done, the
+    key is forgotten, so this doesn't cache anything. It can be passed to
+    `YouTubeTranscriptApi` or `AsyncYouTubeTranscriptApi`:
+
+    ```
+    ytt_api = YouTubeTranscriptApi(request_coalescer=RequestCoalescer())
+    ```
+
+    Requests are coalesced at two levels. Retrieving the list of transcripts of a
+    video is shared by all requests for that video, no matter which languages they
+    ask for, and fetching a transcript is shared by all requests resolving to the
+    same transcript, translation and formatting.
+
+    The coalescer is thread-safe and can be used from threads and from coroutines at
+    the same time. Coroutines are only coalesced with coroutines running in the same
+    event loop, though.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._in_flight: Dict[Hashable, "Future[Any]"] = {}
+        self._async_in_flight: Dict[
+            Tuple[asyncio.AbstractEventLoop, Hashable], "asyncio.Future[Any]"
+        ] = {}
+        self._requests = 0
+        self._coalesced = 0
+
+    def call(self, key: Hashable, function: Callable[[], T]) -> T:
+        """
+        Calls `function`, unless a call with the same key is already in flight, in
+        which case its outcome is waited for and returned instead.
+        """
+        with self._lock:
+            self._requests += 1
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._in_flight[key] = Future()
+            else:
+                self._coalesced += 1
+
+        if not is_leader:
+            exception = future.exception()
+            if exception is not None:
+                raise self._copy_library_exception(exception)
+            return future.result()
+
+        try:
+            result = function()
+        except BaseException as exception:
+            future.set_exception(exception)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    async def acall(self, key: Hashable, function: Callable[[], Awaitable[T]]) -> T:
+        """
+        The asyncio counterpart of `call`. The awaitable returned by `function` is
+        run as a task of its own, so cancelling one of the waiting coroutines
+        doesn't cancel the request for the others.
+        """
+        loop = asyncio.get_running_loop()
+        loop_key = (loop, key)
+        with self._lock:
+            self._requests += 1
+            task = self._async_in_flight.get(loop_key)
+            is_leader = task is None
+            if is_leader:
+                task = self._async_in_flight[loop_key] = asyncio.ensure_future(
+                    function()
+                )
+                task.add_done_callback(lambda _: self._forget_task(loop_key))
+            else:
+                self._coalesced += 1
+
+        try:
+            return await asyncio.shield(task)
+        except CouldNotRetrieveTranscript as exception:
+            if is_leader:
+                raise
+            raise self._copy_library_exception(exception) from None
+
+    @property
+    def stats(self) -> CoalescingStats:
+        with self._lock:
+            return CoalescingStats(
+                requests=self._requests,
+                coalesced=self._coalesced,
+                in_flight=len(self._in_flight) + len(self._async_in_flight),
+            )
+
+    def _forget_task(
+        self, loop_key: Tuple[asyncio.AbstractEventLoop, Hashable]
+    ) -> None:
+        with self._lock:
+            del self._async_in_flight[loop_key]
+
+    @staticmethod
+    def _copy_library_exception(exception: BaseException) -> BaseException:
+        if isinstance(exception, CouldNotRetrieveTranscript):
+            return _copy_exception(exception)
+        return exception
+
+
+class SQLiteTranscriptStore:
+    """
+    A persistent store for fetched transcripts, backed by a SQLite database. Once a
+    transcript has been fetched, it is served from the store, even after the process
+    has been restarted. It can be passed to `YouTubeTranscriptApi`:
+
+    ```
+    with SQLiteTranscriptStore("transcripts.sqlite3") as store:
+        ytt_api = YouTubeTranscriptApi(transcript_store=store)
+        ytt_api.fetch(video_id)
+    ```
+
+    `YouTubeTranscriptApi.fetch` also remembers which transcript has been selected
+    for the requested languages, so fetching the same video with the same languages
+    again doesn't require any requests to YouTube at all.
+
+    Writes are buffered and committed in batches, once `batch_size` writes are
+    pending or `flush_interval` seconds have passed since the first of them. Make
+    sure to call `close()` (or use the store as a context manager) to commit the
+    remaining writes. The database is used in WAL mode, so it can be read by other
+    processes while it is being written to. Once the transcripts stored take up more
+    than `max_size` bytes, the least recently used ones are evicted.
+
+    The store is thread-safe, so a single instance can be shared between threads.
+    """
+
+    _SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS transcripts (
+            video_id TEXT NOT NULL,
+            language_code TEXT NOT NULL,
+            is_generated INTEGER NOT NULL,
+            translation_language_code TEXT NOT NULL,
+            preserve_formatting INTEGER NOT NULL,
+            data BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            last_used REAL NOT NULL,
+            PRIMARY KEY (
+                video_id,
+                language_code,
+                is_generated,
+                translation_language_code,
+                preserve_formatting
+            )
+        ) WITHOUT ROWID
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS transcripts_last_used ON transcripts (last_used)
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS selections (
+            video_id TEXT NOT NULL,
+            languages TEXT NOT NULL,
+            language_code TEXT NOT NULL,
+            is_generated INTEGER NOT NULL,
+            PRIMARY KEY (video_id, languages)
+        ) WITHOUT ROWID
+        """,
+    )
+
+    def __init__(
+        self,
+        path: Union[Path, str],
+        max_size: int = 256 * 1024 * 1024,
+        batch_size: int = 100,
+        flush_interval: float = 5.0,
+    ):
+        """
+        :param path: the path of the SQLite database file, which is created if it
+            doesn't exist yet
+        :param max_size: the maximum number of bytes the encoded transcripts may take
+            up, before the least recently used ones are evicted
+        :param batch_size: the number of buffered writes that triggers a commit
+        :param flush_interval: the maximum number of seconds writes are buffered for
+        """
+        self._max_size = max_size
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._lock = Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            for statement in self._SCHEMA:
+                self._connection.execute(statement)
+        self._pending_transcripts: Dict[Tuple, Tuple[bytes, float]] = {}
+        self._pending_selections: Dict[Tuple[str, str], Tuple[str, bool]] = {}
+        self._pending_uses: Dict[Tuple, float] = {}
+        self._pending_since: Optional[float] = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __enter__(self) -> "SQLiteTranscriptStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def get(self, key: TranscriptKey) -> Optional[FetchedTranscript]:
+        """
+        Returns the stored transcript for the given key or None, if there is none.
+        """
+        row_key = self._row_key(key)
+        with self._lock:
+            pending = self._pending_transcripts.get(row_key)
+            if pending is not None:
+                data = pending[0]
+            else:
+                row = self._connection.execute(
+                    "SELECT data FROM transcripts WHERE video_id = ? AND "
+                    "language_code = ? AND is_generated = ? AND "
+                    "translation_language_code = ? AND preserve_formatting = ?",
+                    row_key,
+                ).fetchone()
+                data = None if row is None else row[0]
+            if data is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._pending_uses[row_key] = time.time()
+            self._flush_if_due()
+        return self._decode(key.video_id, data, key.preserve_formatting)
+
+    def put(self, key: TranscriptKey, transcript: FetchedTranscript) -> None:
+        """
+        Stores the given transcript. The write is buffered until the next commit.
+        """
+        data = self._encode(transcript)
+        with self._lock:
+            self._pending_transcripts[self._row_key(key)] = (data, time.time())
+            self._flush_if_due()
+
+    def find(
+        self, video_id: str, languages: Iterable[str], preserve_formatting: bool
+    ) -> Optional[FetchedTranscript]:
+        """
+        Returns the stored transcript that has previously been selected for the given
+        video and language priorities by `YouTubeTranscriptApi.fetch` or None, if
+        there is none.
+        """
+        selection_key = (video_id, self._join_languages(languages))
+        with self._lock:
+            selection = self._pending_selections.get(selection_key)
+            if selection is None:
+                selection = self._connection.execute(
+                    "SELECT language_code, is_generated FROM selections "
+                    "WHERE video_id = ? AND languages = ?",
+                    selection_key,
+                ).fetchone()
+        if selection is None:
+            return None
+        return self.get(
+            TranscriptKey(
+                video_id, selection[0], bool(selection[1]), None, preserve_formatting
+            )
+        )
+
+    def put_selection(
+        self,
+        video_id: str,
+        languages: Iterable[str],
+        language_code: str,
+        is_generated: bool,
+    ) -> None:
+        """
+        Remembers which transcript has been selected for the given video and language
+        priorities, so `find` can serve it without listing the video's transcripts.
+        """
+        with self._lock:
+            self._pending_selections[(video_id, self._join_languages(languages))] = (
+                language_code,
+                is_generated,
+            )
+            self._flush_if_due()
+
+    def flush(self) -> None:
+        """
+        Commits all buffered writes and evicts transcripts, if the store is full.
+        """
+        with self._lock:
+            self._flush()
+
+    def close(self) -> None:
+        """
+        Commits all buffered writes and closes the database.
+        """
+        with self._lock:
+            self._flush()
+            self._connection.close()
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            size = self._connection.execute(
+                "SELECT COUNT(*) FROM transcripts"
+            ).fetchone()[0]
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=size + len(self._pending_transcripts),
+            )
+
+    def _flush_if_due(self) -> None:
+        now = time.time()
+        if self._pending_since is None:
+            self._pending_since = now
+        pending_count = (
+            len(self._pending_transcripts)
+            + len(self._pending_selections)
+            + len(self._pending_uses)
+        )
+        if (
+            pending_count >= self._batch_size
+            or now - self._pending_since >= self._flush_interval
+        ):
+            self._flush()
+
+    def _flush(self) -> None:
+        self._pending_since = None
+        if not (
+            self._pending_transcripts or self._pending_selections or self._pending_uses
+        ):
+            return
+        with self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO transcripts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (*row_key, data, len(data), last_used)
+                    for row_key, (data, last_used) in self._pending_transcripts.items()
+                ],
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO selections VALUES (?, ?, ?, ?)",
+                [
+                    (*selection_key, language_code, is_generated)
+                    for selection_key, (
+                        language_code,
+                        is_generated,
+                    ) in self._pending_selections.items()
+                ],
+            )
+            self._connection.executemany(
+                "UPDATE transcripts SET last_used = ? WHERE video_id = ? AND "
+                "language_code = ? AND is_generated = ? AND "
+                "translation_language_code = ? AND preserve_formatting = ?",
+                [
+                    (last_used, *row_key)
+                    for row_key, last_used in self._pending_uses.items()
+                ],
+            )
+            self._evict()
+        self._pending_transcripts.clear()
+        self._pending_selections.clear()
+        self._pending_uses.clear()
+
+    def _evict(self) -> None:
+        excess = (
+            self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM transcripts"
+            ).fetchone()[0]
+            - self._max_size
+        )
+        if excess <= 0:
+            return
+        evicted_row_keys = []
+        for *row_key, size in self._connection.execute(
+            "SELECT video_id, language_code, is_generated, translation_language_code, "
+            "preserve_formatting, size FROM transcripts ORDER BY last_used"
+        ):
+            evicted_row_keys.append(row_key)
+            excess -= size
+            if excess <= 0:
+                break
+        self._connection.executemany(
+            "DELETE FROM transcripts WHERE video_id = ? AND language_code = ? AND "
+            "is_generated = ? AND translation_language_code = ? AND "
+            "preserve_formatting = ?",
+            evicted_row_keys,
+        )
+        self._evictions += len(evicted_row_keys)
+
+    @staticmethod
+    def _row_key(key: TranscriptKey) -> Tuple:
+        return (
+            key.video_id,
+            key.language_code,
+            int(key.is_generated),
+            key.translation_language_code or "",
+            int(key.preserve_formatting),
+        )
+
+    @staticmethod
+    def _join_languages(languages: Iterable[str]) -> str:
+        return ",".join(languages)
+
+    @staticmethod
+    def _encode(transcript: FetchedTranscript) -> bytes:
+        """
+        Encodes a transcript column by column as compressed JSON, which compresses a
+        lot better than encoding it snippet by snippet. Transcripts which haven't been
+        parsed yet are stored as the XML they have been downloaded as instead, so
+        they don't have to be parsed for storing them.
+        """
+        snippets = transcript.snippets
+        if isinstance(snippets, _LazyColumnarSnippets) and not snippets.is_parsed:
+            columns = [snippets.payload.decode(snippets.encoding, errors="replace")]
+        else:
+            snippets = _ColumnarSnippets.from_snippets(snippets)
+            columns = [
+                snippets.texts,
+                snippets.starts.tolist(),
+                snippets.durations.tolist(),
+            ]
+        return zlib.compress(
+            json.dumps(
+                [transcript.language, transcript.language_code, transcript.is_generated]
+                + columns,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            ).encode("utf-8")
+        )
+
+    @staticmethod
+    def _decode(
+        video_id: str, data: bytes, preserve_formatting: bool = False
+    ) -> FetchedTranscript:
+        language, language_code, is_generated, *columns = json.loads(
+            zlib.decompress(data)
+        )
+        if len(columns) == 1:
+            snippets: _ColumnarSnippets = _LazyColumnarSnippets(
+                columns[0].encode("utf-8"), "utf-8", preserve_formatting
+            )
+        else:
+            snippets = _ColumnarSnippets(*columns)
+        return FetchedTranscript(
+            snippets=snippets,
+            video_id=video_id,
+            language=language,
+            language_code=language_code,
+            is_generated=is_generated,
+        )
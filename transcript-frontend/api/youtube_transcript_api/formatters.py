@@ -1,9 +1,192 @@
+import io
 import json
 
 import pprint
-from typing import List, Iterable
+from itertools import chain, islice, starmap
+from typing import (
+    Any,
+    Dict,
+    List,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+)
+
+try:  # pragma: no cover
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from .json_backends import JsonBackend, StdlibJsonBackend
+from ._transcripts import (
+    FetchedTranscript,
+    FetchedTranscriptSnippet,
+    _ColumnarSnippets,
+    _encodes_json_directly,
+)
+
+# the number of snippets the streaming methods of the formatters join into a chunk
+_CHUNK_SIZE = 1000
+
+# times up to which the fields of timestamps are computed in integer arithmetic,
+# which gives exactly the same results as the float arithmetic of
+# `_TextBasedFormatter._seconds_to_timestamp` for any time in this range
+_MAX_INTEGER_SECONDS = 2**31
+
+
+def _iter_joined(separator: str, parts: Iterable[str]) -> Iterator[str]:
+    """
+    Yields the same string as `separator.join(parts)` in chunks of `_CHUNK_SIZE`
+    parts, so `parts` can be a generator, which is never held in memory as a whole.
+    """
+    parts = iter(parts)
+    chunk_parts = list(islice(parts, _CHUNK_SIZE))
+    chunk_prefix = ""
+    while chunk_parts:
+        yield chunk_prefix + separator.join(chunk_parts)
+        chunk_prefix = separator
+        chunk_parts = list(islice(parts, _CHUNK_SIZE))
+
 
-from ._transcripts import FetchedTranscript, FetchedTranscriptSnippet
+def _iter_pformat_list(items: Iterable[Any], **kwargs) -> Iterator[str]:
+    """
+    Yields the same string as `pprint.pformat(list(items), **kwargs)` item by item, so
+    `items` can be a generator, which is never held in memory as a whole. This
+    follows how `PrettyPrinter` formats a list: It is printed on a single line, if
+    its repr fits, which can only be the case for the first few items, so only those
+    are held back. Otherwise, each item is formatted on its own, exactly like
+    `PrettyPrinter._format_items` does. As this uses private attributes of
+    `PrettyPrinter`, the tests compare its output to `pprint.pformat`.
+    """
+    printer = pprint.PrettyPrinter(**kwargs)
+    items = iter(items)
+    head = []
+    head_reprs = []
+    length = len("[]")
+    for item in items:
+        head.append(item)
+        head_reprs.append(printer._repr(item, {}, 1))
+        length += len(head_reprs[-1]) + (len(", ") if len(head) > 1 else 0)
+        if length > printer._width:
+            break
+    else:
+        yield "[" + ", ".join(head_reprs) + "]"
+        return
+    del head_reprs
+
+    yield "["
+    items = chain(head, items)
+    allowance = 1
+    indent = printer._indent_per_level
+    if indent > 1:
+        yield " " * (indent - 1)
+    delimiter = ""
+    newline_delimiter = ",\n" + " " * indent
+    width = max_width = printer._width - indent + 1
+    next_item = next(items)
+    last = False
+    while not last:
+        item = next_item
+        try:
+            next_item = next(items)
+        except StopIteration:
+            last = True
+            max_width -= allowance
+            width -= allowance
+        if printer._compact:
+            rep = printer._repr(item, {}, 1)
+            rep_width = len(rep) + 2
+            if width < rep_width:
+                width = max_width
+                if delimiter:
+                    delimiter = newline_delimiter
+            if width >= rep_width:
+                width -= rep_width
+                yield delimiter + rep
+                delimiter = ", "
+                continue
+        stream = io.StringIO()
+        printer._format(item, stream, indent, allowance if last else 1, {}, 1)
+        yield delimiter + stream.getvalue()
+        delimiter = newline_delimiter
+    yield "]"
+
+
+def _iter_texts(transcript: FetchedTranscript) -> Iterator[str]:
+    """
+    Iterates over the texts of the snippets of a transcript, without creating snippet
+    objects for transcripts fetched from YouTube, which store their snippets in
+    columns.
+    """
+    snippets = transcript.snippets
+    if isinstance(snippets, _ColumnarSnippets):
+        return snippets.iter_texts()
+    return (snippet.text for snippet in snippets)
+
+
+def _cue_boundaries(
+    transcript: FetchedTranscript,
+) -> Tuple[Sequence[float], Sequence[float]]:
+    """
+    Returns the start and end times of all cues of a transcript. A cue ends when its
+    snippet ends or when the next snippet starts, whichever is earlier. If NumPy is
+    installed, the times are returned as arrays.
+    """
+    snippets = transcript.snippets
+    if isinstance(snippets, _ColumnarSnippets):
+        starts, durations = snippets.starts, snippets.durations
+    else:
+        starts = [snippet.start for snippet in snippets]
+        durations = [snippet.duration for snippet in snippets]
+
+    if numpy is not None:
+        starts = numpy.asarray(starts, dtype=numpy.float64)
+        ends = starts + numpy.asarray(durations, dtype=numpy.float64)
+        ends[:-1] = numpy.where(starts[1:] < ends[:-1], starts[1:], ends[:-1])
+        return starts, ends
+
+    ends = [start + duration for start, duration in zip(starts, durations)]
+    ends[:-1] = [
+        next_start if next_start < end else end
+        for next_start, end in zip(islice(starts, 1, None), ends)
+    ]
+    return starts, ends
+
+
+def _split_seconds(time: float) -> Tuple[int, int, int, int]:
+    """
+    Splits a time in seconds into hours, minutes, seconds and milliseconds, using
+    integer arithmetic for everything but the milliseconds.
+    """
+    whole = int(time)
+    fraction = (time - whole) * 1000
+    ms = int(fraction)
+    # `_seconds_to_timestamp` rounds the milliseconds to two decimals before
+    # truncating them, which carries over into the next millisecond if the decimals
+    # are .995 or more. As no float is exactly .995, comparing with it is exact.
+    if fraction - ms > 0.995:
+        ms += 1
+    return whole // 3600, whole // 60 % 60, whole % 60, ms
+
+
+def _split_seconds_array(times: Any) -> Iterator[Tuple[int, int, int, int]]:
+    """
+    The same as applying `_split_seconds` to every element of a NumPy array of times,
+    all of which have to be in the range [0, `_MAX_INTEGER_SECONDS`).
+    """
+    whole = times.astype(numpy.int64)
+    fractions = (times - whole) * 1000
+    ms = fractions.astype(numpy.int64)
+    ms += fractions - ms > 0.995
+    return zip(
+        (whole // 3600).tolist(),
+        (whole // 60 % 60).tolist(),
+        (whole % 60).tolist(),
+        ms.tolist(),
+    )
 
 
 class Formatter:
@@ -26,6 +209,48 @@ class Formatter:
             "their own .format_transcripts() method."
         )
 
+    def iter_format_transcript(
+        self, transcript: FetchedTranscript, **kwargs
+    ) -> Iterator[str]:
+        """Streams the output of `format_transcript` in chunks.
+
+        Joining the chunks results in exactly what `format_transcript` returns.
+        Formatters which don't implement streaming yield a single chunk.
+
+        :param transcript:
+        :return: an iterator over chunks of the formatted transcript.
+        """
+        yield self.format_transcript(transcript, **kwargs)
+
+    def iter_format_transcripts(
+        self, transcripts: Iterable[FetchedTranscript], **kwargs
+    ) -> Iterator[str]:
+        """Streams the output of `format_transcripts` in chunks.
+
+        Joining the chunks results in exactly what `format_transcripts` returns.
+        `transcripts` can be a generator, which is consumed one transcript at a time,
+        so only the transcript which is currently formatted has to be held in memory.
+        Formatters which don't implement streaming yield a single chunk.
+
+        :param transcripts:
+        :return: an iterator over chunks of the formatted transcripts.
+        """
+        yield self.format_transcripts(list(transcripts), **kwargs)
+
+    def write_transcripts(
+        self, transcripts: Iterable[FetchedTranscript], fp: TextIO, **kwargs
+    ) -> None:
+        """Writes the output of `format_transcripts` to a file-like object.
+
+        The output is written chunk by chunk, as it is produced by
+        `iter_format_transcripts`, so it is never held in memory as a whole.
+
+        :param transcripts:
+        :param fp: a file-like object opened in text mode.
+        """
+        for chunk in self.iter_format_transcripts(transcripts, **kwargs):
+            fp.write(chunk)
+
 
 class PrettyPrintFormatter(Formatter):
     def format_transcript(self, transcript: FetchedTranscript, **kwargs) -> str:
@@ -46,15 +271,54 @@ class PrettyPrintFormatter(Formatter):
             [transcript.to_raw_data() for transcript in transcripts], **kwargs
         )
 
+    def iter_format_transcript(
+        self, transcript: FetchedTranscript, **kwargs
+    ) -> Iterator[str]:
+        """Streams a pretty printed transcript in chunks of snippets.
+
+        :param transcript:
+        :return: an iterator over chunks of the pretty printed transcript.
+        """
+        return _iter_joined(
+            "", _iter_pformat_list(transcript.iter_raw_data(), **kwargs)
+        )
+
+    def iter_format_transcripts(
+        self, transcripts: Iterable[FetchedTranscript], **kwargs
+    ) -> Iterator[str]:
+        """Streams a list of pretty printed transcripts, one transcript at a time.
+
+        :param transcripts:
+        :return: an iterator over chunks of the pretty printed transcripts.
+        """
+        return _iter_pformat_list(
+            (transcript.to_raw_data() for transcript in transcripts), **kwargs
+        )
+
 
 class JSONFormatter(Formatter):
+    def __init__(self, json_backend: Optional[JsonBackend] = None):
+        """
+        :param json_backend: the `JsonBackend` used to encode transcripts. The
+            keyword arguments of the format methods are passed on to it. Defaults to
+            the standard library, regardless of the default backend, so the output is
+            exactly what `json.dumps` returns. Passing in `OrjsonBackend()` encodes
+            several times as fast, but without any options, its output is compact and
+            non-ASCII characters aren't escaped.
+        """
+        self._json_backend = (
+            StdlibJsonBackend() if json_backend is None else json_backend
+        )
+
     def format_transcript(self, transcript: FetchedTranscript, **kwargs) -> str:
         """Converts a transcript into a JSON string.
 
         :param transcript:
         :return: A JSON string representation of the transcript.
         """
-        return json.dumps(transcript.to_raw_data(), **kwargs)
+        if isinstance(self._json_backend, StdlibJsonBackend):
+            return transcript.to_json(**kwargs)
+        return self._json_backend.dumps(transcript.to_raw_data(), **kwargs)
 
     def format_transcripts(self, transcripts: List[FetchedTranscript], **kwargs) -> str:
         """Converts a list of transcripts into a JSON string.
@@ -62,10 +326,74 @@ class JSONFormatter(Formatter):
         :param transcripts:
         :return: A JSON string representation of the transcript.
         """
+        if not isinstance(self._json_backend, StdlibJsonBackend):
+            return self._json_backend.dumps(
+                [transcript.to_raw_data() for transcript in transcripts], **kwargs
+            )
+        if _encodes_json_directly(kwargs):
+            item_separator = (kwargs.get("separators") or (", ", ": "))[0]
+            return "[{}]".format(
+                item_separator.join(
+                    transcript.to_json(**kwargs) for transcript in transcripts
+                )
+            )
         return json.dumps(
             [transcript.to_raw_data() for transcript in transcripts], **kwargs
         )
 
+    def iter_format_transcript(
+        self, transcript: FetchedTranscript, **kwargs
+    ) -> Iterator[str]:
+        """Streams a transcript as JSON in chunks of snippets.
+
+        :param transcript:
+        :return: an iterator over chunks of the JSON representation of the transcript.
+        """
+        return self._iter_json_array(transcript.iter_raw_data(), _CHUNK_SIZE, kwargs)
+
+    def iter_format_transcripts(
+        self, transcripts: Iterable[FetchedTranscript], **kwargs
+    ) -> Iterator[str]:
+        """Streams a list of transcripts as JSON, one transcript at a time.
+
+        :param transcripts:
+        :return: an iterator over chunks of the JSON representation of the transcripts.
+        """
+        return self._iter_json_array(
+            (transcript.to_raw_data() for transcript in transcripts), 1, kwargs
+        )
+
+    def _iter_json_array(
+        self, items: Iterable[Any], chunk_size: int, json_options: Dict[str, Any]
+    ) -> Iterator[str]:
+        """
+        Yields the JSON array of all `items` in chunks, by encoding `chunk_size` items
+        at a time and stripping the brackets of the arrays they are encoded as. What
+        the brackets and the separators between the items look like depends on the
+        options, so they are taken from encoding a probe array.
+        """
+        dumps = self._json_backend.dumps
+        probe = dumps([0, 0], **json_options)
+        first_item_start = probe.index("0")
+        second_item_start = probe.rindex("0")
+        opening = probe[:first_item_start]
+        separator = probe[first_item_start + 1 : second_item_start]
+        closing = probe[second_item_start + 1 :]
+
+        items = iter(items)
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            yield dumps([], **json_options)
+            return
+        yield opening
+        while chunk:
+            encoded = dumps(chunk, **json_options)
+            yield encoded[len(opening) : len(encoded) - len(closing)]
+            chunk = list(islice(items, chunk_size))
+            if chunk:
+                yield separator
+        yield closing
+
 
 class TextFormatter(Formatter):
     def format_transcript(self, transcript: FetchedTranscript, **kwargs) -> str:
@@ -74,7 +402,7 @@ class TextFormatter(Formatter):
         :param transcript:
         :return: all transcript text lines separated by newline breaks.
         """
-        return "\n".join(line.text for line in transcript)
+        return "\n".join(_iter_texts(transcript))
 
     def format_transcripts(self, transcripts: List[FetchedTranscript], **kwargs) -> str:
         """Converts a list of transcripts into plain text with no timestamps.
@@ -86,6 +414,29 @@ class TextFormatter(Formatter):
             [self.format_transcript(transcript, **kwargs) for transcript in transcripts]
         )
 
+    def iter_format_transcript(
+        self, transcript: FetchedTranscript, **kwargs
+    ) -> Iterator[str]:
+        """Streams a transcript as plain text in chunks of lines.
+
+        :param transcript:
+        :return: an iterator over chunks of the transcript text lines.
+        """
+        return _iter_joined("\n", _iter_texts(transcript))
+
+    def iter_format_transcripts(
+        self, transcripts: Iterable[FetchedTranscript], **kwargs
+    ) -> Iterator[str]:
+        """Streams a list of transcripts, one transcript at a time.
+
+        :param transcripts:
+        :return: an iterator over chunks of the formatted transcripts.
+        """
+        for i, transcript in enumerate(transcripts):
+            if i > 0:
+                yield "\n\n\n"
+            yield from self.iter_format_transcript(transcript, **kwargs)
+
 
 class _TextBasedFormatter(TextFormatter):
     def _format_timestamp(self, hours: int, mins: int, secs: int, ms: int) -> str:
@@ -100,12 +451,21 @@ class _TextBasedFormatter(TextFormatter):
             "their own _format_transcript_header method."
         )
 
+    def _iter_format_transcript_header(self, lines: Iterable[str]) -> Iterator[str]:
+        raise NotImplementedError(
+            "A subclass of _TextBasedFormatter must implement "
+            "their own _iter_format_transcript_header method."
+        )
+
     def _format_transcript_helper(
         self, i: int, time_text: str, snippet: FetchedTranscriptSnippet
     ) -> str:
+        return self._format_cue(i, time_text, snippet.text)
+
+    def _format_cue(self, i: int, time_text: str, text: str) -> str:
         raise NotImplementedError(
             "A subclass of _TextBasedFormatter must implement "
-            "their own _format_transcript_helper method."
+            "their own _format_cue or _format_transcript_helper method."
         )
 
     def _seconds_to_timestamp(self, time: float) -> str:
@@ -135,20 +495,77 @@ class _TextBasedFormatter(TextFormatter):
         https://www.w3.org/TR/webvtt1/#introduction-caption
         https://www.3playmedia.com/blog/create-srt-file/
         """
-        lines = []
-        for i, line in enumerate(transcript):
-            end = line.start + line.duration
-            time_text = "{} --> {}".format(
-                self._seconds_to_timestamp(line.start),
-                self._seconds_to_timestamp(
-                    transcript[i + 1].start
-                    if i < len(transcript) - 1 and transcript[i + 1].start < end
-                    else end
-                ),
-            )
-            lines.append(self._format_transcript_helper(i, time_text, line))
+        return self._format_transcript_header(self._iter_cues(transcript))
+
+    def iter_format_transcript(
+        self, transcript: FetchedTranscript, **kwargs
+    ) -> Iterator[str]:
+        """Streams a transcript as WEBVTT/SRT in chunks of cues.
+
+        :param transcript:
+        :return: an iterator over chunks of the formatted transcript.
+        """
+        return self._iter_format_transcript_header(self._iter_cues(transcript))
+
+    def _iter_cues(self, transcript: FetchedTranscript) -> Iterator[str]:
+        start_timestamps, end_timestamps = self._cue_timestamps(transcript)
+        # cues only need the texts of the snippets, unless a subclass formats them
+        # from the whole snippet
+        if (
+            type(self)._format_transcript_helper
+            is _TextBasedFormatter._format_transcript_helper
+        ):
+            format_cue = self._format_cue
+            lines: Iterable[Any] = _iter_texts(transcript)
+        else:
+            format_cue = self._format_transcript_helper
+            lines = transcript
+        for i, (line, start_timestamp, end_timestamp) in enumerate(
+            zip(lines, start_timestamps, end_timestamps)
+        ):
+            time_text = "{} --> {}".format(start_timestamp, end_timestamp)
+            yield format_cue(i, time_text, line)
+
+    def _cue_timestamps(
+        self, transcript: FetchedTranscript
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Computes the start and end timestamps of all cues in one pass. The results
+        are exactly what calling `_seconds_to_timestamp` for every cue would return,
+        but the cue boundaries and the fields of the timestamps are computed for all
+        cues at once, vectorized if NumPy is installed, and every distinct time is
+        only formatted once, as a cue usually ends when the next one starts.
+        """
+        starts, ends = _cue_boundaries(transcript)
+        if numpy is not None:
+            distinct_times = numpy.unique(numpy.concatenate((starts, ends)))
+            starts, ends = starts.tolist(), ends.tolist()
+            if (
+                len(distinct_times) == 0
+                or 0 <= distinct_times[0]
+                and distinct_times[-1] < _MAX_INTEGER_SECONDS
+            ):
+                distinct_timestamps = starmap(
+                    self._format_timestamp, _split_seconds_array(distinct_times)
+                )
+                timestamps = dict(zip(distinct_times.tolist(), distinct_timestamps))
+                return (
+                    [timestamps[start] for start in starts],
+                    [timestamps[end] for end in ends],
+                )
 
-        return self._format_transcript_header(lines)
+        timestamps = {}
+        for time in chain(starts, ends):
+            if time not in timestamps:
+                timestamps[time] = (
+                    self._format_timestamp(*_split_seconds(time))
+                    if 0 <= time < _MAX_INTEGER_SECONDS
+                    else self._seconds_to_timestamp(time)
+                )
+        return (
+            [timestamps[start] for start in starts],
+            [timestamps[end] for end in ends],
+        )
 
 
 class SRTFormatter(_TextBasedFormatter):
@@ -158,10 +575,12 @@ class SRTFormatter(_TextBasedFormatter):
     def _format_transcript_header(self, lines: Iterable[str]) -> str:
         return "\n\n".join(lines) + "\n"
 
-    def _format_transcript_helper(
-        self, i: int, time_text: str, snippet: FetchedTranscriptSnippet
-    ) -> str:
-        return "{}\n{}\n{}".format(i + 1, time_text, snippet.text)
+    def _iter_format_transcript_header(self, lines: Iterable[str]) -> Iterator[str]:
+        yield from _iter_joined("\n\n", lines)
+        yield "\n"
+
+    def _format_cue(self, i: int, time_text: str, text: str) -> str:
+        return "{}\n{}\n{}".format(i + 1, time_text, text)
 
 
 class WebVTTFormatter(_TextBasedFormatter):
@@ -171,10 +590,13 @@ class WebVTTFormatter(_TextBasedFormatter):
     def _format_transcript_header(self, lines: Iterable[str]) -> str:
         return "WEBVTT\n\n" + "\n\n".join(lines) + "\n"
 
-    def _format_transcript_helper(
-        self, i: int, time_text: str, snippet: FetchedTranscriptSnippet
-    ) -> str:
-        return "{}\n{}".format(time_text, snippet.text)
+    def _iter_format_transcript_header(self, lines: Iterable[str]) -> Iterator[str]:
+        yield "WEBVTT\n\n"
+        yield from _iter_joined("\n\n", lines)
+        yield "\n"
+
+    def _format_cue(self, i: int, time_text: str, text: str) -> str:
+        return "{}\n{}".format(time_text, text)
 
 
 class FormatterLoader:
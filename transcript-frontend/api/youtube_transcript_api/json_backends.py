@@ -0,0 +1,113 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Union
+
+try:  # pragma: no cover
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+class JsonBackend(ABC):
+    """
+    The base class for the JSON libraries which can be used to decode the data
+    received from YouTube and to encode transcripts. Whichever backend is used, the
+    decoded data and the encoded JSON are semantically identical, only whitespace,
+    the escaping of non-ASCII characters and the formatting of numbers may differ.
+    """
+
+    name: str
+
+    @abstractmethod
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """
+        Decodes a JSON document. Raises a `ValueError` if it is invalid.
+        """
+        pass
+
+    @abstractmethod
+    def dumps(self, obj: Any, **kwargs) -> str:
+        """
+        Encodes an object as JSON.
+
+        :param kwargs: options as accepted by `json.dumps`. Backends which don't
+            support the given options fall back to `json.dumps`.
+        """
+        pass
+
+
+class StdlibJsonBackend(JsonBackend):
+    """
+    Uses the `json` module of the standard library.
+    """
+
+    name = "json"
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any, **kwargs) -> str:
+        return json.dumps(obj, **kwargs)
+
+
+class OrjsonBackend(JsonBackend):
+    """
+    Uses orjson (`pip install orjson`), which decodes about twice as fast and
+    encodes several times as fast as the standard library. Without any options,
+    `dumps` returns compact JSON, which isn't escaped to ASCII.
+
+    orjson encodes NaN and infinite floats as `null`, which isn't what the standard
+    library does. Therefore, `dumps` falls back to `json.dumps` if the output
+    contains `null` anywhere, which transcripts usually don't. The fallback is
+    formatted the way orjson formats its output, so the style of the output doesn't
+    depend on whether it contains `null`.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:  # pragma: no cover
+            raise ImportError(
+                "OrjsonBackend requires orjson, which can be installed by running: "
+                "pip install orjson"
+            )
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any, **kwargs) -> str:
+        if not kwargs:
+            encoded = orjson.dumps(obj)
+            fallback_kwargs = {"separators": (",", ":"), "ensure_ascii": False}
+        elif kwargs == {"indent": 2}:
+            encoded = orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+            fallback_kwargs = {"indent": 2, "ensure_ascii": False}
+        else:
+            return json.dumps(obj, **kwargs)
+        if b"null" in encoded:
+            return json.dumps(obj, **fallback_kwargs)
+        return encoded.decode("utf-8")
+
+
+_default_backend: JsonBackend = (
+    StdlibJsonBackend() if orjson is None else OrjsonBackend()
+)
+
+
+def get_default_json_backend() -> JsonBackend:
+    """
+    Returns the backend used by everything that hasn't been given a backend of its
+    own. Unless it has been changed using `set_default_json_backend`, this is
+    `OrjsonBackend` if orjson is installed and `StdlibJsonBackend` otherwise.
+    """
+    return _default_backend
+
+
+def set_default_json_backend(backend: JsonBackend) -> None:
+    """
+    Changes the backend used by everything that hasn't been given a backend of its
+    own. Objects which have already been created keep using the backend which was
+    the default when they were created.
+    """
+    global _default_backend
+    _default_backend = backend
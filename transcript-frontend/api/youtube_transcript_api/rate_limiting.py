@@ -0,0 +1,154 @@
+import asyncio
+import copy
+import time
+from threading import Lock
+from typing import Dict, Hashable, List, Optional
+from urllib.parse import urlsplit
+
+from .proxies import ProxyConfig
+
+
+class _TokenBucket:
+    """
+    A token bucket which hands out reservations instead of rejecting requests. Each
+    request takes a token, even if there is none left, so the tokens can become
+    negative. The time it takes to refill them up to zero is the time the request
+    has to wait. This schedules waiting requests one `1 / rate` apart, in the order
+    they arrived, without any polling, so the requests are sent exactly at the
+    allowed rate.
+    """
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self._rate = rate
+        self._burst = burst
+        self._tokens = burst
+        self._updated_at = now
+
+    def reserve(self, now: float) -> float:
+        """
+        Takes a token and returns how many seconds to wait before using it.
+        """
+        self._tokens = min(
+            self._burst, self._tokens + (now - self._updated_at) * self._rate
+        )
+        self._updated_at = now
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self._rate
+
+
+class RateLimiter:
+    """
+    Paces the requests sent to YouTube using token buckets, so a process stays below
+    the rate YouTube tolerates instead of being throttled or blocked. It can be passed
+    to `YouTubeTranscriptApi` or `AsyncYouTubeTranscriptApi`:
+
+    ```
+    ytt_api = YouTubeTranscriptApi(rate_limiter=RateLimiter(rate=2))
+    ```
+
+    Every request waits for a token before it is sent. Tokens are refilled at `rate`
+    per second, up to `burst` tokens, which may be used at once after a pause. Rates
+    are tracked per destination host, as each host throttles on its own, and can be
+    overridden for individual hosts using `host_rates`. Requests sent through a proxy
+    have their own buckets, as YouTube sees each proxy as a different client, and
+    `proxy_rates` additionally limits all requests sent through a given proxy URL,
+    regardless of their destination. Waiting requests are served in the order they
+    arrived, exactly `1 / rate` seconds apart, so the allowed rate is used up
+    completely.
+
+    A single limiter is meant to be shared by all `YouTubeTranscriptApi` and
+    `AsyncYouTubeTranscriptApi` instances of a process. It is thread-safe and can be
+    used from threads and from coroutines at the same time.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: float = 1,
+        host_rates: Optional[Dict[str, float]] = None,
+        proxy_rates: Optional[Dict[str, float]] = None,
+    ):
+        """
+        :param rate: the number of requests per second which may be sent to each
+            host. None doesn't limit hosts which aren't in `host_rates`.
+        :param burst: the number of requests which may be sent at once after a pause
+        :param host_rates: maps host names, like "www.youtube.com", onto the number of
+            requests per second which may be sent to them
+        :param proxy_rates: maps proxy URLs, as they are returned by
+            `ProxyConfig.to_requests_dict`, onto the number of requests per second
+            which may be sent through them
+        """
+        self._lock = Lock()
+        self._buckets: Dict[Hashable, _TokenBucket] = {}
+        self._rate = rate
+        self._burst = burst
+        self._host_rates = {} if host_rates is None else host_rates
+        self._proxy_rates = {} if proxy_rates is None else proxy_rates
+        self._proxies: Dict[str, str] = {}
+
+    def with_proxy_config(self, proxy_config: Optional[ProxyConfig]) -> "RateLimiter":
+        """
+        Returns a limiter which shares its buckets with this one, but paces requests as
+        they are sent through the proxies of the given config. `YouTubeTranscriptApi`
+        and `AsyncYouTubeTranscriptApi` do this with their proxy config, so this
+        usually doesn't have to be called directly.
+        """
+        rate_limiter = copy.copy(self)
+        rate_limiter._proxies = (
+            {}
+            if proxy_config is None
+            else {
+                scheme: proxy_url
+                for scheme, proxy_url in proxy_config.to_requests_dict().items()
+                if proxy_url
+            }
+        )
+        return rate_limiter
+
+    def acquire(self, url: str) -> None:
+        """
+        Blocks until a request to the given URL may be sent.
+        """
+        delay = self.reserve(url)
+        if delay:
+            time.sleep(delay)
+
+    async def aacquire(self, url: str) -> None:
+        """
+        The asyncio counterpart of `acquire`.
+        """
+        delay = self.reserve(url)
+        if delay:
+            await asyncio.sleep(delay)
+
+    def reserve(self, url: str) -> float:
+        """
+        Reserves a token for a request to the given URL and returns how many seconds
+        to wait before sending it. The request has to be sent afterward, as the token
+        isn't returned.
+        """
+        with self._lock:
+            now = time.monotonic()
+            return max(
+                (bucket.reserve(now) for bucket in self._get_buckets(url, now)),
+                default=0.0,
+            )
+
+    def _get_buckets(self, url: str, now: float) -> List[_TokenBucket]:
+        split_url = urlsplit(url)
+        host = split_url.hostname or ""
+        proxy = self._proxies.get(split_url.scheme)
+        buckets = []
+        host_rate = self._host_rates.get(host, self._rate)
+        if host_rate is not None:
+            buckets.append(self._get_bucket(("host", proxy, host), host_rate, now))
+        proxy_rate = None if proxy is None else self._proxy_rates.get(proxy)
+        if proxy_rate is not None:
+            buckets.append(self._get_bucket(("proxy", proxy), proxy_rate, now))
+        return buckets
+
+    def _get_bucket(self, key: Hashable, rate: float, now: float) -> _TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = _TokenBucket(rate, self._burst, now)
+        return bucket
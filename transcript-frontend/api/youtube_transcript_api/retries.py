@@ -0,0 +1,183 @@
+import asyncio
+import random
+import time
+from threading import Lock
+from typing import Awaitable, Callable, FrozenSet, Iterable, Optional, TypeVar
+
+from ._errors import YouTubeRequestFailed
+
+T = TypeVar("T")
+
+
+class RetryBudget:
+    """
+    Limits the number of retries relative to the number of requests, so retrying
+    can't multiply the load on YouTube while it is throttling. Every request deposits
+    `retry_ratio` tokens and every retry withdraws one token. Once the budget is
+    exhausted, failed requests aren't retried anymore until enough requests have been
+    made to refill it. While requests keep failing, at most `retry_ratio` retries are
+    made per request, while the `max_tokens` saved up while requests succeed allow a
+    short burst of retries after a transient failure.
+
+    By default, all `RetryPolicy` instances share a single budget, so the budget
+    applies to the whole process. The budget is thread-safe.
+    """
+
+    def __init__(self, retry_ratio: float = 0.2, max_tokens: float = 10.0):
+        """
+        :param retry_ratio: the number of retries which are allowed per request
+        :param max_tokens: the maximum number of retries which can be saved up
+        """
+        self._lock = Lock()
+        self._retry_ratio = retry_ratio
+        self._max_tokens = max_tokens
+        self._tokens = max_tokens
+
+    def deposit(self) -> None:
+        """
+        Records a request, which allows `retry_ratio` more retries.
+        """
+        with self._lock:
+            self._tokens = min(self._tokens + self._retry_ratio, self._max_tokens)
+
+    def withdraw(self) -> bool:
+        """
+        Records a retry. Returns False if the budget is exhausted, in which case the
+        request mustn't be retried.
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            return self._tokens
+
+
+_PROCESS_RETRY_BUDGET = RetryBudget()
+
+
+class RetryPolicy:
+    """
+    Retries requests to YouTube which have failed with a transient HTTP status, like
+    429 (Too Many Requests) or 503 (Service Unavailable), using exponential backoff
+    with full jitter. It can be passed to `YouTubeTranscriptApi` or
+    `AsyncYouTubeTranscriptApi`:
+
+    ```
+    ytt_api = YouTubeTranscriptApi(retry_policy=RetryPolicy())
+    ```
+
+    The policy is applied to each request on its own, so if downloading a transcript
+    fails, only the download is retried, without requesting the watch page again.
+    Before the n-th retry of a request, a random delay between 0 and
+    `min(max_delay, base_delay * 2 ** (n - 1))` seconds is waited for. The random
+    delays spread out the retries of concurrent requests, which would otherwise hit
+    YouTube again all at the same time. If YouTube asks to wait for some time using
+    a `Retry-After` header, at least that long is waited for, unless it is longer
+    than `max_delay`, in which case the request isn't retried at all.
+
+    Each request is retried up to `max_retries` times, as long as the `RetryBudget`
+    has retries left. If the proxy config retries blocked requests, these retries are
+    delayed in the same way and withdrawn from the same budget.
+
+    A policy is thread-safe and can be used from threads and from coroutines at the
+    same time.
+    """
+
+    DEFAULT_RETRY_STATUS_CODES: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        retry_status_codes: Optional[Iterable[int]] = None,
+        budget: Optional[RetryBudget] = None,
+    ):
+        """
+        :param max_retries: how many times a single request is retried at most
+        :param base_delay: the upper bound of the delay before the first retry in
+            seconds, which doubles with each retry
+        :param max_delay: the upper bound of any delay in seconds
+        :param retry_status_codes: the HTTP status codes requests are retried on.
+            Defaults to `DEFAULT_RETRY_STATUS_CODES`.
+        :param budget: the `RetryBudget` retries are withdrawn from. Defaults to a
+            budget which is shared by the whole process.
+        """
+        self._max_retries = max_retries
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._retry_status_codes = (
+            self.DEFAULT_RETRY_STATUS_CODES
+            if retry_status_codes is None
+            else frozenset(retry_status_codes)
+        )
+        self._budget = _PROCESS_RETRY_BUDGET if budget is None else budget
+
+    def call(self, function: Callable[[], T]) -> T:
+        """
+        Calls `function`, which makes a single request, and calls it again after a
+        delay, as long as it raises a `YouTubeRequestFailed` that can be retried.
+        """
+        self._budget.deposit()
+        retry_number = 0
+        while True:
+            try:
+                return function()
+            except YouTubeRequestFailed as exception:
+                delay = self._get_retry_delay(exception, retry_number)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            retry_number += 1
+
+    async def acall(self, function: Callable[[], Awaitable[T]]) -> T:
+        """
+        The asyncio counterpart of `call`.
+        """
+        self._budget.deposit()
+        retry_number = 0
+        while True:
+            try:
+                return await function()
+            except YouTubeRequestFailed as exception:
+                delay = self._get_retry_delay(exception, retry_number)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            retry_number += 1
+
+    def backoff(
+        self, retry_number: int, retry_after: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        Returns how many seconds to wait before a retry and withdraws it from the
+        budget. Returns None if the request mustn't be retried, as the budget is
+        exhausted or `retry_after` is longer than `max_delay`.
+
+        :param retry_number: the number of retries made before this one
+        :param retry_after: the number of seconds YouTube asked to wait, if it did
+        """
+        if retry_after is not None and retry_after > self._max_delay:
+            return None
+        if not self._budget.withdraw():
+            return None
+        # the exponent is capped, as the delay is capped anyway and floats overflow
+        delay = random.uniform(
+            0, min(self._max_delay, self._base_delay * 2 ** min(retry_number, 32))
+        )
+        return delay if retry_after is None else max(delay, retry_after)
+
+    def _get_retry_delay(
+        self, exception: YouTubeRequestFailed, retry_number: int
+    ) -> Optional[float]:
+        if (
+            retry_number >= self._max_retries
+            or exception.status_code not in self._retry_status_codes
+        ):
+            return None
+        return self.backoff(retry_number, exception.retry_after)
@@ -0,0 +1,1079 @@
+"""
+Micro benchmarks for the hot paths of this library. They only use the bundled test
+assets, so no network access is required. Run all of them with:
+
+    python -m youtube_transcript_api.test.benchmark
+
+or select individual benchmarks by name:
+
+    python -m youtube_transcript_api.test.benchmark js_var_parser
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+import timeit
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from html import unescape
+from itertools import takewhile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Optional
+from unittest.mock import patch
+
+from youtube_transcript_api import YouTubeTranscriptApi
+from youtube_transcript_api._errors import IpBlocked, YouTubeDataUnparsable
+from defusedxml import ElementTree
+from requests import Session
+
+from youtube_transcript_api import FetchedTranscript, FetchedTranscriptSnippet
+from youtube_transcript_api import _transcripts, formatters
+from youtube_transcript_api.formatters import (
+    FormatterLoader,
+    JSONFormatter,
+    SRTFormatter,
+    WebVTTFormatter,
+    _TextBasedFormatter,
+)
+from youtube_transcript_api.json_backends import OrjsonBackend, StdlibJsonBackend
+from youtube_transcript_api.rate_limiting import RateLimiter
+from youtube_transcript_api.retries import RetryBudget, RetryPolicy
+from youtube_transcript_api._transcripts import (
+    Transcript,
+    TranscriptList,
+    _ColumnarSnippets,
+    _Json3TranscriptParser,
+    _JsVarParser,
+    _Srv3TranscriptParser,
+    _TranscriptParser,
+    _WatchPage,
+    _WatchPageReader,
+    TranscriptListFetcher,
+)
+
+ASSETS_DIR = Path(__file__).parent / "assets"
+
+
+def load_watch_pages() -> Dict[str, str]:
+    return {
+        path.name: path.read_text(encoding="utf-8")
+        for path in sorted(ASSETS_DIR.glob("youtube*.html.static"))
+    }
+
+
+def measure(function: Callable[[], object], repeat: int = 5, number: int = 3) -> float:
+    """
+    Returns the best time of a single call to `function` in milliseconds.
+    """
+    return min(timeit.repeat(function, repeat=repeat, number=number)) / number * 1000
+
+
+def measure_peak_memory(function: Callable[[], object]) -> float:
+    """
+    Returns the peak memory allocated during a single call to `function` in KiB.
+    """
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def measure_retained_memory(function: Callable[[], object]) -> float:
+    """
+    Returns the memory still allocated by the object `function` returns in KiB,
+    excluding any temporary allocations made while creating it.
+    """
+    tracemalloc.start()
+    try:
+        retained = function()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del retained
+    return current / 1024
+
+
+def report(name: str, baseline: float, candidate: float, unit: str = "ms") -> None:
+    print(
+        "{name:<45} {baseline:>10.2f} {unit:<3}{candidate:>10.2f} {unit:<3}"
+        "{speedup:>8.1f}x".format(
+            name=name,
+            baseline=baseline,
+            candidate=candidate,
+            unit=unit,
+            speedup=baseline / candidate if candidate else float("inf"),
+        )
+    )
+
+
+class _LegacyJsVarParser:
+    """
+    The character by character implementation `_JsVarParser` used to have. It is
+    only kept around as a baseline for the benchmarks.
+    """
+
+    def __init__(self, var_name: str):
+        self._var_name = var_name
+
+    def parse(self, raw_html: str, video_id: str) -> Dict:
+        char_iterator = self._create_var_char_iterator(raw_html, video_id)
+        var_string = self._find_var_substring(char_iterator, video_id)
+        return json.loads(var_string)
+
+    def _create_var_char_iterator(self, raw_html: str, video_id: str) -> Iterator[str]:
+        splitted_html = raw_html.split(f"var {self._var_name}")
+        if len(splitted_html) <= 1:
+            raise YouTubeDataUnparsable(video_id)
+        char_iterator = iter(splitted_html[1])
+        while next(char_iterator) != "{":
+            pass
+        return char_iterator
+
+    def _find_var_substring(self, char_iterator: Iterator[str], video_id: str) -> str:
+        escaped = False
+        in_quotes = False
+        depth = 1
+        chars = ["{"]
+
+        for char in char_iterator:
+            chars.append(char)
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_quotes = not in_quotes
+            elif not in_quotes:
+                if char == "{":
+                    depth += 1
+                elif char == "}":
+                    depth -= 1
+            if depth == 0:
+                return "".join(chars)
+
+        raise YouTubeDataUnparsable(video_id)
+
+
+def _parse_or_none(parser, html: str):
+    try:
+        return parser.parse(html, "video_id")
+    except YouTubeDataUnparsable:
+        return None
+
+
+def bench_js_var_parser() -> None:
+    legacy_parser = _LegacyJsVarParser("ytInitialPlayerResponse")
+    parser = _JsVarParser("ytInitialPlayerResponse")
+    for name, html in load_watch_pages().items():
+        assert _parse_or_none(legacy_parser, html) == _parse_or_none(parser, html)
+        report(
+            name,
+            measure(lambda: _parse_or_none(legacy_parser, html)),
+            measure(lambda: _parse_or_none(parser, html)),
+        )
+
+
+def bench_player_response_decoding() -> None:
+    parser = _JsVarParser("ytInitialPlayerResponse")
+    member_names = ("playabilityStatus", "captions")
+    for name, html in load_watch_pages().items():
+        if "var ytInitialPlayerResponse" not in html:
+            continue
+        full_decode = lambda: parser.parse(html, "video_id")  # noqa: E731
+        targeted_decode = lambda: parser.parse_members(  # noqa: E731
+            html, "video_id", member_names
+        )
+        report(name, measure(full_decode), measure(targeted_decode))
+        report(
+            "",
+            measure_peak_memory(full_decode),
+            measure_peak_memory(targeted_decode),
+            unit="KiB",
+        )
+
+
+def _extract_captions_json_or_exception(html: str):
+    fetcher = TranscriptListFetcher(Session(), proxy_config=None)
+    try:
+        return fetcher._extract_captions_json(
+            fetcher._extract_video_data(_WatchPage(html.encode()), "video_id"),
+            "video_id",
+        )
+    except Exception as exception:
+        return type(exception)
+
+
+def bench_scoped_unescaping() -> None:
+    for name, raw_html in load_watch_pages().items():
+        unescape_page = lambda: _extract_captions_json_or_exception(  # noqa: E731
+            unescape(raw_html)
+        )
+        unescape_extracted = lambda: _extract_captions_json_or_exception(  # noqa: E731
+            raw_html
+        )
+        assert unescape_page() == unescape_extracted()
+        report(name, measure(unescape_page), measure(unescape_extracted))
+        report(
+            "",
+            measure_peak_memory(unescape_page),
+            measure_peak_memory(unescape_extracted),
+            unit="KiB",
+        )
+
+
+def _classify_page_legacy(html: str) -> None:
+    if 'action="https://consent.youtube.com/s"' in html:
+        re.search('name="v" value="(.*?)"', html)
+    elif len(html.split("var ytInitialPlayerResponse")) <= 1:
+        'class="g-recaptcha"' in html
+
+
+def _classify_page(html: bytes) -> None:
+    page = _WatchPage(html)
+    if page.requires_consent:
+        page.consent_value
+    elif page.player_response_start == -1:
+        page.has_recaptcha
+
+
+def bench_page_classification() -> None:
+    for name, html in load_watch_pages().items():
+        html_bytes = html.encode("utf-8")
+        report(
+            name,
+            measure(lambda: _classify_page_legacy(html)),
+            measure(lambda: _classify_page(html_bytes)),
+        )
+
+
+def _read_streamed(html_bytes: bytes) -> int:
+    reader = _WatchPageReader()
+    chunk_size = TranscriptListFetcher.WATCH_PAGE_CHUNK_SIZE
+    bytes_read = 0
+    for chunk_start in range(0, len(html_bytes), chunk_size):
+        chunk = html_bytes[chunk_start : chunk_start + chunk_size]
+        bytes_read += len(chunk)
+        if reader.feed(chunk):
+            break
+    return bytes_read
+
+
+def bench_watch_page_streaming() -> None:
+    for name, html in load_watch_pages().items():
+        html_bytes = html.encode("utf-8")
+        report(name, len(html_bytes) / 1024, _read_streamed(html_bytes) / 1024, "KiB")
+
+
+class _SlidingWindowThrottle:
+    """
+    Rejects requests once more than `max_requests` have been received within the last
+    second. Rejected requests count towards the limit as well, like they do for most
+    real rate limiters, so clients retrying right away keep themselves throttled.
+    """
+
+    def __init__(self, max_requests: int):
+        self._max_requests = max_requests
+        self._lock = threading.Lock()
+        self._received: Deque[float] = deque()
+        self.requests = 0
+        self.rejected = 0
+
+    def is_throttled(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            while self._received and self._received[0] <= now - 1:
+                self._received.popleft()
+            self._received.append(now)
+            self.requests += 1
+            if len(self._received) > self._max_requests:
+                self.rejected += 1
+                return True
+            return False
+
+
+class _FakeYouTubeHandler(BaseHTTPRequestHandler):
+    """
+    Serves the watch page and transcript assets, after waiting for `LATENCY` seconds
+    to simulate the round trip to YouTube. If a `throttle` is set, the requests it
+    rejects are answered with 429 (Too Many Requests).
+    """
+
+    protocol_version = "HTTP/1.1"
+    LATENCY = 0.05
+    watch_page = b""
+    transcript = (ASSETS_DIR / "transcript.xml.static").read_bytes()
+    throttle: Optional[_SlidingWindowThrottle] = None
+
+    def do_GET(self) -> None:
+        time.sleep(self.LATENCY)
+        if self.throttle is not None and self.throttle.is_throttled():
+            self.send_response(429)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = self.watch_page if self.path.startswith("/watch") else self.transcript
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except ConnectionResetError:
+            # clients streaming a transcript hang up once they have what they need
+            pass
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@contextmanager
+def fake_youtube_server() -> Iterator[None]:
+    """
+    Redirects all requests to YouTube to a local server for the duration of the
+    context, which serves the bundled assets with a simulated latency.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeYouTubeHandler)
+    base_url = "http://127.0.0.1:{port}".format(port=server.server_address[1])
+    _FakeYouTubeHandler.watch_page = (
+        (ASSETS_DIR / "youtube.html.static")
+        .read_bytes()
+        .replace(
+            b"https://www.youtube.com/api/timedtext",
+            f"{base_url}/api/timedtext".encode(),
+        )
+    )
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+    try:
+        with patch(
+            "youtube_transcript_api._transcripts.WATCH_URL",
+            base_url + "/watch?v={video_id}",
+        ):
+            yield
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def bench_fetch_many() -> None:
+    video_ids = ["GJLlxj_dtq8"] * 64
+    with fake_youtube_server():
+        ytt_api = YouTubeTranscriptApi()
+        sequential = measure(
+            lambda: [ytt_api.fetch(video_id) for video_id in video_ids],
+            repeat=1,
+            number=1,
+        )
+        for max_workers in (4, 16, 64):
+            pooled = lambda: list(  # noqa: E731
+                ytt_api.fetch_many(video_ids, max_workers=max_workers)
+            )
+            report(
+                f"{len(video_ids)} videos, max_workers={max_workers}",
+                sequential,
+                measure(pooled, repeat=3, number=1),
+            )
+
+
+def _synthetic_snippets(count: int) -> Iterator[FetchedTranscriptSnippet]:
+    for i in range(count):
+        yield FetchedTranscriptSnippet(
+            text=f"this is the synthetic snippet number {i}",
+            start=i * 2.34,
+            duration=2.5,
+        )
+
+
+def bench_columnar_snippets() -> None:
+    count = 100_000
+    report(
+        f"{count} snippets, retained memory",
+        measure_retained_memory(lambda: list(_synthetic_snippets(count))),
+        measure_retained_memory(
+            lambda: _ColumnarSnippets.from_snippets(_synthetic_snippets(count))
+        ),
+        unit="KiB",
+    )
+    snippet_list = list(_synthetic_snippets(count))
+    columnar_snippets = _ColumnarSnippets.from_snippets(snippet_list)
+    report(
+        f"{count} snippets, iteration",
+        measure(lambda: sum(snippet.duration for snippet in snippet_list)),
+        measure(lambda: sum(snippet.duration for snippet in columnar_snippets)),
+    )
+    report(
+        f"{count} snippets, column access",
+        measure(lambda: sum(snippet.duration for snippet in snippet_list)),
+        measure(lambda: sum(columnar_snippets.durations)),
+    )
+    report(
+        f"{count} snippets, text iteration",
+        measure(lambda: sum(len(snippet.text) for snippet in snippet_list)),
+        measure(lambda: sum(map(len, columnar_snippets.iter_texts()))),
+    )
+
+
+@dataclass
+class _LegacySnippet:
+    text: str
+    start: float
+    duration: float
+
+
+class _LegacyTranscript(Transcript):
+    """
+    A transcript with an attribute dict and a translation table of its own, like
+    every transcript had before the data model used `__slots__`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._translation_languages_dict = {
+            translation_language.language_code: translation_language.language
+            for translation_language in self.translation_languages
+        }
+
+
+def bench_slotted_data_model() -> None:
+    count = 100_000
+    report(
+        f"{count} snippet objects, retained memory",
+        measure_retained_memory(
+            lambda: [_LegacySnippet("text", float(i), 1.0) for i in range(count)]
+        ),
+        measure_retained_memory(
+            lambda: [
+                FetchedTranscriptSnippet("text", float(i), 1.0) for i in range(count)
+            ]
+        ),
+        unit="KiB",
+    )
+
+    captions_json = _extract_captions_json_or_exception(
+        (ASSETS_DIR / "youtube.html.static").read_text(encoding="utf-8")
+    )
+    count = 1000
+    for transcript_class in (_LegacyTranscript, Transcript):
+        assert (
+            TranscriptList.build(
+                Session(), "video_id", captions_json, transcript_class=transcript_class
+            )
+            .find_transcript(["en"])
+            .translate("de")
+        )
+    report(
+        f"{count} transcript lists, retained memory",
+        measure_retained_memory(
+            lambda: [
+                TranscriptList.build(
+                    None, "video_id", captions_json, transcript_class=_LegacyTranscript
+                )
+                for _ in range(count)
+            ]
+        ),
+        measure_retained_memory(
+            lambda: [
+                TranscriptList.build(None, "video_id", captions_json)
+                for _ in range(count)
+            ]
+        ),
+        unit="KiB",
+    )
+
+
+def bench_json_serialization() -> None:
+    count = 100_000
+    transcript = FetchedTranscript(
+        snippets=_ColumnarSnippets.from_snippets(_synthetic_snippets(count)),
+        video_id="video_id",
+        language="English",
+        language_code="en",
+        is_generated=False,
+    )
+    legacy_to_raw_data = lambda: [  # noqa: E731
+        asdict(snippet) for snippet in transcript
+    ]
+    assert legacy_to_raw_data() == transcript.to_raw_data()
+    report(
+        f"{count} snippets, to_raw_data",
+        measure(legacy_to_raw_data, repeat=3, number=1),
+        measure(transcript.to_raw_data, repeat=3, number=1),
+    )
+    legacy_format = lambda: json.dumps(legacy_to_raw_data())  # noqa: E731
+    formatter = JSONFormatter(json_backend=StdlibJsonBackend())
+    format_transcript = lambda: formatter.format_transcript(transcript)  # noqa: E731
+    assert legacy_format() == format_transcript()
+    report(
+        f"{count} snippets, JSONFormatter",
+        measure(legacy_format, repeat=3, number=1),
+        measure(format_transcript, repeat=3, number=1),
+    )
+
+
+def bench_json_backends() -> None:
+    stdlib_backend = StdlibJsonBackend()
+    orjson_backend = OrjsonBackend()
+    decoder = json.JSONDecoder()
+    for name, html in load_watch_pages().items():
+        declaration_start = html.find("var ytInitialPlayerResponse")
+        if declaration_start == -1:
+            continue
+        var_start = html.find("{", declaration_start)
+        player_response = html[var_start : decoder.raw_decode(html, var_start)[1]]
+        assert stdlib_backend.loads(player_response) == orjson_backend.loads(
+            player_response
+        )
+        report(
+            name,
+            measure(lambda: stdlib_backend.loads(player_response)),
+            measure(lambda: orjson_backend.loads(player_response)),
+        )
+    innertube_response = (
+        ASSETS_DIR / "youtube_innertube_player.json.static"
+    ).read_bytes()
+    report(
+        "youtube_innertube_player.json.static",
+        measure(lambda: stdlib_backend.loads(innertube_response)),
+        measure(lambda: orjson_backend.loads(innertube_response)),
+    )
+
+    count = 100_000
+    transcript = FetchedTranscript(
+        snippets=_ColumnarSnippets.from_snippets(_synthetic_snippets(count)),
+        video_id="video_id",
+        language="English",
+        language_code="en",
+        is_generated=False,
+    )
+    stdlib_formatter = JSONFormatter(json_backend=stdlib_backend)
+    orjson_formatter = JSONFormatter(json_backend=orjson_backend)
+    assert json.loads(stdlib_formatter.format_transcript(transcript)) == json.loads(
+        orjson_formatter.format_transcript(transcript)
+    )
+    report(
+        f"{count} snippets, JSONFormatter",
+        measure(lambda: stdlib_formatter.format_transcript(transcript), number=1),
+        measure(lambda: orjson_formatter.format_transcript(transcript), number=1),
+    )
+
+
+def bench_streaming_formatters() -> None:
+    count = 100
+    snippet_count = 5000
+
+    def transcripts() -> Iterator[FetchedTranscript]:
+        for i in range(count):
+            yield FetchedTranscript(
+                snippets=_ColumnarSnippets.from_snippets(
+                    _synthetic_snippets(snippet_count)
+                ),
+                video_id=str(i),
+                language="English",
+                language_code="en",
+                is_generated=False,
+            )
+
+    with open(os.devnull, "w", encoding="utf-8") as fp:
+        for formatter_type in ("json", "pretty", "text", "srt", "webvtt"):
+            formatter = FormatterLoader().load(formatter_type)
+            report(
+                f"{count}x{snippet_count} snippets, {formatter_type}, peak memory",
+                measure_peak_memory(
+                    lambda: fp.write(formatter.format_transcripts(list(transcripts())))
+                ),
+                measure_peak_memory(
+                    lambda: formatter.write_transcripts(transcripts(), fp)
+                ),
+                unit="KiB",
+            )
+
+
+def _legacy_format_cues(
+    formatter: _TextBasedFormatter, transcript: FetchedTranscript
+) -> str:
+    lines = []
+    for i, line in enumerate(transcript):
+        end = line.start + line.duration
+        time_text = "{} --> {}".format(
+            formatter._seconds_to_timestamp(line.start),
+            formatter._seconds_to_timestamp(
+                transcript[i + 1].start
+                if i < len(transcript) - 1 and transcript[i + 1].start < end
+                else end
+            ),
+        )
+        lines.append(formatter._format_transcript_helper(i, time_text, line))
+    return formatter._format_transcript_header(lines)
+
+
+def bench_cue_timestamps() -> None:
+    count = 100_000
+    snippets = list(_synthetic_snippets(count))
+    for compact in (False, True):
+        transcript = FetchedTranscript(
+            snippets=_ColumnarSnippets.from_snippets(snippets) if compact else snippets,
+            video_id="video_id",
+            language="English",
+            language_code="en",
+            is_generated=False,
+        )
+        for formatter in (SRTFormatter(), WebVTTFormatter()):
+            numpy_options = [formatters.numpy, None] if formatters.numpy else [None]
+            for numpy in numpy_options:
+                with patch.object(formatters, "numpy", numpy):
+                    assert _legacy_format_cues(
+                        formatter, transcript
+                    ) == formatter.format_transcript(transcript)
+                    report(
+                        f"{count} cues, {type(formatter).__name__}, "
+                        f"{'compact' if compact else 'list'}, "
+                        f"{'numpy' if numpy else 'pure Python'}",
+                        measure(
+                            lambda: _legacy_format_cues(formatter, transcript),
+                            repeat=3,
+                            number=1,
+                        ),
+                        measure(
+                            lambda: formatter.format_transcript(transcript),
+                            repeat=3,
+                            number=1,
+                        ),
+                    )
+
+
+class _LegacyTranscriptParser:
+    """
+    The implementation `_TranscriptParser` used to have, which builds a tree using
+    defusedxml and strips tags using regular expressions. It is only kept around as a
+    baseline for the benchmarks.
+    """
+
+    def __init__(self, preserve_formatting: bool = False):
+        if preserve_formatting:
+            formats_regex = "|".join(_TranscriptParser._FORMATTING_TAGS)
+            formats_regex = r"<\/?(?!\/?(" + formats_regex + r")\b).*?\b>"
+            self._html_regex = re.compile(formats_regex, re.IGNORECASE)
+        else:
+            self._html_regex = re.compile(r"<[^>]*>", re.IGNORECASE)
+
+    def parse(self, raw_data: str) -> _ColumnarSnippets:
+        texts = []
+        starts = []
+        durations = []
+        for xml_element in ElementTree.fromstring(raw_data):
+            if xml_element.text is not None:
+                texts.append(re.sub(self._html_regex, "", unescape(xml_element.text)))
+                starts.append(float(xml_element.attrib["start"]))
+                durations.append(float(xml_element.attrib.get("dur", "0.0")))
+        return _ColumnarSnippets(texts, starts, durations)
+
+
+def _synthetic_transcript_xml(texts: Iterable[str]) -> str:
+    elements = "\n".join(
+        f'    <text start="{i * 2.34:.2f}" dur="2.5">{text}</text>'
+        for i, text in enumerate(texts)
+    )
+    return (
+        f'<?xml version="1.0" encoding="utf-8" ?>\n<transcript>\n{elements}\n'
+        "</transcript>\n"
+    )
+
+
+def bench_caption_xml_parsing() -> None:
+    count = 100_000
+    raw_data = _synthetic_transcript_xml(
+        f"it&amp;#39;s &lt;i&gt;synthetic&lt;/i&gt; snippet number {i}"
+        if i % 3 == 0
+        else f"this is the synthetic snippet number {i}"
+        for i in range(count)
+    )
+    # an unterminated tag in every snippet, which makes the old regex backtrack
+    backtracking_raw_data = _synthetic_transcript_xml(
+        "&lt;a " * 50 for _ in range(count // 100)
+    )
+    for name, document in (
+        (f"{count} snippets", raw_data),
+        (f"{count // 100} snippets with unterminated tags", backtracking_raw_data),
+    ):
+        for preserve_formatting in (False, True):
+            legacy_parser = _LegacyTranscriptParser(preserve_formatting)
+            parser = _TranscriptParser(preserve_formatting)
+            assert legacy_parser.parse(document) == parser.parse(document)
+            report(
+                f"{name}, preserve_formatting={preserve_formatting}",
+                measure(lambda: legacy_parser.parse(document), repeat=3, number=1),
+                measure(lambda: parser.parse(document), repeat=3, number=1),
+            )
+
+
+def _synthetic_transcript_json3(texts: Iterable[str]) -> bytes:
+    events = [
+        {"tStartMs": i * 2340, "dDurationMs": 2500, "segs": [{"utf8": text}]}
+        for i, text in enumerate(texts)
+    ]
+    # YouTube pretty prints json3 transcripts
+    return json.dumps({"wireMagic": "pb3", "events": events}, indent=2).encode()
+
+
+def _synthetic_transcript_srv3(texts: Iterable[str]) -> bytes:
+    elements = "\n".join(
+        f'<p t="{i * 2340}" d="2500">{text}</p>' for i, text in enumerate(texts)
+    )
+    return (
+        f'<?xml version="1.0" encoding="utf-8" ?><timedtext format="3">\n<body>\n'
+        f"{elements}\n</body>\n</timedtext>\n"
+    ).encode()
+
+
+def bench_transcript_formats() -> None:
+    count = 100_000
+    texts = [f"this is the synthetic snippet number {i}" for i in range(count)]
+    xml_data = _synthetic_transcript_xml(texts)
+    xml_parser = _TranscriptParser()
+    baseline_time = measure(lambda: xml_parser.parse(xml_data), repeat=3, number=1)
+    for name, raw_data, parser in (
+        ("json3", _synthetic_transcript_json3(texts), _Json3TranscriptParser()),
+        (
+            "json3 (stdlib json)",
+            _synthetic_transcript_json3(texts),
+            _Json3TranscriptParser(StdlibJsonBackend()),
+        ),
+        ("srv3", _synthetic_transcript_srv3(texts), _Srv3TranscriptParser()),
+    ):
+        assert parser.parse(raw_data) == xml_parser.parse(xml_data)
+        report(
+            f"{name}, {count} snippets, size",
+            len(xml_data.encode()) / 1024,
+            len(raw_data) / 1024,
+            "KiB",
+        )
+        report(
+            f"{name}, {count} snippets, parsing",
+            baseline_time,
+            measure(lambda: parser.parse(raw_data), repeat=3, number=1),
+        )
+
+
+def bench_transcript_streaming() -> None:
+    count = 100_000
+    transcript = _synthetic_transcript_xml(
+        f"this is the synthetic snippet number {i}" for i in range(count)
+    ).encode()
+
+    def first_snippets(snippets: Iterable[FetchedTranscriptSnippet]) -> list:
+        # the snippets of the first 60 seconds, as shown in a preview
+        return list(takewhile(lambda snippet: snippet.start < 60, snippets))
+
+    def stream_first_snippets() -> list:
+        snippets = ytt_api.stream("GJLlxj_dtq8")
+        try:
+            return first_snippets(snippets)
+        finally:
+            snippets.close()
+
+    with patch.object(_FakeYouTubeHandler, "transcript", transcript):
+        with fake_youtube_server():
+            ytt_api = YouTubeTranscriptApi()
+            assert list(ytt_api.stream("GJLlxj_dtq8")) == list(
+                ytt_api.fetch("GJLlxj_dtq8")
+            )
+            report(
+                f"{count} snippets, first 60 seconds",
+                measure(
+                    lambda: first_snippets(ytt_api.fetch("GJLlxj_dtq8")),
+                    repeat=3,
+                    number=1,
+                ),
+                measure(stream_first_snippets, repeat=3, number=1),
+            )
+            report(
+                f"{count} snippets, all of them",
+                measure(lambda: list(ytt_api.fetch("GJLlxj_dtq8")), repeat=3, number=1),
+                measure(
+                    lambda: list(ytt_api.stream("GJLlxj_dtq8")), repeat=3, number=1
+                ),
+            )
+
+
+def bench_lazy_parsing() -> None:
+    count = 100_000
+    transcript = _synthetic_transcript_xml(
+        f"this is the synthetic snippet number {i}" for i in range(count)
+    ).encode()
+
+    with patch.object(_FakeYouTubeHandler, "transcript", transcript):
+        with fake_youtube_server():
+            # the requests `fetch` sends, without processing their responses
+            watch_url = _transcripts.WATCH_URL.format(video_id="GJLlxj_dtq8")
+            transcript_url = (
+                YouTubeTranscriptApi().list("GJLlxj_dtq8").find_transcript(["en"])._url
+            )
+            ytt_api = YouTubeTranscriptApi()
+            lazy_ytt_api = YouTubeTranscriptApi(lazy_parsing=True)
+            session = Session()
+
+            def forward() -> str:
+                return ytt_api.fetch("GJLlxj_dtq8").to_json()
+
+            def forward_lazily() -> bytes:
+                return lazy_ytt_api.fetch("GJLlxj_dtq8").payload
+
+            def download() -> bytes:
+                session.get(watch_url)
+                return session.get(transcript_url).content
+
+            assert lazy_ytt_api.fetch("GJLlxj_dtq8") == ytt_api.fetch("GJLlxj_dtq8")
+            report(
+                f"{count} snippets, fetch and forward",
+                measure(forward, repeat=3, number=1),
+                measure(forward_lazily, repeat=3, number=1),
+            )
+            report(
+                f"{count} snippets, fetch and forward",
+                measure_peak_memory(forward),
+                measure_peak_memory(forward_lazily),
+                "KiB",
+            )
+            report(
+                f"{count} snippets, download only vs lazily",
+                measure(download, repeat=3, number=1),
+                measure(forward_lazily, repeat=3, number=1),
+            )
+
+
+def _extract_video_data_decoded(html_bytes: bytes):
+    """
+    Extracts the player response the way it was done before watch pages were kept
+    as bytes, which decoded the whole page first.
+    """
+    html = html_bytes.decode("utf-8")
+    try:
+        return _JsVarParser("ytInitialPlayerResponse").parse_members(
+            html, "video_id", ("playabilityStatus", "captions")
+        )
+    except Exception as exception:
+        return IpBlocked if 'class="g-recaptcha"' in html else type(exception)
+
+
+def _extract_video_data_or_exception(html_bytes: bytes):
+    fetcher = TranscriptListFetcher(Session(), proxy_config=None)
+    try:
+        return fetcher._extract_video_data(_WatchPage(html_bytes), "video_id")
+    except Exception as exception:
+        return type(exception)
+
+
+def bench_bytes_pipeline() -> None:
+    for name, html in load_watch_pages().items():
+        html_bytes = html.encode("utf-8")
+        decode_page = lambda: _extract_video_data_decoded(html_bytes)  # noqa: E731
+        decode_script = lambda: _extract_video_data_or_exception(  # noqa: E731
+            html_bytes
+        )
+        assert decode_page() == decode_script()
+        report(name, measure(decode_page), measure(decode_script))
+        report(
+            "",
+            measure_peak_memory(decode_page),
+            measure_peak_memory(decode_script),
+            unit="KiB",
+        )
+
+    count = 100_000
+    for name, raw_data in (
+        (
+            f"{count} snippets",
+            _synthetic_transcript_xml(
+                f"this is the synthetic snippet number {i}" for i in range(count)
+            ),
+        ),
+        (
+            f"{count} CJK snippets",
+            _synthetic_transcript_xml(
+                f"\u3053\u308c\u306f\u5b57\u5e55\u3067\u3059 {i}" for i in range(count)
+            ),
+        ),
+    ):
+        raw_bytes = raw_data.encode("utf-8")
+        parser = _TranscriptParser()
+
+        def parse_decoded() -> _ColumnarSnippets:
+            with patch.object(_TranscriptParser, "_XML_SEGMENT_SIZE", sys.maxsize):
+                return parser.parse(raw_bytes.decode("utf-8"))
+
+        parse_bytes = lambda: parser.parse(raw_bytes)  # noqa: E731
+        assert parse_decoded() == parse_bytes()
+        report(
+            name,
+            measure(parse_decoded, repeat=3, number=1),
+            measure(parse_bytes, repeat=3, number=1),
+        )
+        report(
+            "",
+            measure_peak_memory(parse_decoded),
+            measure_peak_memory(parse_bytes),
+            unit="KiB",
+        )
+
+
+def _fetch_throttled(video_ids: List[str], retry_policy: RetryPolicy):
+    """
+    Fetches the videos from a fake server that allows 40 requests per second and
+    returns how many have been fetched, how long it took and how many requests have
+    been sent.
+    """
+    throttle = _SlidingWindowThrottle(max_requests=40)
+    ytt_api = YouTubeTranscriptApi(retry_policy=retry_policy)
+    with patch.object(_FakeYouTubeHandler, "throttle", throttle):
+        start = time.perf_counter()
+        fetched = sum(
+            result.transcript is not None
+            for result in ytt_api.fetch_many(video_ids, max_workers=16)
+        )
+        seconds = time.perf_counter() - start
+    return fetched, seconds, throttle.requests
+
+
+def bench_retry_policy() -> None:
+    video_ids = ["GJLlxj_dtq8"] * 64
+    unlimited_budget = RetryBudget(retry_ratio=20, max_tokens=float("inf"))
+    with fake_youtube_server():
+        # retrying right away, like a plain retry loop would
+        baseline_fetched, baseline_seconds, baseline_requests = _fetch_throttled(
+            video_ids,
+            RetryPolicy(max_retries=20, base_delay=0, budget=unlimited_budget),
+        )
+        for name, budget in (
+            ("default budget", RetryBudget()),
+            ("unlimited budget", unlimited_budget),
+        ):
+            fetched, seconds, requests = _fetch_throttled(
+                video_ids,
+                RetryPolicy(
+                    max_retries=20, base_delay=0.25, max_delay=4, budget=budget
+                ),
+            )
+            report(
+                f"{len(video_ids)} videos, {name}, failed",
+                len(video_ids) - baseline_fetched,
+                len(video_ids) - fetched,
+                unit="",
+            )
+            report("seconds", baseline_seconds, seconds, unit="s")
+            report(
+                "seconds per fetched transcript",
+                baseline_seconds / baseline_fetched,
+                seconds / fetched,
+                unit="s",
+            )
+            report(
+                "requests per fetched transcript",
+                baseline_requests / baseline_fetched,
+                requests / fetched,
+                unit="",
+            )
+
+
+def _fetch_paced(fetch: Callable[[], object], max_requests: int):
+    """
+    Calls `fetch` against a fake server that allows `max_requests` requests per second
+    and returns how long it took, how many requests have been sent and how many of
+    them have been rejected.
+    """
+    throttle = _SlidingWindowThrottle(max_requests=max_requests)
+    with patch.object(_FakeYouTubeHandler, "throttle", throttle):
+        start = time.perf_counter()
+        fetch()
+        seconds = time.perf_counter() - start
+    return seconds, throttle.requests, throttle.rejected
+
+
+def bench_rate_limiting() -> None:
+    video_ids = ["GJLlxj_dtq8"] * 64
+    max_requests = 20
+
+    def fetch_with_fixed_delay():
+        # waiting a fixed time between videos, which has to leave headroom for
+        # slow responses, as the requests themselves aren't paced
+        ytt_api = YouTubeTranscriptApi()
+        for video_id in video_ids:
+            ytt_api.fetch(video_id)
+            time.sleep(0.55)
+
+    def fetch_with_rate_limiter():
+        # a little below the allowed rate, as the server sees the requests with some
+        # jitter, which would otherwise push every other one over the limit
+        rate_limiter = RateLimiter(rate=max_requests * 0.95)
+        ytt_api = YouTubeTranscriptApi(rate_limiter=rate_limiter)
+        for result in ytt_api.fetch_many(video_ids, max_workers=16):
+            result.transcript
+
+    with fake_youtube_server():
+        baseline_seconds, baseline_requests, baseline_rejected = _fetch_paced(
+            fetch_with_fixed_delay, max_requests
+        )
+        seconds, requests, rejected = _fetch_paced(
+            fetch_with_rate_limiter, max_requests
+        )
+    report(f"{len(video_ids)} videos, seconds", baseline_seconds, seconds, unit="s")
+    report(
+        f"seconds per request, allowed {1 / max_requests:.2f}",
+        baseline_seconds / baseline_requests,
+        seconds / requests,
+        unit="s",
+    )
+    # counts, which are 0 when nothing gets rejected, so there is no speedup to show
+    print(
+        "{name:<45} {baseline:>10d}    {candidate:>10d}".format(
+            name="rejected requests", baseline=baseline_rejected, candidate=rejected
+        )
+    )
+
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {
+    "js_var_parser": bench_js_var_parser,
+    "player_response_decoding": bench_player_response_decoding,
+    "scoped_unescaping": bench_scoped_unescaping,
+    "page_classification": bench_page_classification,
+    "watch_page_streaming": bench_watch_page_streaming,
+    "fetch_many": bench_fetch_many,
+    "columnar_snippets": bench_columnar_snippets,
+    "slotted_data_model": bench_slotted_data_model,
+    "json_serialization": bench_json_serialization,
+    "json_backends": bench_json_backends,
+    "streaming_formatters": bench_streaming_formatters,
+    "cue_timestamps": bench_cue_timestamps,
+    "caption_xml_parsing": bench_caption_xml_parsing,
+    "transcript_formats": bench_transcript_formats,
+    "transcript_streaming": bench_transcript_streaming,
+    "lazy_parsing": bench_lazy_parsing,
+    "bytes_pipeline": bench_bytes_pipeline,
+    "retry_policy": bench_retry_policy,
+    "rate_limiting": bench_rate_limiting,
+}
+
+
+def main(names: List[str]) -> None:
+    for name in names or BENCHMARKS.keys():
+        print(
+            "\n{title:<45} {baseline:>14} {candidate:>13} {speedup:>9}".format(
+                title=f"[{name}]",
+                baseline="baseline",
+                candidate="candidate",
+                speedup="speedup",
+            )
+        )
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,7 +1,12 @@
 import os
+import tempfile
+import threading
+import time
+from dataclasses import replace
 from pathlib import Path
 from unittest import TestCase
 from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
 
 import requests
 
@@ -25,8 +30,22 @@ from youtube_transcript_api import (
     AgeRestricted,
     RequestBlocked,
     VideoUnplayable,
+    YouTubeDataUnparsable,
+    TranscriptListSource,
+    TranscriptFormat,
+    TranscriptFetchResult,
+    Transcript,
 )
+from youtube_transcript_api._api import _ThreadFetchers
+from youtube_transcript_api.caching import (
+    ErrorCache,
+    SQLiteTranscriptStore,
+    TranscriptListCache,
+)
+from youtube_transcript_api.json_backends import StdlibJsonBackend
 from youtube_transcript_api.proxies import GenericProxyConfig, WebshareProxyConfig
+from youtube_transcript_api.rate_limiting import RateLimiter
+from youtube_transcript_api.retries import RetryBudget, RetryPolicy
 
 
 def get_asset_path(filename: str) -> Path:
@@ -97,13 +116,430 @@ class TestYouTubeTranscriptApi(TestCase):
             "GJLlxj_dtq8", preserve_formatting=True
         )
 
-        self.ref_transcript[1].text = "this is <i>not</i> the original transcript"
+        self.ref_transcript.snippets[1] = replace(
+            self.ref_transcript[1], text="this is <i>not</i> the original transcript"
+        )
+
+        self.assertEqual(
+            transcript,
+            self.ref_transcript,
+        )
+
+    def test_fetch__stream_watch_page(self):
+        transcript = YouTubeTranscriptApi(stream_watch_page=True).fetch("GJLlxj_dtq8")
 
         self.assertEqual(
             transcript,
             self.ref_transcript,
         )
 
+    def test_fetch__stream_watch_page__create_consent_cookie_if_needed(self):
+        httpretty.register_uri(
+            httpretty.GET,
+            "https://www.youtube.com/watch",
+            body=load_asset("youtube_consent_page.html.static"),
+        )
+
+        YouTubeTranscriptApi(stream_watch_page=True).fetch("F1xioXWb8CY")
+        self.assertEqual(len(httpretty.latest_requests()), 3)
+        for request in httpretty.latest_requests()[1:]:
+            self.assertEqual(
+                request.headers["cookie"], "CONSENT=YES+cb.20210328-17-p0.de+FX+119"
+            )
+
+    def test_fetch__stream_watch_page__exception_if_ip_blocked(self):
+        httpretty.register_uri(
+            httpretty.GET,
+            "https://www.youtube.com/watch",
+            body=load_asset("youtube_too_many_requests.html.static"),
+        )
+
+        with self.assertRaises(IpBlocked):
+            YouTubeTranscriptApi(stream_watch_page=True).fetch("abc")
+
+    def _register_innertube_response(self, **kwargs):
+        httpretty.register_uri(
+            httpretty.POST,
+            "https://www.youtube.com/youtubei/v1/player",
+            **kwargs,
+        )
+
+    def _requested_endpoints(self):
+        # httpretty records requests with a body twice, therefore duplicates are removed
+        endpoints = []
+        for request in httpretty.latest_requests():
+            endpoint = request.path.split("?")[0]
+            if endpoint not in endpoints:
+                endpoints.append(endpoint)
+        return endpoints
+
+    def test_fetch__innertube(self):
+        self._register_innertube_response(
+            body=load_asset("youtube_innertube_player.json.static")
+        )
+
+        transcript = YouTubeTranscriptApi(
+            transcript_list_source=TranscriptListSource.INNERTUBE
+        ).fetch("GJLlxj_dtq8")
+
+        self.assertEqual(transcript, self.ref_transcript)
+        self.assertEqual(
+            self._requested_endpoints(), ["/youtubei/v1/player", "/api/timedtext"]
+        )
+        self.assertNotIn("fmt=srv3", httpretty.last_request().path)
+        self.assertEqual(
+            httpretty.latest_requests()[0].parsed_body["videoId"], "GJLlxj_dtq8"
+        )
+
+    def test_list__innertube(self):
+        self._register_innertube_response(
+            body=load_asset("youtube_innertube_player.json.static")
+        )
+
+        transcript_list = YouTubeTranscriptApi(transcript_list_source="innertube").list(
+            "GJLlxj_dtq8"
+        )
+
+        self.assertEqual(
+            str(transcript_list),
+            str(YouTubeTranscriptApi().list("GJLlxj_dtq8")),
+        )
+
+    def test_fetch__innertube__json_backend(self):
+        self._register_innertube_response(
+            body=load_asset("youtube_innertube_player.json.static")
+        )
+        json_backend = StdlibJsonBackend()
+
+        with patch.object(
+            json_backend, "loads", wraps=json_backend.loads
+        ) as loads_mock:
+            transcript = YouTubeTranscriptApi(
+                transcript_list_source=TranscriptListSource.INNERTUBE,
+                json_backend=json_backend,
+            ).fetch("GJLlxj_dtq8")
+
+        self.assertEqual(transcript, self.ref_transcript)
+        loads_mock.assert_called_once()
+
+    def _register_transcript_formats(self, **responses):
+        """
+        Serves the given responses for the transcript formats requested, and the
+        transcript as XML if no format is requested.
+        """
+
+        def respond(request, uri, response_headers):
+            transcript_format = request.querystring.get("fmt", ["xml"])[0]
+            status, body = responses.get(
+                transcript_format, (200, load_asset("transcript.xml.static"))
+            )
+            return status, response_headers, body
+
+        httpretty.reset()
+        httpretty.register_uri(
+            httpretty.GET,
+            "https://www.youtube.com/watch",
+            body=load_asset("youtube.html.static"),
+        )
+        httpretty.register_uri(
+            httpretty.GET, "https://www.youtube.com/api/timedtext", body=respond
+        )
+
+    def _requested_transcript_formats(self):
+        return [
+            request.querystring.get("fmt", ["xml"])[0]
+            for request in httpretty.latest_requests()
+            if request.path.startswith("/api/timedtext")
+        ]
+
+    def test_fetch__transcript_format(self):
+        for transcript_format in (TranscriptFormat.JSON3, TranscriptFormat.SRV3):
+            with self.subTest(transcript_format=transcript_format):
+                self._register_transcript_formats(
+                    **{
+                        transcript_format.value: (
+                            200,
+                            load_asset(f"transcript.{transcript_format.value}.static"),
+                        )
+                    }
+                )
+
+                transcript = YouTubeTranscriptApi(
+                    transcript_format=transcript_format
+                ).fetch("GJLlxj_dtq8")
+
+                self.assertEqual(transcript, self.ref_transcript)
+                self.assertEqual(
+                    self._requested_transcript_formats(), [transcript_format.value]
+                )
+
+    def test_fetch__transcript_format__translated(self):
+        self._register_transcript_formats(
+            json3=(200, load_asset("transcript.json3.static"))
+        )
+
+        YouTubeTranscriptApi(transcript_format=TranscriptFormat.JSON3).list(
+            "GJLlxj_dtq8"
+        ).find_transcript(["en"]).translate("af").fetch()
+
+        query_string = httpretty.last_request().querystring
+        self.assertEqual(query_string["tlang"], ["af"])
+        self.assertEqual(query_string["fmt"], ["json3"])
+
+    def test_fetch__transcript_format__falls_back_to_xml_if_unparsable(self):
+        for transcript_format in (TranscriptFormat.JSON3, TranscriptFormat.SRV3):
+            for body in (b"", b"<html>unexpected</html>", b'{"wireMagic": "pb3"}'):
+                with self.subTest(transcript_format=transcript_format, body=body):
+                    self._register_transcript_formats(
+                        **{transcript_format.value: (200, body)}
+                    )
+
+                    transcript = YouTubeTranscriptApi(
+                        transcript_format=transcript_format
+                    ).fetch("GJLlxj_dtq8")
+
+                    self.assertEqual(transcript, self.ref_transcript)
+                    self.assertEqual(
+                        self._requested_transcript_formats(),
+                        [transcript_format.value, "xml"],
+                    )
+
+    def test_fetch__transcript_format__exception_if_request_failed(self):
+        self._register_transcript_formats(json3=(500, b""))
+
+        with self.assertRaises(YouTubeRequestFailed):
+            YouTubeTranscriptApi(transcript_format=TranscriptFormat.JSON3).fetch(
+                "GJLlxj_dtq8"
+            )
+
+    def test_fetch__transcript_format__xml_if_formatting_is_preserved(self):
+        self._register_transcript_formats(
+            json3=(200, load_asset("transcript.json3.static"))
+        )
+
+        transcript = YouTubeTranscriptApi(
+            transcript_format=TranscriptFormat.JSON3
+        ).fetch("GJLlxj_dtq8", preserve_formatting=True)
+
+        self.assertEqual(
+            transcript[1].text, "this is <i>not</i> the original transcript"
+        )
+        self.assertEqual(self._requested_transcript_formats(), ["xml"])
+
+    def test_fetch__lazy_parsing(self):
+        transcript = YouTubeTranscriptApi(lazy_parsing=True).fetch("GJLlxj_dtq8")
+
+        self.assertEqual(transcript.payload, load_asset("transcript.xml.static"))
+        self.assertFalse(transcript.snippets.is_parsed)
+        self.assertEqual(transcript, self.ref_transcript)
+
+    def test_fetch__lazy_parsing__downloads_xml(self):
+        self._register_transcript_formats(
+            json3=(200, load_asset("transcript.json3.static"))
+        )
+
+        transcript = YouTubeTranscriptApi(
+            transcript_format=TranscriptFormat.JSON3, lazy_parsing=True
+        ).fetch("GJLlxj_dtq8")
+
+        self.assertEqual(transcript.payload, load_asset("transcript.xml.static"))
+        self.assertEqual(self._requested_transcript_formats(), ["xml"])
+
+    def test_stream(self):
+        snippets = list(YouTubeTranscriptApi().stream("GJLlxj_dtq8"))
+
+        self.assertEqual(snippets, self.ref_transcript.snippets)
+
+    def test_stream__formatted(self):
+        snippets = list(
+            YouTubeTranscriptApi().stream("GJLlxj_dtq8", preserve_formatting=True)
+        )
+
+        self.assertEqual(snippets[1].text, "this is <i>not</i> the original transcript")
+
+    def test_stream__stopped_early(self):
+        with patch.object(Transcript, "STREAM_CHUNK_SIZE", 1):
+            snippets = YouTubeTranscriptApi().stream("GJLlxj_dtq8")
+            first_snippet = next(snippets)
+            with patch(
+                "requests.models.Response.close", autospec=True
+            ) as close_response:
+                snippets.close()
+
+        self.assertEqual(first_snippet, self.ref_transcript[0])
+        close_response.assert_called_once()
+
+    def test_stream__transcript_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with SQLiteTranscriptStore(
+                Path(directory) / "transcripts.sqlite3"
+            ) as store:
+                ytt_api = YouTubeTranscriptApi(transcript_store=store)
+                for _ in ytt_api.stream("GJLlxj_dtq8"):
+                    break
+                self.assertIsNone(store.find("GJLlxj_dtq8", ["en"], False))
+
+                list(ytt_api.stream("GJLlxj_dtq8"))
+                request_count = len(httpretty.latest_requests())
+                snippets = list(ytt_api.stream("GJLlxj_dtq8"))
+
+        self.assertEqual(snippets, self.ref_transcript.snippets)
+        self.assertEqual(len(httpretty.latest_requests()), request_count)
+
+    def test_stream__exception_if_request_failed(self):
+        httpretty.reset()
+        httpretty.register_uri(
+            httpretty.GET,
+            "https://www.youtube.com/watch",
+            body=load_asset("youtube.html.static"),
+        )
+        httpretty.register_uri(
+            httpretty.GET, "https://www.youtube.com/api/timedtext", status=500
+        )
+
+        with self.assertRaises(YouTubeRequestFailed):
+            list(YouTubeTranscriptApi().stream("GJLlxj_dtq8"))
+
+    def _register_failing_transcript(self, *failures):
+        """
+        Serves the given (status, headers) failures for the transcript first and the
+        transcript itself afterward.
+        """
+        httpretty.reset()
+        httpretty.register_uri(
+            httpretty.GET,
+            "https://www.youtube.com/watch",
+            body=load_asset("youtube.html.static"),
+        )
+        httpretty.register_uri(
+            httpretty.GET,
+            "https://www.youtube.com/api/timedtext",
+            responses=[
+                *(
+                    httpretty.Response(body="", status=status, adding_headers=headers)
+                    for status, headers in failures
+                ),
+                httpretty.Response(body=load_asset("transcript.xml.static")),
+            ],
+        )
+
+    def _requested_paths(self):
+        return [request.path.split("?")[0] for request in httpretty.latest_requests()]
+
+    @patch("youtube_transcript_api.retries.time.sleep")
+    def test_fetch__retry_policy__only_retries_failed_request(self, sleep):
+        self._register_failing_transcript((503, {}), (429, {}))
+        ytt_api = YouTubeTranscriptApi(retry_policy=RetryPolicy(budget=RetryBudget()))
+
+        transcript = ytt_api.fetch("GJLlxj_dtq8")
+
+        self.assertEqual(transcript, self.ref_transcript)
+        self.assertEqual(self._requested_paths(), ["/watch"] + ["/api/timedtext"] * 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    @patch("youtube_transcript_api.retries.time.sleep")
+    def test_fetch__retry_policy__waits_for_retry_after(self, sleep):
+        self._register_failing_transcript((429, {"Retry-After": "3"}))
+        ytt_api = YouTubeTranscriptApi(
+            retry_policy=RetryPolicy(base_delay=0.1, budget=RetryBudget())
+        )
+
+        ytt_api.fetch("GJLlxj_dtq8")
+
+        sleep.assert_called_once_with(3)
+
+    @patch("youtube_transcript_api.retries.time.sleep")
+    def test_fetch__retry_policy__retries_watch_page(self, sleep):
+        httpretty.register_uri(
+            httpretty.GET,
+            "https://www.youtube.com/watch",
+            responses=[
+                httpretty.Response(body="", status=502),
+                httpretty.Response(body=load_asset("youtube.html.static")),
+            ],
+        )
+        ytt_api = YouTubeTranscriptApi(retry_policy=RetryPolicy(budget=RetryBudget()))
+
+        self.assertEqual(ytt_api.fetch("GJLlxj_dtq8"), self.ref_transcript)
+        self.assertEqual(self._requested_paths(), ["/watch"] * 2 + ["/api/timedtext"])
+
+    @patch("youtube_transcript_api.retries.time.sleep")
+    def test_fetch__retry_policy__not_retried_on_permanent_errors(self, sleep):
+        self._register_failing_transcript((404, {}))
+        ytt_api = YouTubeTranscriptApi(retry_policy=RetryPolicy(budget=RetryBudget()))
+
+        with self.assertRaises(YouTubeRequestFailed) as cm:
+            ytt_api.fetch("GJLlxj_dtq8")
+
+        self.assertEqual(cm.exception.status_code, 404)
+        sleep.assert_not_called()
+
+    @patch("youtube_transcript_api.retries.time.sleep")
+    def test_stream__retry_policy(self, sleep):
+        self._register_failing_transcript((503, {}))
+        ytt_api = YouTubeTranscriptApi(retry_policy=RetryPolicy(budget=RetryBudget()))
+
+        snippets = list(ytt_api.stream("GJLlxj_dtq8"))
+
+        self.assertEqual(snippets, self.ref_transcript.snippets)
+        sleep.assert_called_once()
+
+    @patch("youtube_transcript_api.rate_limiting.time.sleep")
+    def test_fetch__rate_limiter(self, sleep):
+        ytt_api = YouTubeTranscriptApi(rate_limiter=RateLimiter(rate=1))
+
+        self.assertEqual(ytt_api.fetch("GJLlxj_dtq8"), self.ref_transcript)
+
+        # the transcript is requested one second after the watch page
+        sleep.assert_called_once()
+        self.assertAlmostEqual(sleep.call_args.args[0], 1, delta=0.1)
+
+    def test_fetch__innertube__falls_back_to_watch_page_if_request_failed(self):
+        self._register_innertube_response(status=500)
+
+        transcript = YouTubeTranscriptApi(
+            transcript_list_source=TranscriptListSource.INNERTUBE
+        ).fetch("GJLlxj_dtq8")
+
+        self.assertEqual(transcript, self.ref_transcript)
+        self.assertEqual(
+            self._requested_endpoints(),
+            ["/youtubei/v1/player", "/watch", "/api/timedtext"],
+        )
+
+    def test_fetch__innertube__falls_back_to_watch_page_if_unparsable(self):
+        self._register_innertube_response(body="<html></html>")
+
+        transcript = YouTubeTranscriptApi(
+            transcript_list_source=TranscriptListSource.INNERTUBE
+        ).fetch("GJLlxj_dtq8")
+
+        self.assertEqual(transcript, self.ref_transcript)
+
+    def test_fetch__innertube__falls_back_to_watch_page_if_request_blocked(self):
+        self._register_innertube_response(
+            body='{"playabilityStatus": {"status": "LOGIN_REQUIRED", '
+            '"reason": "Sign in to confirm you\u2019re not a bot"}}'
+        )
+
+        transcript = YouTubeTranscriptApi(
+            transcript_list_source=TranscriptListSource.INNERTUBE
+        ).fetch("GJLlxj_dtq8")
+
+        self.assertEqual(transcript, self.ref_transcript)
+
+    def test_fetch__innertube__exception_if_video_unavailable(self):
+        self._register_innertube_response(
+            body='{"playabilityStatus": {"status": "ERROR", '
+            '"reason": "Video unavailable"}}'
+        )
+
+        with self.assertRaises(VideoUnavailable):
+            YouTubeTranscriptApi(
+                transcript_list_source=TranscriptListSource.INNERTUBE
+            ).fetch("abc")
+        self.assertEqual(self._requested_endpoints(), ["/youtubei/v1/player"])
+
     def test_fetch__with_altered_user_agent(self):
         httpretty.register_uri(
             httpretty.GET,
@@ -118,6 +554,217 @@ class TestYouTubeTranscriptApi(TestCase):
             self.ref_transcript,
         )
 
+    def _register_watch_pages(self, watch_pages):
+        def respond(request, uri, response_headers):
+            video_id = parse_qs(urlparse(uri).query)["v"][0]
+            asset = watch_pages.get(video_id, "youtube.html.static")
+            return [200, response_headers, load_asset(asset)]
+
+        # the watch page registered in setUp would take precedence over the callback
+        httpretty.reset()
+        httpretty.register_uri(
+            httpretty.GET, "https://www.youtube.com/watch", body=respond
+        )
+        httpretty.register_uri(
+            httpretty.GET,
+            "https://www.youtube.com/api/timedtext",
+            body=load_asset("transcript.xml.static"),
+        )
+
+    def test_fetch_many(self):
+        self._register_watch_pages(
+            {"unavailable": "youtube_video_unavailable.html.static"}
+        )
+        video_ids = ["GJLlxj_dtq8", "unavailable", "GJLlxj_dtq8"]
+
+        results = list(YouTubeTranscriptApi().fetch_many(video_ids, max_workers=2))
+
+        self.assertEqual(
+            sorted(result.video_id for result in results), sorted(video_ids)
+        )
+        for result in results:
+            if result.video_id == "unavailable":
+                self.assertIsNone(result.transcript)
+                self.assertIsInstance(result.exception, VideoUnavailable)
+            else:
+                self.assertEqual(result.transcript, self.ref_transcript)
+                self.assertIsNone(result.exception)
+
+    def test_fetch_many__ordered(self):
+        video_ids = [f"video{i}" for i in range(10)]
+        ytt_api = YouTubeTranscriptApi()
+
+        def fetch_result(video_id, *args):
+            time.sleep(0.001 * (10 - int(video_id[5:])))
+            return TranscriptFetchResult(video_id)
+
+        with patch.object(ytt_api, "_fetch_result", side_effect=fetch_result):
+            results = list(ytt_api.fetch_many(video_ids, max_workers=4, ordered=True))
+
+        self.assertEqual([result.video_id for result in results], video_ids)
+
+    def test_fetch_many__consumes_video_ids_lazily(self):
+        consumed_video_ids = []
+
+        def video_ids():
+            for i in range(100):
+                consumed_video_ids.append(i)
+                yield "GJLlxj_dtq8"
+
+        ytt_api = YouTubeTranscriptApi()
+
+        with patch.object(
+            ytt_api, "_fetch_result", side_effect=lambda video_id, *args: video_id
+        ):
+            results = ytt_api.fetch_many(video_ids(), max_workers=3)
+            next(results)
+
+            self.assertLessEqual(len(consumed_video_ids), 2 * 3 + 1)
+            self.assertEqual(len(list(results)), 99)
+
+    def test_fetch_many__exception_if_max_workers_invalid(self):
+        with self.assertRaises(ValueError):
+            list(YouTubeTranscriptApi().fetch_many(["GJLlxj_dtq8"], max_workers=0))
+
+    def _get_thread_http_clients(self, thread_fetchers, count=2):
+        http_clients = []
+
+        def get_http_client():
+            http_clients.append(thread_fetchers.get()._http_client)
+
+        threads = [threading.Thread(target=get_http_client) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return http_clients
+
+    def test_fetch_many__thread_local_sessions(self):
+        proxy_config = GenericProxyConfig(https_url="http://localhost:8080")
+        ytt_api = YouTubeTranscriptApi(
+            cookie_path=get_asset_path("example_cookies.txt"),
+            proxy_config=proxy_config,
+        )
+        thread_fetchers = _ThreadFetchers(ytt_api._http_client, ytt_api._create_fetcher)
+
+        http_clients = self._get_thread_http_clients(thread_fetchers)
+
+        self.assertEqual(len(http_clients), 2)
+        self.assertIsNot(http_clients[0], http_clients[1])
+        for http_client in http_clients:
+            self.assertIsNot(http_client, ytt_api._http_client)
+            self.assertIs(http_client.cookies, ytt_api._http_client.cookies)
+            self.assertEqual(http_client.proxies, proxy_config.to_requests_dict())
+            self.assertEqual(http_client.headers["Accept-Language"], "en-US")
+
+    def test_fetch_many__thread_local_sessions__copy_session_settings(self):
+        class CustomSession(requests.Session):
+            pass
+
+        def hook(response, *args, **kwargs):
+            return response
+
+        http_client = CustomSession()
+        http_client.max_redirects = 3
+        http_client.hooks["response"].append(hook)
+        retry_adapter = requests.adapters.HTTPAdapter(max_retries=5)
+        custom_adapter = type("CustomAdapter", (requests.adapters.HTTPAdapter,), {})()
+        http_client.mount("https://", retry_adapter)
+        http_client.mount("https://www.youtube.com/api/", custom_adapter)
+        ytt_api = YouTubeTranscriptApi(http_client=http_client)
+        thread_fetchers = _ThreadFetchers(ytt_api._http_client, ytt_api._create_fetcher)
+
+        http_clients = self._get_thread_http_clients(thread_fetchers)
+
+        for thread_http_client in http_clients:
+            self.assertIsInstance(thread_http_client, CustomSession)
+            self.assertEqual(thread_http_client.max_redirects, 3)
+            self.assertEqual(thread_http_client.hooks["response"], [hook])
+            self.assertIs(
+                thread_http_client.get_adapter("https://www.youtube.com/api/timedtext"),
+                custom_adapter,
+            )
+            thread_adapter = thread_http_client.get_adapter(
+                "https://www.youtube.com/watch"
+            )
+            self.assertIsNot(thread_adapter, retry_adapter)
+            self.assertEqual(thread_adapter.max_retries.total, 5)
+        self.assertIsNot(
+            http_clients[0].get_adapter("https://www.youtube.com/watch"),
+            http_clients[1].get_adapter("https://www.youtube.com/watch"),
+        )
+
+        with patch.object(
+            requests.adapters.HTTPAdapter, "close", autospec=True
+        ) as close:
+            thread_fetchers.close()
+
+        closed_adapters = [call.args[0] for call in close.call_args_list]
+        self.assertEqual(len(closed_adapters), 4)
+        self.assertNotIn(custom_adapter, closed_adapters)
+        self.assertNotIn(retry_adapter, closed_adapters)
+
+    def test_fetch_many__closes_thread_local_sessions(self):
+        ytt_api = YouTubeTranscriptApi()
+
+        with patch.object(_ThreadFetchers, "close", autospec=True) as close:
+            list(ytt_api.fetch_many(["GJLlxj_dtq8"] * 3, max_workers=2))
+
+        close.assert_called_once()
+
+    @patch("youtube_transcript_api.caching.time.time", return_value=1740690000)
+    def test_fetch__transcript_list_cache(self, _):
+        cache = TranscriptListCache()
+        ytt_api = YouTubeTranscriptApi(transcript_list_cache=cache)
+
+        ytt_api.fetch("GJLlxj_dtq8")
+        transcript = ytt_api.fetch("GJLlxj_dtq8")
+
+        self.assertEqual(transcript, self.ref_transcript)
+        requested_paths = [request.path for request in httpretty.latest_requests()]
+        self.assertEqual(
+            [path.split("?")[0] for path in requested_paths],
+            ["/watch", "/api/timedtext", "/api/timedtext"],
+        )
+        self.assertEqual(cache.stats.hits, 1)
+        self.assertEqual(cache.stats.misses, 1)
+
+        cache.invalidate("GJLlxj_dtq8")
+        ytt_api.fetch("GJLlxj_dtq8")
+
+        self.assertTrue(httpretty.latest_requests()[-2].path.startswith("/watch"))
+
+    def test_fetch__transcript_store(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "transcripts.sqlite3"
+            with SQLiteTranscriptStore(path) as store:
+                YouTubeTranscriptApi(transcript_store=store).fetch(
+                    "GJLlxj_dtq8", languages=["fr", "en"]
+                )
+            request_count = len(httpretty.latest_requests())
+
+            with SQLiteTranscriptStore(path) as store:
+                ytt_api = YouTubeTranscriptApi(transcript_store=store)
+                transcript = ytt_api.fetch("GJLlxj_dtq8", languages=["fr", "en"])
+                translated_transcript = (
+                    ytt_api.list("GJLlxj_dtq8")
+                    .find_transcript(["en"])
+                    .translate("de")
+                    .fetch()
+                )
+                ytt_api.list("GJLlxj_dtq8").find_transcript(["en"]).translate(
+                    "de"
+                ).fetch()
+
+        self.assertEqual(transcript, self.ref_transcript)
+        self.assertEqual(translated_transcript.language_code, "de")
+        self.assertEqual(
+            [request.path.split("?")[0] for request in httpretty.latest_requests()][
+                request_count:
+            ],
+            ["/watch", "/api/timedtext", "/watch"],
+        )
+
     def test_list(self):
         transcript_list = YouTubeTranscriptApi().list("GJLlxj_dtq8")
 
@@ -256,6 +903,38 @@ class TestYouTubeTranscriptApi(TestCase):
         with self.assertRaises(VideoUnavailable):
             YouTubeTranscriptApi().fetch("abc")
 
+    def test_fetch__error_cache(self):
+        httpretty.register_uri(
+            httpretty.GET,
+            "https://www.youtube.com/watch",
+            body=load_asset("youtube_video_unavailable.html.static"),
+        )
+        error_cache = ErrorCache()
+        ytt_api = YouTubeTranscriptApi(error_cache=error_cache)
+
+        with self.assertRaises(VideoUnavailable):
+            ytt_api.fetch("abc")
+        with self.assertRaises(VideoUnavailable) as cm:
+            ytt_api.fetch("abc")
+
+        self.assertEqual(len(httpretty.latest_requests()), 1)
+        self.assertEqual(cm.exception.video_id, "abc")
+        self.assertEqual(error_cache.stats.hits, 1)
+
+    def test_fetch__error_cache__transient_errors_not_cached(self):
+        # otherwise, the watch page registered in setUp would be served the second time
+        httpretty.reset()
+        httpretty.register_uri(
+            httpretty.GET, "https://www.youtube.com/watch", status=500
+        )
+        ytt_api = YouTubeTranscriptApi(error_cache=ErrorCache())
+
+        for _ in range(2):
+            with self.assertRaises(YouTubeRequestFailed):
+                ytt_api.fetch("abc")
+
+        self.assertEqual(len(httpretty.latest_requests()), 2)
+
     def test_fetch__exception_if_youtube_request_fails(self):
         httpretty.register_uri(
             httpretty.GET, "https://www.youtube.com/watch", status=500
@@ -286,6 +965,16 @@ class TestYouTubeTranscriptApi(TestCase):
         with self.assertRaises(IpBlocked):
             YouTubeTranscriptApi().fetch("abc")
 
+    def test_fetch__exception_if_player_response_unparsable(self):
+        httpretty.register_uri(
+            httpretty.GET,
+            "https://www.youtube.com/watch",
+            body='<script>var ytInitialPlayerResponse = {"captions": {</script>',
+        )
+
+        with self.assertRaises(YouTubeDataUnparsable):
+            YouTubeTranscriptApi().fetch("abc")
+
     def test_fetch__exception_request_blocked(self):
         httpretty.register_uri(
             httpretty.GET,
@@ -379,6 +1068,33 @@ class TestYouTubeTranscriptApi(TestCase):
 
         self.assertEqual(len(httpretty.latest_requests()), 3 + 2)
 
+    @patch("youtube_transcript_api._transcripts.time.sleep")
+    @patch("youtube_transcript_api.proxies.GenericProxyConfig.to_requests_dict")
+    def test_fetch__with_proxy_retry_when_blocked__retry_policy(
+        self, to_requests_dict, sleep
+    ):
+        for _ in range(3):
+            httpretty.register_uri(
+                httpretty.GET,
+                "https://www.youtube.com/watch",
+                body=load_asset("youtube_request_blocked.html.static"),
+            )
+        proxy_config = WebshareProxyConfig(
+            proxy_username="username",
+            proxy_password="password",
+        )
+        budget = RetryBudget(max_tokens=2)
+        ytt_api = YouTubeTranscriptApi(
+            proxy_config=proxy_config, retry_policy=RetryPolicy(budget=budget)
+        )
+
+        with self.assertRaises(RequestBlocked):
+            ytt_api.fetch("Njp5uhTorCo")
+
+        # the budget only allows two retries
+        self.assertEqual(len(httpretty.latest_requests()), 3)
+        self.assertEqual(sleep.call_count, 2)
+
     @patch("youtube_transcript_api.proxies.GenericProxyConfig.to_requests_dict")
     def test_fetch__with_webshare_proxy_reraise_when_blocked(self, to_requests_dict):
         retries = 5
@@ -0,0 +1,437 @@
+import asyncio
+from typing import Callable, Dict, List
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+import httpx
+
+from youtube_transcript_api import (
+    AsyncYouTubeTranscriptApi,
+    AsyncTranscript,
+    FetchedTranscript,
+    FetchedTranscriptSnippet,
+    TranscriptListSource,
+    TranscriptFormat,
+    VideoUnavailable,
+    IpBlocked,
+    RequestBlocked,
+    YouTubeRequestFailed,
+)
+from youtube_transcript_api.caching import RequestCoalescer
+from youtube_transcript_api.proxies import WebshareProxyConfig
+from youtube_transcript_api.rate_limiting import RateLimiter
+from youtube_transcript_api.retries import RetryBudget, RetryPolicy
+
+from .test_api import load_asset
+
+
+class FakeYouTube:
+    """
+    Serves the test assets through a `httpx.MockTransport`. Responses can be
+    overridden per path and video ID.
+    """
+
+    def __init__(self):
+        self.requests: List[httpx.Request] = []
+        self.watch_pages: Dict[str, bytes] = {}
+        self.handlers: Dict[str, Callable[[httpx.Request], httpx.Response]] = {}
+        self.transport = httpx.MockTransport(self._handle)
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.url.path in self.handlers:
+            return self.handlers[request.url.path](request)
+        if request.url.path == "/watch":
+            return httpx.Response(
+                200,
+                content=self.watch_pages.get(
+                    request.url.params["v"], load_asset("youtube.html.static")
+                ),
+            )
+        if request.url.path == "/api/timedtext":
+            return httpx.Response(200, content=load_asset("transcript.xml.static"))
+        return httpx.Response(404)
+
+
+class TestAsyncYouTubeTranscriptApi(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.ref_transcript = FetchedTranscript(
+            snippets=[
+                FetchedTranscriptSnippet(
+                    text="Hey, this is just a test",
+                    start=0.0,
+                    duration=1.54,
+                ),
+                FetchedTranscriptSnippet(
+                    text="this is not the original transcript",
+                    start=1.54,
+                    duration=4.16,
+                ),
+                FetchedTranscriptSnippet(
+                    text="just something shorter, I made up for testing",
+                    start=5.7,
+                    duration=3.239,
+                ),
+            ],
+            language="English",
+            language_code="en",
+            is_generated=False,
+            video_id="GJLlxj_dtq8",
+        )
+        self.youtube = FakeYouTube()
+
+    def _create_api(self, **kwargs) -> AsyncYouTubeTranscriptApi:
+        return AsyncYouTubeTranscriptApi(
+            http_client=httpx.AsyncClient(transport=self.youtube.transport), **kwargs
+        )
+
+    async def test_fetch(self):
+        async with self._create_api() as ytt_api:
+            transcript = await ytt_api.fetch("GJLlxj_dtq8")
+
+        self.assertEqual(transcript, self.ref_transcript)
+
+    async def test_stream(self):
+        async with self._create_api() as ytt_api:
+            snippets = [snippet async for snippet in ytt_api.stream("GJLlxj_dtq8")]
+
+        self.assertEqual(snippets, self.ref_transcript.snippets)
+
+    async def test_stream__exception_if_request_failed(self):
+        self.youtube.handlers["/api/timedtext"] = lambda request: httpx.Response(500)
+
+        async with self._create_api() as ytt_api:
+            with self.assertRaises(YouTubeRequestFailed):
+                async for _ in ytt_api.stream("GJLlxj_dtq8"):
+                    pass
+
+    def _respond_in_order(self, path: str, *responses: httpx.Response) -> None:
+        remaining_responses = list(responses)
+        self.youtube.handlers[path] = lambda request: remaining_responses.pop(0)
+
+    def _requested_paths(self) -> List[str]:
+        return [request.url.path for request in self.youtube.requests]
+
+    @patch("youtube_transcript_api.retries.asyncio.sleep")
+    async def test_fetch__retry_policy__only_retries_failed_request(self, sleep):
+        self._respond_in_order(
+            "/api/timedtext",
+            httpx.Response(503),
+            httpx.Response(429, headers={"Retry-After": "2"}),
+            httpx.Response(200, content=load_asset("transcript.xml.static")),
+        )
+        retry_policy = RetryPolicy(base_delay=0.1, budget=RetryBudget())
+
+        async with self._create_api(retry_policy=retry_policy) as ytt_api:
+            transcript = await ytt_api.fetch("GJLlxj_dtq8")
+
+        self.assertEqual(transcript, self.ref_transcript)
+        self.assertEqual(self._requested_paths(), ["/watch"] + ["/api/timedtext"] * 3)
+        self.assertEqual(sleep.call_count, 2)
+        self.assertEqual(sleep.call_args.args[0], 2)
+
+    @patch("youtube_transcript_api.retries.asyncio.sleep")
+    async def test_fetch__retry_policy__retries_watch_page(self, sleep):
+        for stream_watch_page in (False, True):
+            with self.subTest(stream_watch_page=stream_watch_page):
+                self.youtube.requests.clear()
+                self._respond_in_order(
+                    "/watch",
+                    httpx.Response(502),
+                    httpx.Response(200, content=load_asset("youtube.html.static")),
+                )
+                retry_policy = RetryPolicy(budget=RetryBudget())
+
+                async with self._create_api(
+                    stream_watch_page=stream_watch_page, retry_policy=retry_policy
+                ) as ytt_api:
+                    transcript = await ytt_api.fetch("GJLlxj_dtq8")
+
+                self.assertEqual(transcript, self.ref_transcript)
+                self.assertEqual(
+                    self._requested_paths(), ["/watch"] * 2 + ["/api/timedtext"]
+                )
+
+    @patch("youtube_transcript_api.retries.asyncio.sleep")
+    async def test_stream__retry_policy(self, sleep):
+        self._respond_in_order(
+            "/api/timedtext",
+            httpx.Response(503),
+            httpx.Response(200, content=load_asset("transcript.xml.static")),
+        )
+        retry_policy = RetryPolicy(budget=RetryBudget())
+
+        async with self._create_api(retry_policy=retry_policy) as ytt_api:
+            snippets = [snippet async for snippet in ytt_api.stream("GJLlxj_dtq8")]
+
+        self.assertEqual(snippets, self.ref_transcript.snippets)
+        sleep.assert_called_once()
+
+    @patch("youtube_transcript_api.rate_limiting.asyncio.sleep")
+    async def test_fetch__rate_limiter(self, sleep):
+        async with self._create_api(rate_limiter=RateLimiter(rate=1)) as ytt_api:
+            transcript = await ytt_api.fetch("GJLlxj_dtq8")
+
+        self.assertEqual(transcript, self.ref_transcript)
+        sleep.assert_called_once()
+        self.assertAlmostEqual(sleep.call_args.args[0], 1, delta=0.1)
+
+    async def test_fetch__stream_watch_page(self):
+        async with self._create_api(stream_watch_page=True) as ytt_api:
+            transcript = await ytt_api.fetch("GJLlxj_dtq8")
+
+        self.assertEqual(transcript, self.ref_transcript)
+
+    async def test_fetch__innertube(self):
+        self.youtube.handlers["/youtubei/v1/player"] = lambda request: httpx.Response(
+            200, content=load_asset("youtube_innertube_player.json.static")
+        )
+
+        async with self._create_api(
+            transcript_list_source=TranscriptListSource.INNERTUBE
+        ) as ytt_api:
+            transcript = await ytt_api.fetch("GJLlxj_dtq8")
+
+        self.assertEqual(transcript, self.ref_transcript)
+        self.assertEqual(
+            [request.url.path for request in self.youtube.requests],
+            ["/youtubei/v1/player", "/api/timedtext"],
+        )
+
+    async def test_fetch__innertube__falls_back_to_watch_page(self):
+        self.youtube.handlers["/youtubei/v1/player"] = lambda request: httpx.Response(
+            500
+        )
+
+        async with self._create_api(
+            transcript_list_source=TranscriptListSource.INNERTUBE
+        ) as ytt_api:
+            transcript = await ytt_api.fetch("GJLlxj_dtq8")
+
+        self.assertEqual(transcript, self.ref_transcript)
+
+    async def test_fetch__transcript_format(self):
+        self.youtube.handlers["/api/timedtext"] = lambda request: httpx.Response(
+            200,
+            content=load_asset(
+                "transcript.json3.static"
+                if request.url.params.get("fmt") == "json3"
+                else "transcript.xml.static"
+            ),
+        )
+
+        async with self._create_api(
+            transcript_format=TranscriptFormat.JSON3
+        ) as ytt_api:
+            transcript = await ytt_api.fetch("GJLlxj_dtq8")
+
+        self.assertEqual(transcript, self.ref_transcript)
+        self.assertEqual(self.youtube.requests[-1].url.params["fmt"], "json3")
+
+    async def test_fetch__transcript_format__falls_back_to_xml_if_unparsable(self):
+        async with self._create_api(
+            transcript_format=TranscriptFormat.JSON3
+        ) as ytt_api:
+            transcript = await ytt_api.fetch("GJLlxj_dtq8")
+
+        self.assertEqual(transcript, self.ref_transcript)
+        self.assertEqual(
+            [request.url.params.get("fmt") for request in self.youtube.requests[1:]],
+            ["json3", None],
+        )
+
+    async def test_fetch__create_consent_cookie_if_needed(self):
+        watch_pages = [
+            load_asset("youtube_consent_page.html.static"),
+            load_asset("youtube.html.static"),
+        ]
+        self.youtube.handlers["/watch"] = lambda request: httpx.Response(
+            200, content=watch_pages.pop(0)
+        )
+
+        async with self._create_api() as ytt_api:
+            transcript = await ytt_api.fetch("GJLlxj_dtq8")
+
+        self.assertEqual(transcript, self.ref_transcript)
+        self.assertEqual(len(self.youtube.requests), 3)
+        for request in self.youtube.requests[1:]:
+            self.assertEqual(
+                request.headers["cookie"], "CONSENT=YES+cb.20210328-17-p0.de+FX+119"
+            )
+
+    async def test_list(self):
+        async with self._create_api() as ytt_api:
+            transcript_list = await ytt_api.list("GJLlxj_dtq8")
+            transcript = transcript_list.find_transcript(["de"])
+            translated_transcript = await transcript.translate("en").fetch()
+
+        self.assertIsInstance(transcript, AsyncTranscript)
+        self.assertEqual(
+            {transcript.language_code for transcript in transcript_list},
+            {"zh", "de", "en", "hi", "ja", "ko", "es", "cs"},
+        )
+        self.assertEqual(translated_transcript.language_code, "en")
+        self.assertTrue(str(self.youtube.requests[-1].url).endswith("&tlang=en"))
+
+    async def test_fetch__exception_if_video_unavailable(self):
+        self.youtube.watch_pages["abc"] = load_asset(
+            "youtube_video_unavailable.html.static"
+        )
+
+        async with self._create_api() as ytt_api:
+            with self.assertRaises(VideoUnavailable):
+                await ytt_api.fetch("abc")
+
+    async def test_fetch__exception_if_ip_blocked(self):
+        self.youtube.watch_pages["abc"] = load_asset(
+            "youtube_too_many_requests.html.static"
+        )
+
+        async with self._create_api() as ytt_api:
+            with self.assertRaises(IpBlocked):
+                await ytt_api.fetch("abc")
+
+    async def test_fetch__exception_if_request_failed(self):
+        self.youtube.handlers["/watch"] = lambda request: httpx.Response(500)
+
+        async with self._create_api() as ytt_api:
+            with self.assertRaises(YouTubeRequestFailed):
+                await ytt_api.fetch("abc")
+
+    async def test_fetch__retries_if_request_blocked(self):
+        self.youtube.watch_pages["Njp5uhTorCo"] = load_asset(
+            "youtube_request_blocked.html.static"
+        )
+        proxy_config = WebshareProxyConfig(
+            proxy_username="username",
+            proxy_password="password",
+            retries_when_blocked=3,
+        )
+
+        # the proxies are mounted using the fake transport
+        with patch(
+            "youtube_transcript_api._async_api.httpx.AsyncHTTPTransport",
+            return_value=self.youtube.transport,
+        ) as transport_mock:
+            ytt_api = AsyncYouTubeTranscriptApi(proxy_config=proxy_config)
+
+        async with ytt_api:
+            with self.assertRaises(RequestBlocked) as cm:
+                await ytt_api.fetch("Njp5uhTorCo")
+
+        self.assertEqual(len(self.youtube.requests), 3)
+        self.assertEqual(cm.exception._proxy_config, proxy_config)
+        self.assertEqual(
+            {call.kwargs["proxy"] for call in transport_mock.call_args_list},
+            set(proxy_config.to_requests_dict().values()),
+        )
+
+    def test_init__proxy_config_with_http_client(self):
+        http_client = httpx.AsyncClient(transport=self.youtube.transport)
+        proxy_config = WebshareProxyConfig(
+            proxy_username="username", proxy_password="password"
+        )
+
+        with self.assertRaises(ValueError):
+            AsyncYouTubeTranscriptApi(
+                proxy_config=proxy_config, http_client=http_client
+            )
+
+    async def test_fetch_many(self):
+        self.youtube.watch_pages["unavailable"] = load_asset(
+            "youtube_video_unavailable.html.static"
+        )
+        video_ids = ["GJLlxj_dtq8", "unavailable", "GJLlxj_dtq8"]
+
+        async with self._create_api() as ytt_api:
+            results = [
+                result async for result in ytt_api.fetch_many(video_ids, concurrency=2)
+            ]
+
+        self.assertEqual(
+            sorted(result.video_id for result in results), sorted(video_ids)
+        )
+        for result in results:
+            if result.video_id == "unavailable":
+                self.assertIsNone(result.transcript)
+                self.assertIsInstance(result.exception, VideoUnavailable)
+            else:
+                self.assertEqual(result.transcript, self.ref_transcript)
+                self.assertIsNone(result.exception)
+
+    async def test_fetch__request_coalescer(self):
+        coalescer = RequestCoalescer()
+
+        async with self._create_api(request_coalescer=coalescer) as ytt_api:
+            transcripts = await asyncio.gather(
+                *(ytt_api.fetch("GJLlxj_dtq8") for _ in range(3)),
+                ytt_api.fetch("GJLlxj_dtq8", languages=["de", "en"]),
+            )
+
+        self.assertEqual(transcripts[:3], [self.ref_transcript] * 3)
+        self.assertEqual(transcripts[3].language_code, "de")
+        self.assertEqual(
+            [request.url.path for request in self.youtube.requests],
+            ["/watch", "/api/timedtext", "/api/timedtext"],
+        )
+        self.assertEqual(coalescer.stats.coalesced, 5)
+
+    async def test_fetch__request_coalescer__shares_exceptions(self):
+        self.youtube.watch_pages["abc"] = load_asset(
+            "youtube_video_unavailable.html.static"
+        )
+
+        async with self._create_api(request_coalescer=RequestCoalescer()) as ytt_api:
+            results = await asyncio.gather(
+                ytt_api.fetch("abc"), ytt_api.fetch("abc"), return_exceptions=True
+            )
+
+        self.assertIsInstance(results[0], VideoUnavailable)
+        self.assertIsInstance(results[1], VideoUnavailable)
+        self.assertEqual(len(self.youtube.requests), 1)
+
+    async def test_fetch_many__limits_concurrency(self):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fetch(video_id, languages, preserve_formatting):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return self.ref_transcript
+
+        async with self._create_api() as ytt_api:
+            ytt_api.fetch = fetch
+            results = [
+                result
+                async for result in ytt_api.fetch_many(
+                    (str(i) for i in range(20)), concurrency=3
+                )
+            ]
+
+        self.assertEqual(len(results), 20)
+        self.assertEqual(max_in_flight, 3)
+
+    async def test_fetch_many__invalid_concurrency(self):
+        async with self._create_api() as ytt_api:
+            with self.assertRaises(ValueError):
+                async for _ in ytt_api.fetch_many(["GJLlxj_dtq8"], concurrency=0):
+                    pass
+
+    async def test_aclose__keeps_passed_in_client_open(self):
+        http_client = httpx.AsyncClient(transport=self.youtube.transport)
+
+        async with AsyncYouTubeTranscriptApi(http_client=http_client):
+            pass
+
+        self.assertFalse(http_client.is_closed)
+        await http_client.aclose()
+
+    async def test_aclose__closes_own_client(self):
+        ytt_api = AsyncYouTubeTranscriptApi()
+
+        await ytt_api.aclose()
+
+        self.assertTrue(ytt_api._http_client.is_closed)
@@ -0,0 +1,447 @@
+import asyncio
+import time
+from dataclasses import replace
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from unittest.mock import patch
+
+import pytest
+
+from youtube_transcript_api import (
+    AgeRestricted,
+    FetchedTranscript,
+    FetchedTranscriptSnippet,
+    IpBlocked,
+    RequestBlocked,
+    TranscriptsDisabled,
+    VideoUnavailable,
+    YouTubeRequestFailed,
+)
+from youtube_transcript_api.caching import (
+    CacheStats,
+    CoalescingStats,
+    ErrorCache,
+    RequestCoalescer,
+    SQLiteTranscriptStore,
+    TranscriptKey,
+    TranscriptListCache,
+)
+from youtube_transcript_api._transcripts import _LazyColumnarSnippets
+
+
+def _captions_json(*expires):
+    return {
+        "captionTracks": [
+            {"baseUrl": f"https://www.youtube.com/api/timedtext?v=id&expire={expire}"}
+            for expire in expires
+        ]
+    }
+
+
+@pytest.fixture
+def now():
+    with patch("youtube_transcript_api.caching.time.time") as time_mock:
+        time_mock.return_value = 1_000_000
+        yield time_mock
+
+
+class TestTranscriptListCache:
+    def test_get(self, now):
+        cache = TranscriptListCache()
+        captions_json = _captions_json(now.return_value + 7200)
+
+        cache.set("video_id", captions_json)
+
+        assert cache.get("video_id") is captions_json
+        assert cache.get("other_video_id") is None
+        assert cache.stats == CacheStats(hits=1, misses=1, evictions=0, size=1)
+
+    def test_get__expired_after_ttl(self, now):
+        cache = TranscriptListCache(ttl=100)
+        cache.set("video_id", _captions_json(now.return_value + 7200))
+
+        now.return_value += 99
+        assert cache.get("video_id") is not None
+        now.return_value += 1
+        assert cache.get("video_id") is None
+        assert cache.stats == CacheStats(hits=1, misses=1, evictions=1, size=0)
+
+    def test_get__expired_before_urls_expire(self, now):
+        cache = TranscriptListCache(ttl=3600)
+        cache.set(
+            "video_id",
+            _captions_json(now.return_value + 1000, now.return_value + 500),
+        )
+
+        now.return_value += 500 - TranscriptListCache.EXPIRY_MARGIN - 1
+        assert cache.get("video_id") is not None
+        now.return_value += 1
+        assert cache.get("video_id") is None
+
+    def test_set__does_not_cache_expired_urls(self, now):
+        cache = TranscriptListCache()
+
+        cache.set("video_id", _captions_json(now.return_value))
+
+        assert cache.get("video_id") is None
+        assert cache.stats.size == 0
+
+    def test_set__without_url_expiry(self, now):
+        cache = TranscriptListCache(ttl=100)
+
+        cache.set("video_id", {"captionTracks": [{"baseUrl": "/api/timedtext"}]})
+
+        assert cache.get("video_id") is not None
+
+    def test_set__evicts_least_recently_used(self, now):
+        cache = TranscriptListCache(max_size=2)
+        captions_json = _captions_json(now.return_value + 7200)
+        cache.set("a", captions_json)
+        cache.set("b", captions_json)
+        cache.get("a")
+
+        cache.set("c", captions_json)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.stats.evictions == 1
+        assert cache.stats.size == 2
+
+    def test_invalidate(self, now):
+        cache = TranscriptListCache()
+        cache.set("a", _captions_json(now.return_value + 7200))
+        cache.set("b", _captions_json(now.return_value + 7200))
+
+        cache.invalidate("a")
+        cache.invalidate("unknown")
+
+        assert cache.get("a") is None
+        assert cache.get("b") is not None
+        assert cache.stats.evictions == 0
+
+    def test_clear(self, now):
+        cache = TranscriptListCache()
+        cache.set("a", _captions_json(now.return_value + 7200))
+
+        cache.clear()
+
+        assert cache.get("a") is None
+        assert cache.stats.size == 0
+
+    def test_init__invalid_max_size(self):
+        with pytest.raises(ValueError):
+            TranscriptListCache(max_size=0)
+
+
+class TestErrorCache:
+    def test_raise_if_cached(self, now):
+        cache = ErrorCache()
+        cache.set("video_id", VideoUnavailable("video_id"))
+
+        cache.raise_if_cached("other_video_id")
+        with pytest.raises(VideoUnavailable) as exc_info:
+            cache.raise_if_cached("video_id")
+
+        assert exc_info.value.video_id == "video_id"
+        assert "video_id" in str(exc_info.value)
+        assert cache.stats == CacheStats(hits=1, misses=1, evictions=0, size=1)
+
+    def test_raise_if_cached__raises_fresh_copies(self, now):
+        cache = ErrorCache()
+        cache.set("video_id", TranscriptsDisabled("video_id"))
+
+        with pytest.raises(TranscriptsDisabled) as first_exc_info:
+            cache.raise_if_cached("video_id")
+        with pytest.raises(TranscriptsDisabled) as second_exc_info:
+            cache.raise_if_cached("video_id")
+
+        assert first_exc_info.value is not second_exc_info.value
+
+    def test_set__per_exception_class_ttl(self, now):
+        cache = ErrorCache()
+        cache.set("unavailable", VideoUnavailable("unavailable"))
+        cache.set("disabled", TranscriptsDisabled("disabled"))
+        cache.set("age_restricted", AgeRestricted("age_restricted"))
+
+        now.return_value += ErrorCache.DEFAULT_TTLS[TranscriptsDisabled]
+
+        cache.raise_if_cached("disabled")
+        with pytest.raises(VideoUnavailable):
+            cache.raise_if_cached("unavailable")
+        with pytest.raises(AgeRestricted):
+            cache.raise_if_cached("age_restricted")
+
+    def test_set__transient_errors_not_cached(self, now):
+        cache = ErrorCache()
+
+        cache.set("a", RequestBlocked("a"))
+        cache.set("b", IpBlocked("b"))
+        cache.set("c", YouTubeRequestFailed("c", Exception("500")))
+
+        assert cache.stats.size == 0
+
+    def test_set__ttls_looked_up_by_base_class(self, now):
+        cache = ErrorCache(ttls={RequestBlocked: 10})
+
+        cache.set("video_id", IpBlocked("video_id"))
+        cache.set("other_video_id", VideoUnavailable("other_video_id"))
+
+        with pytest.raises(IpBlocked):
+            cache.raise_if_cached("video_id")
+        cache.raise_if_cached("other_video_id")
+
+    def test_invalidate(self, now):
+        cache = ErrorCache()
+        cache.set("video_id", VideoUnavailable("video_id"))
+
+        cache.invalidate("video_id")
+
+        cache.raise_if_cached("video_id")
+
+
+def _wait_until(condition):
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+class TestRequestCoalescer:
+    def _call_concurrently(self, coalescer, function, count=4):
+        release = Event()
+
+        def blocking_function():
+            release.wait()
+            return function()
+
+        with ThreadPoolExecutor(count) as executor:
+            futures = [
+                executor.submit(coalescer.call, "key", blocking_function)
+                for _ in range(count)
+            ]
+            _wait_until(lambda: coalescer.stats.coalesced == count - 1)
+            release.set()
+        return futures
+
+    def test_call(self):
+        coalescer = RequestCoalescer()
+        calls = []
+
+        futures = self._call_concurrently(
+            coalescer, lambda: calls.append(1) or "result"
+        )
+
+        assert [future.result() for future in futures] == ["result"] * 4
+        assert len(calls) == 1
+        assert coalescer.stats == CoalescingStats(requests=4, coalesced=3, in_flight=0)
+
+    def test_call__exception_raised_for_all_callers(self):
+        coalescer = RequestCoalescer()
+        exception = VideoUnavailable("video_id")
+
+        def function():
+            raise exception
+
+        futures = self._call_concurrently(coalescer, function)
+
+        exceptions = [future.exception() for future in futures]
+        assert all(isinstance(e, VideoUnavailable) for e in exceptions)
+        assert exception in exceptions
+        assert len({id(e) for e in exceptions}) == 4
+
+    def test_call__not_coalesced_once_done(self):
+        coalescer = RequestCoalescer()
+
+        assert coalescer.call("key", lambda: 1) == 1
+        assert coalescer.call("key", lambda: 2) == 2
+        assert coalescer.stats == CoalescingStats(requests=2, coalesced=0, in_flight=0)
+
+    def test_call__different_keys(self):
+        coalescer = RequestCoalescer()
+
+        assert coalescer.call("a", lambda: coalescer.call("b", lambda: 1)) == 1
+        assert coalescer.stats.coalesced == 0
+
+    def test_acall(self):
+        coalescer = RequestCoalescer()
+        calls = []
+
+        async def function():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def main():
+            return await asyncio.gather(
+                *(coalescer.acall("key", function) for _ in range(4))
+            )
+
+        assert asyncio.run(main()) == ["result"] * 4
+        assert len(calls) == 1
+        assert coalescer.stats == CoalescingStats(requests=4, coalesced=3, in_flight=0)
+
+    def test_acall__exception_raised_for_all_callers(self):
+        coalescer = RequestCoalescer()
+
+        async def function():
+            await asyncio.sleep(0.01)
+            raise TranscriptsDisabled("video_id")
+
+        async def main():
+            return await asyncio.gather(
+                *(coalescer.acall("key", function) for _ in range(3)),
+                return_exceptions=True,
+            )
+
+        exceptions = asyncio.run(main())
+        assert all(isinstance(e, TranscriptsDisabled) for e in exceptions)
+        assert len({id(e) for e in exceptions}) == 3
+
+    def test_acall__cancelling_a_caller_does_not_cancel_the_others(self):
+        coalescer = RequestCoalescer()
+
+        async def function():
+            await asyncio.sleep(0.01)
+            return "result"
+
+        async def main():
+            first = asyncio.ensure_future(coalescer.acall("key", function))
+            second = asyncio.ensure_future(coalescer.acall("key", function))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second, first.cancelled()
+
+        assert asyncio.run(main()) == ("result", True)
+
+
+def _transcript(video_id="video_id", language_code="en", snippet_count=3):
+    return FetchedTranscript(
+        snippets=[
+            FetchedTranscriptSnippet(
+                text=f"snippet {i} ünicode", start=i * 1.54, duration=1.001
+            )
+            for i in range(snippet_count)
+        ],
+        video_id=video_id,
+        language="English",
+        language_code=language_code,
+        is_generated=False,
+    )
+
+
+def _key(video_id="video_id", translation_language_code=None):
+    return TranscriptKey(video_id, "en", False, translation_language_code, False)
+
+
+class TestSQLiteTranscriptStore:
+    def test_get(self, tmp_path):
+        with SQLiteTranscriptStore(tmp_path / "store.sqlite3") as store:
+            store.put(_key(), _transcript())
+
+            assert store.get(_key()) == _transcript()
+            assert store.get(_key(translation_language_code="de")) is None
+            assert store.stats == CacheStats(hits=1, misses=1, evictions=0, size=1)
+
+    def test_get__after_reopening(self, tmp_path):
+        path = tmp_path / "store.sqlite3"
+        with SQLiteTranscriptStore(path) as store:
+            store.put(_key(), _transcript())
+            store.put(
+                _key(translation_language_code="de"), _transcript(language_code="de")
+            )
+
+        with SQLiteTranscriptStore(path) as store:
+            assert store.get(_key()) == _transcript()
+            assert store.get(_key(translation_language_code="de")) == _transcript(
+                language_code="de"
+            )
+
+    def test_put__batches_writes(self, tmp_path):
+        path = tmp_path / "store.sqlite3"
+        store = SQLiteTranscriptStore(path, batch_size=3)
+        reader = SQLiteTranscriptStore(path)
+
+        store.put(_key("a"), _transcript("a"))
+        store.put(_key("b"), _transcript("b"))
+        assert reader.get(_key("a")) is None
+
+        store.put(_key("c"), _transcript("c"))
+        assert reader.get(_key("a")) == _transcript("a")
+
+        store.close()
+        reader.close()
+
+    def test_put__flushes_after_interval(self, tmp_path):
+        path = tmp_path / "store.sqlite3"
+        with patch("youtube_transcript_api.caching.time.time") as time_mock:
+            time_mock.return_value = 1000
+            store = SQLiteTranscriptStore(path, flush_interval=5)
+            reader = SQLiteTranscriptStore(path)
+
+            store.put(_key("a"), _transcript("a"))
+            time_mock.return_value += 5
+            store.put(_key("b"), _transcript("b"))
+
+            assert reader.get(_key("a")) is not None
+            store.close()
+            reader.close()
+
+    def test_put__evicts_least_recently_used(self, tmp_path):
+        transcript_size = len(SQLiteTranscriptStore._encode(_transcript()))
+        with patch("youtube_transcript_api.caching.time.time") as time_mock:
+            time_mock.return_value = 1000
+            store = SQLiteTranscriptStore(
+                tmp_path / "store.sqlite3",
+                max_size=2 * transcript_size,
+                batch_size=1,
+            )
+            for video_id in ("a", "b"):
+                time_mock.return_value += 1
+                store.put(_key(video_id), _transcript(video_id))
+            time_mock.return_value += 1
+            store.get(_key("a"))
+
+            time_mock.return_value += 1
+            store.put(_key("c"), _transcript("c"))
+
+            assert store.get(_key("b")) is None
+            assert store.get(_key("a")) is not None
+            assert store.get(_key("c")) is not None
+            assert store.stats.evictions == 1
+            store.close()
+
+    def test_find(self, tmp_path):
+        with SQLiteTranscriptStore(tmp_path / "store.sqlite3") as store:
+            store.put(_key(), _transcript())
+
+            assert store.find("video_id", ["de", "en"], False) is None
+
+            store.put_selection("video_id", ["de", "en"], "en", False)
+
+            assert store.find("video_id", ["de", "en"], False) == _transcript()
+            assert store.find("video_id", ["en"], False) is None
+            assert store.find("video_id", ["de", "en"], True) is None
+
+    def test_put__lazily_parsed_transcript(self, tmp_path):
+        payload = (
+            '<transcript><text start="0" dur="1.5">ünicode &amp;amp;</text></transcript>'
+        ).encode()
+        transcript = replace(_transcript(), snippets=_LazyColumnarSnippets(payload))
+        with SQLiteTranscriptStore(tmp_path / "store.sqlite3") as store:
+            store.put(_key(), transcript)
+            stored_transcript = store.get(_key())
+
+        assert not transcript.snippets.is_parsed
+        assert not stored_transcript.snippets.is_parsed
+        assert stored_transcript.payload == payload
+        assert stored_transcript == transcript
+        assert stored_transcript[0].text == "ünicode &"
+
+    def test_encode__compact(self):
+        transcript = _transcript(snippet_count=1000)
+
+        encoded = SQLiteTranscriptStore._encode(transcript)
+
+        assert SQLiteTranscriptStore._decode("video_id", encoded) == transcript
+        assert len(encoded) < len(str(transcript.to_raw_data()).encode()) / 5
@@ -1,9 +1,14 @@
-from unittest import TestCase
+import io
+from dataclasses import replace
+from unittest import TestCase, skipIf
+from unittest.mock import patch
 
 import json
 
 import pprint
 
+from youtube_transcript_api import formatters, json_backends
+from youtube_transcript_api.json_backends import OrjsonBackend, StdlibJsonBackend
 from youtube_transcript_api.formatters import (
     FetchedTranscript,
     FetchedTranscriptSnippet,
@@ -17,6 +22,16 @@ from youtube_transcript_api.formatters import (
 )
 
 
+class _FailingJsonBackend(json_backends.JsonBackend):
+    name = "failing"
+
+    def loads(self, data):
+        raise AssertionError("the default backend has been used")
+
+    def dumps(self, obj, **kwargs):
+        raise AssertionError("the default backend has been used")
+
+
 class TestFormatters(TestCase):
     def setUp(self):
         self.transcript = FetchedTranscript(
@@ -105,6 +120,47 @@ class TestFormatters(TestCase):
             formatted_single_transcript + "\n\n\n" + formatted_single_transcript,
         )
 
+    def test_text_based_formatters__same_as_seconds_to_timestamp(self):
+        times = [0, 0.5, 1.54, 5.7, 59.999, 116.99999999999999, 0.99999, 3599.9996]
+        times += [3600.0, 86399.123, 359999.5, 2.5e9, -1.25]
+        transcript = replace(
+            self.transcript,
+            snippets=[
+                FetchedTranscriptSnippet(text=str(i), start=start, duration=duration)
+                for i, (start, duration) in enumerate(
+                    zip(times, [2.5, 0.0, 1e-4, 0.3, 3599.9996, 0, 1, 4.16])
+                )
+            ]
+            + [
+                FetchedTranscriptSnippet(text="last", start=start, duration=0.001)
+                for start in times[8:]
+            ],
+        )
+        numpy_options = [formatters.numpy, None] if formatters.numpy else [None]
+        for formatter in (SRTFormatter(), WebVTTFormatter()):
+            cues = []
+            for i, snippet in enumerate(transcript.snippets):
+                end = snippet.start + snippet.duration
+                if i < len(transcript) - 1 and transcript.snippets[i + 1].start < end:
+                    end = transcript.snippets[i + 1].start
+                time_text = "{} --> {}".format(
+                    formatter._seconds_to_timestamp(snippet.start),
+                    formatter._seconds_to_timestamp(end),
+                )
+                cues.append(formatter._format_transcript_helper(i, time_text, snippet))
+            expected_content = formatter._format_transcript_header(cues)
+            for numpy in numpy_options:
+                for snippets in (transcript, transcript.compact()):
+                    with self.subTest(
+                        type(formatter).__name__,
+                        numpy=numpy is not None,
+                        compact=snippets is not transcript,
+                    ):
+                        with patch.object(formatters, "numpy", numpy):
+                            content = formatter.format_transcript(snippets)
+
+                        self.assertEqual(content, expected_content)
+
     def test_pretty_print_formatter(self):
         content = PrettyPrintFormatter().format_transcript(self.transcript)
 
@@ -125,6 +181,102 @@ class TestFormatters(TestCase):
 
         self.assertEqual(json.loads(content), self.transcripts_raw)
 
+    def test_json_formatter__same_as_json_dumps(self):
+        compact_transcript = replace(
+            self.transcript.compact(),
+            snippets=[
+                *self.transcript,
+                FetchedTranscriptSnippet(text='"ünicode" {}\n', start=1e20, duration=0),
+            ],
+        ).compact()
+        formatter = JSONFormatter(json_backend=StdlibJsonBackend())
+        for kwargs in (
+            {},
+            {"ensure_ascii": False},
+            {"separators": (",", ":")},
+            {"separators": None},
+            {"indent": 2},
+            {"indent": 2, "separators": None},
+        ):
+            with self.subTest(**kwargs):
+                self.assertEqual(
+                    compact_transcript.to_json(**kwargs),
+                    json.dumps(compact_transcript.to_raw_data(), **kwargs),
+                )
+                self.assertEqual(
+                    formatter.format_transcript(compact_transcript, **kwargs),
+                    json.dumps(compact_transcript.to_raw_data(), **kwargs),
+                )
+                self.assertEqual(
+                    "".join(
+                        formatter.iter_format_transcript(compact_transcript, **kwargs)
+                    ),
+                    json.dumps(compact_transcript.to_raw_data(), **kwargs),
+                )
+                self.assertEqual(
+                    formatter.format_transcripts(
+                        [compact_transcript, self.transcript], **kwargs
+                    ),
+                    json.dumps(
+                        [compact_transcript.to_raw_data(), self.transcript_raw],
+                        **kwargs,
+                    ),
+                )
+
+    def test_json_formatter__default_backend_same_as_json_dumps(self):
+        compact_transcript = self.transcript.compact()
+        default_backend = json_backends.get_default_json_backend()
+        for backend in (StdlibJsonBackend(), _FailingJsonBackend()):
+            with self.subTest(type(backend).__name__):
+                json_backends.set_default_json_backend(backend)
+                try:
+                    formatter = JSONFormatter()
+                    content = formatter.format_transcript(compact_transcript)
+                    many_content = formatter.format_transcripts(self.transcripts)
+                finally:
+                    json_backends.set_default_json_backend(default_backend)
+
+                self.assertEqual(content, json.dumps(self.transcript_raw))
+                self.assertEqual(many_content, json.dumps(self.transcripts_raw))
+
+    def test_json_formatter__non_finite_numbers(self):
+        transcript = replace(
+            self.transcript,
+            snippets=[
+                FetchedTranscriptSnippet(text="", start=float("inf"), duration=0)
+            ],
+        ).compact()
+
+        self.assertEqual(
+            JSONFormatter().format_transcript(transcript),
+            '[{"text": "", "start": Infinity, "duration": 0.0}]',
+        )
+
+    @skipIf(json_backends.orjson is None, "orjson is not installed")
+    def test_json_formatter__orjson_backend(self):
+        formatter = JSONFormatter(json_backend=OrjsonBackend())
+        transcript = replace(
+            self.transcript,
+            snippets=[FetchedTranscriptSnippet(text="ünicode", start=1e20, duration=1)],
+        ).compact()
+
+        for kwargs in ({}, {"indent": 2}, {"indent": 4}):
+            with self.subTest(**kwargs):
+                self.assertEqual(
+                    json.loads(formatter.format_transcript(transcript, **kwargs)),
+                    transcript.to_raw_data(),
+                )
+                self.assertEqual(
+                    json.loads(
+                        formatter.format_transcripts(self.transcripts, **kwargs)
+                    ),
+                    self.transcripts_raw,
+                )
+        self.assertEqual(
+            formatter.format_transcript(transcript),
+            '[{"text":"ünicode","start":1e20,"duration":1.0}]',
+        )
+
     def test_text_formatter(self):
         content = TextFormatter().format_transcript(self.transcript)
         lines = content.split("\n")
@@ -142,6 +294,234 @@ class TestFormatters(TestCase):
             formatted_single_transcript + "\n\n\n" + formatted_single_transcript,
         )
 
+    def _streaming_test_transcripts(self):
+        long_transcript = replace(
+            self.transcript,
+            snippets=[
+                FetchedTranscriptSnippet(text=f"line {i}", start=i * 0.7, duration=1)
+                for i in range(2500)
+            ],
+        ).compact()
+        empty_transcript = replace(self.transcript, snippets=[])
+        return [self.transcript, long_transcript, empty_transcript]
+
+    def test_iter_format_transcript__same_as_format_transcript(self):
+        for formatter_type in FormatterLoader.TYPES:
+            formatter = FormatterLoader().load(formatter_type)
+            for transcript in self._streaming_test_transcripts():
+                with self.subTest(formatter_type, snippets=len(transcript)):
+                    self.assertEqual(
+                        "".join(formatter.iter_format_transcript(transcript)),
+                        formatter.format_transcript(transcript),
+                    )
+
+    def test_iter_format_transcripts__same_as_format_transcripts(self):
+        transcripts = self._streaming_test_transcripts()
+        for formatter_type in FormatterLoader.TYPES:
+            formatter = FormatterLoader().load(formatter_type)
+            for transcripts_subset in ([], transcripts[:1], transcripts):
+                with self.subTest(formatter_type, transcripts=len(transcripts_subset)):
+                    self.assertEqual(
+                        "".join(
+                            formatter.iter_format_transcripts(iter(transcripts_subset))
+                        ),
+                        formatter.format_transcripts(transcripts_subset),
+                    )
+
+    def test_iter_format_transcript__json_options(self):
+        json_backends_to_test = [StdlibJsonBackend()]
+        if json_backends.orjson is not None:
+            json_backends_to_test.append(OrjsonBackend())
+        transcripts = self._streaming_test_transcripts()
+        for json_backend in json_backends_to_test:
+            formatter = JSONFormatter(json_backend=json_backend)
+            for kwargs in ({"indent": 2}, {"separators": (",", ":")}):
+                with self.subTest(json_backend.name, **kwargs):
+                    self.assertEqual(
+                        "".join(
+                            formatter.iter_format_transcript(transcripts[1], **kwargs)
+                        ),
+                        formatter.format_transcript(transcripts[1], **kwargs),
+                    )
+                    self.assertEqual(
+                        "".join(
+                            formatter.iter_format_transcripts(transcripts, **kwargs)
+                        ),
+                        formatter.format_transcripts(transcripts, **kwargs),
+                    )
+
+    @skipIf(json_backends.orjson is None, "orjson is not installed")
+    def test_iter_format_transcript__orjson_backend_with_null_in_text(self):
+        formatter = JSONFormatter(json_backend=OrjsonBackend())
+        transcript = replace(
+            self.transcript,
+            snippets=[
+                FetchedTranscriptSnippet(text=text, start=i, duration=1.5)
+                for i, text in enumerate(["\u00e9 a", "null pointer", "b", "annulled"])
+            ],
+        ).compact()
+
+        for kwargs, option in (
+            ({}, None),
+            ({"indent": 2}, json_backends.orjson.OPT_INDENT_2),
+        ):
+            with self.subTest(**kwargs), patch.object(formatters, "_CHUNK_SIZE", 2):
+                expected_content = json_backends.orjson.dumps(
+                    transcript.to_raw_data(), option=option
+                ).decode("utf-8")
+                self.assertEqual(
+                    formatter.format_transcript(transcript, **kwargs), expected_content
+                )
+                self.assertEqual(
+                    "".join(formatter.iter_format_transcript(transcript, **kwargs)),
+                    expected_content,
+                )
+
+    def test_iter_format_transcript__pprint_options(self):
+        formatter = PrettyPrintFormatter()
+        short_transcript = replace(self.transcript, snippets=self.transcript[:1])
+        empty_transcript = replace(self.transcript, snippets=[])
+        transcripts = [
+            short_transcript,
+            empty_transcript,
+            *self._streaming_test_transcripts(),
+        ]
+        for kwargs in (
+            {},
+            {"width": 20},
+            {"width": 200},
+            {"width": 1000},
+            {"compact": True},
+            {"compact": True, "width": 200},
+            {"indent": 3},
+            {"depth": 2},
+            {"sort_dicts": False},
+        ):
+            for transcripts_subset in (
+                [],
+                [empty_transcript],
+                [short_transcript],
+                [short_transcript, empty_transcript],
+                transcripts,
+            ):
+                with self.subTest(transcripts=len(transcripts_subset), **kwargs):
+                    self.assertEqual(
+                        "".join(
+                            formatter.iter_format_transcripts(
+                                iter(transcripts_subset), **kwargs
+                            )
+                        ),
+                        formatter.format_transcripts(transcripts_subset, **kwargs),
+                    )
+            for transcript in transcripts:
+                with self.subTest(snippets=len(transcript), **kwargs):
+                    self.assertEqual(
+                        "".join(formatter.iter_format_transcript(transcript, **kwargs)),
+                        formatter.format_transcript(transcript, **kwargs),
+                    )
+
+    def test_iter_pformat_list__same_as_pprint(self):
+        # _iter_pformat_list relies on PrettyPrinter internals, so this compares it to
+        # pprint.pformat directly, on items which make pprint use all of its layouts
+        snippets = [
+            {"text": "short", "start": 0.0, "duration": 1.5},
+            {"text": "a much longer text " * 8, "start": 1.5, "duration": 2.0},
+            {"text": "nested", "start": 3.5, "duration": [1.0, {"text": ["x"] * 30}]},
+        ]
+        items_to_test = [
+            [],
+            [0],
+            ["short", "items"],
+            snippets,
+            [snippets, [], snippets[:1], [snippets]],
+            [[snippet] * 3 for snippet in snippets],
+            ["a string which is long enough to be split " * 4, (1, 2), {1, 2}] * 5,
+            list(range(200)),
+            # the last item has to leave room for the closing bracket
+            *(["-" * 80, "x" * length] for length in range(10, 80)),
+            *(["-" * 80, {"text": "x" * length}] for length in range(10, 80)),
+            *([0] * 20 + [10**length] for length in range(1, 30)),
+        ]
+        for kwargs in (
+            {},
+            {"width": 1},
+            {"width": 20},
+            {"width": 200},
+            {"compact": True},
+            {"compact": True, "width": 20},
+            {"compact": True, "indent": 4},
+            {"indent": 3, "width": 40},
+            {"depth": 1},
+            {"depth": 3},
+            {"sort_dicts": False},
+        ):
+            for items in items_to_test:
+                with self.subTest(items=len(items), **kwargs):
+                    self.assertEqual(
+                        "".join(formatters._iter_pformat_list(iter(items), **kwargs)),
+                        pprint.pformat(items, **kwargs),
+                    )
+
+    def test_iter_format_transcript__streams_in_chunks(self):
+        long_transcript = self._streaming_test_transcripts()[1]
+
+        for formatter in (
+            TextFormatter(),
+            SRTFormatter(),
+            JSONFormatter(),
+            PrettyPrintFormatter(),
+        ):
+            with self.subTest(type(formatter).__name__):
+                self.assertGreater(
+                    len(list(formatter.iter_format_transcript(long_transcript))), 2
+                )
+
+    def test_write_transcripts(self):
+        transcripts = self._streaming_test_transcripts()
+        for formatter_type in FormatterLoader.TYPES:
+            formatter = FormatterLoader().load(formatter_type)
+            fp = io.StringIO()
+
+            formatter.write_transcripts((transcript for transcript in transcripts), fp)
+
+            with self.subTest(formatter_type):
+                self.assertEqual(
+                    fp.getvalue(), formatter.format_transcripts(transcripts)
+                )
+
+    def test_text_based_formatters__compact_transcript_without_snippet_objects(self):
+        compact_transcript = self.transcript.compact()
+
+        for formatter in (TextFormatter(), SRTFormatter(), WebVTTFormatter()):
+            with self.subTest(type(formatter).__name__):
+                expected_content = formatter.format_transcript(self.transcript)
+                with patch.object(
+                    type(compact_transcript.snippets),
+                    "__iter__",
+                    side_effect=AssertionError("snippet objects created"),
+                ):
+                    content = formatter.format_transcript(compact_transcript)
+                    streamed_content = "".join(
+                        formatter.iter_format_transcript(compact_transcript)
+                    )
+
+                self.assertEqual(content, expected_content)
+                self.assertEqual(streamed_content, expected_content)
+
+    def test_text_based_formatter__custom_format_transcript_helper(self):
+        class TimedTextFormatter(SRTFormatter):
+            def _format_transcript_helper(self, i, time_text, snippet):
+                return "{} ({})".format(snippet.text, snippet.duration)
+
+        for transcript in (self.transcript, self.transcript.compact()):
+            content = TimedTextFormatter().format_transcript(transcript)
+
+            self.assertEqual(
+                content,
+                "Test line 1 (1.5)\n\nline between (2.0)\n\n"
+                "testing the end line (3.25)\n",
+            )
+
     def test_formatter_loader(self):
         loader = FormatterLoader()
         formatter = loader.load("json")
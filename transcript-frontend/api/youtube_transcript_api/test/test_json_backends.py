@@ -0,0 +1,78 @@
+from unittest import TestCase, skipIf
+
+from youtube_transcript_api import json_backends
+from youtube_transcript_api.json_backends import (
+    OrjsonBackend,
+    StdlibJsonBackend,
+    get_default_json_backend,
+    set_default_json_backend,
+)
+
+from .test_api import load_asset
+
+
+class TestJsonBackends(TestCase):
+    def _backends(self):
+        backends = [StdlibJsonBackend()]
+        if json_backends.orjson is not None:
+            backends.append(OrjsonBackend())
+        return backends
+
+    def test_loads(self):
+        data = load_asset("youtube_innertube_player.json.static")
+        expected = StdlibJsonBackend().loads(data)
+        for backend in self._backends():
+            with self.subTest(backend=backend.name):
+                self.assertEqual(backend.loads(data), expected)
+                self.assertEqual(backend.loads(data.decode("utf-8")), expected)
+                with self.assertRaises(ValueError):
+                    backend.loads(b'{"a": ')
+
+    def test_dumps__semantically_identical(self):
+        obj = {
+            "text": 'ünicode "quoted" null',
+            "numbers": [0.1, 1e20, -3, 2**40],
+            "nested": {"empty": [], "flag": True},
+        }
+        for backend in self._backends():
+            for kwargs in ({}, {"indent": 2}, {"sort_keys": True}):
+                with self.subTest(backend=backend.name, **kwargs):
+                    self.assertEqual(
+                        StdlibJsonBackend().loads(backend.dumps(obj, **kwargs)), obj
+                    )
+
+    @skipIf(json_backends.orjson is None, "orjson is not installed")
+    def test_dumps__orjson_keeps_non_finite_floats(self):
+        self.assertEqual(
+            OrjsonBackend().dumps([float("inf"), float("nan")]), "[Infinity,NaN]"
+        )
+
+    @skipIf(json_backends.orjson is None, "orjson is not installed")
+    def test_dumps__orjson_formats_null_like_orjson(self):
+        obj = [
+            {"text": "\u00e9 a", "start": 0.0, "duration": 1.5},
+            {"text": "null", "start": 1.5, "duration": 2.0},
+            {"text": "annulled", "start": 3.5, "duration": None},
+        ]
+        for kwargs, option in (
+            ({}, None),
+            ({"indent": 2}, json_backends.orjson.OPT_INDENT_2),
+        ):
+            with self.subTest(**kwargs):
+                self.assertEqual(
+                    OrjsonBackend().dumps(obj, **kwargs),
+                    json_backends.orjson.dumps(obj, option=option).decode("utf-8"),
+                )
+
+    def test_default_backend(self):
+        default_backend = get_default_json_backend()
+        self.assertIsInstance(
+            default_backend,
+            StdlibJsonBackend if json_backends.orjson is None else OrjsonBackend,
+        )
+        backend = StdlibJsonBackend()
+        try:
+            set_default_json_backend(backend)
+            self.assertIs(get_default_json_backend(), backend)
+        finally:
+            set_default_json_backend(default_backend)
@@ -0,0 +1,199 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from typing import Dict, Optional
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from youtube_transcript_api import YouTubeRequestFailed
+from youtube_transcript_api.retries import RetryBudget, RetryPolicy
+
+
+def _request_failed(
+    status_code: int, headers: Optional[Dict[str, str]] = None
+) -> YouTubeRequestFailed:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return YouTubeRequestFailed(
+        "video_id", requests.HTTPError(str(status_code), response=response)
+    )
+
+
+class _FailingFunction:
+    """
+    Raises the given exceptions, one per call, and returns "result" afterward.
+    """
+
+    def __init__(self, *exceptions: Exception):
+        self._exceptions = list(exceptions)
+        self.calls = 0
+
+    def __call__(self) -> str:
+        self.calls += 1
+        if self._exceptions:
+            raise self._exceptions.pop(0)
+        return "result"
+
+
+@pytest.fixture
+def sleep():
+    with patch("youtube_transcript_api.retries.time.sleep") as sleep_mock:
+        yield sleep_mock
+
+
+@pytest.fixture
+def max_jitter():
+    with patch(
+        "youtube_transcript_api.retries.random.uniform", side_effect=lambda a, b: b
+    ) as uniform_mock:
+        yield uniform_mock
+
+
+class TestRetryBudget:
+    def test_withdraw__until_exhausted(self):
+        budget = RetryBudget(max_tokens=2)
+
+        assert [budget.withdraw() for _ in range(3)] == [True, True, False]
+
+    def test_deposit(self):
+        budget = RetryBudget(retry_ratio=0.5, max_tokens=2)
+        budget.withdraw()
+        budget.withdraw()
+
+        budget.deposit()
+        assert not budget.withdraw()
+        budget.deposit()
+        assert budget.withdraw()
+
+    def test_deposit__capped_at_max_tokens(self):
+        budget = RetryBudget(retry_ratio=1, max_tokens=2)
+
+        for _ in range(10):
+            budget.deposit()
+
+        assert budget.tokens == 2
+
+
+class TestRetryPolicy:
+    def test_call(self, sleep):
+        function = _FailingFunction()
+
+        assert RetryPolicy().call(function) == "result"
+        assert function.calls == 1
+        sleep.assert_not_called()
+
+    def test_call__retries_transient_errors(self, sleep):
+        function = _FailingFunction(_request_failed(503), _request_failed(429))
+
+        assert RetryPolicy(budget=RetryBudget()).call(function) == "result"
+        assert function.calls == 3
+        assert sleep.call_count == 2
+
+    def test_call__exponential_backoff_with_full_jitter(self, sleep, max_jitter):
+        function = _FailingFunction(*(_request_failed(500) for _ in range(5)))
+        policy = RetryPolicy(
+            max_retries=5, base_delay=1, max_delay=10, budget=RetryBudget()
+        )
+
+        policy.call(function)
+
+        assert [call.args[0] for call in sleep.call_args_list] == [1, 2, 4, 8, 10]
+        assert all(call.args[0] == 0 for call in max_jitter.call_args_list)
+
+    def test_call__not_retried_on_permanent_errors(self, sleep):
+        function = _FailingFunction(_request_failed(404))
+
+        with pytest.raises(YouTubeRequestFailed):
+            RetryPolicy(budget=RetryBudget()).call(function)
+        assert function.calls == 1
+        sleep.assert_not_called()
+
+    def test_call__retry_status_codes(self, sleep):
+        function = _FailingFunction(_request_failed(404))
+        policy = RetryPolicy(retry_status_codes=[404], budget=RetryBudget())
+
+        assert policy.call(function) == "result"
+
+    def test_call__raises_after_max_retries(self, sleep):
+        function = _FailingFunction(*(_request_failed(503) for _ in range(10)))
+
+        with pytest.raises(YouTubeRequestFailed):
+            RetryPolicy(max_retries=2, budget=RetryBudget()).call(function)
+        assert function.calls == 3
+
+    def test_call__raises_if_budget_exhausted(self, sleep):
+        budget = RetryBudget(retry_ratio=0, max_tokens=1)
+        policy = RetryPolicy(budget=budget)
+
+        assert policy.call(_FailingFunction(_request_failed(503))) == "result"
+        with pytest.raises(YouTubeRequestFailed):
+            policy.call(_FailingFunction(_request_failed(503)))
+        assert sleep.call_count == 1
+
+    def test_call__waits_for_retry_after(self, sleep):
+        function = _FailingFunction(_request_failed(429, {"Retry-After": "7"}))
+
+        RetryPolicy(base_delay=0.1, max_delay=10, budget=RetryBudget()).call(function)
+
+        sleep.assert_called_once_with(7)
+
+    def test_call__raises_if_retry_after_exceeds_max_delay(self, sleep):
+        budget = RetryBudget()
+        function = _FailingFunction(_request_failed(429, {"Retry-After": "60"}))
+
+        with pytest.raises(YouTubeRequestFailed):
+            RetryPolicy(max_delay=10, budget=budget).call(function)
+        sleep.assert_not_called()
+        assert budget.tokens == 10
+
+    def test_acall__retries_transient_errors(self):
+        function = _FailingFunction(_request_failed(503))
+
+        async def call_function():
+            return function()
+
+        with patch("youtube_transcript_api.retries.asyncio.sleep") as sleep_mock:
+            policy = RetryPolicy(budget=RetryBudget())
+            assert asyncio.run(policy.acall(call_function)) == "result"
+        assert function.calls == 2
+        sleep_mock.assert_called_once()
+
+    def test_backoff__withdraws_from_budget(self):
+        budget = RetryBudget(max_tokens=1)
+        policy = RetryPolicy(budget=budget)
+
+        assert 0 <= policy.backoff(0) <= 0.5
+        assert policy.backoff(0) is None
+
+
+class TestRetryAfter:
+    def test_seconds(self):
+        assert _request_failed(429, {"Retry-After": "120"}).retry_after == 120
+
+    def test_http_date(self):
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=120)
+        exception = _request_failed(
+            503, {"Retry-After": format_datetime(retry_at, usegmt=True)}
+        )
+
+        assert 110 < exception.retry_after <= 120
+
+    def test_http_date__in_the_past(self):
+        exception = _request_failed(
+            503, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}
+        )
+
+        assert exception.retry_after == 0
+
+    def test_missing_or_invalid(self):
+        assert _request_failed(503).retry_after is None
+        assert _request_failed(503, {"Retry-After": "soon"}).retry_after is None
+
+    def test_without_response(self):
+        exception = YouTubeRequestFailed("video_id", Exception("failed"))
+
+        assert exception.status_code is None
+        assert exception.retry_after is None
@@ -0,0 +1,648 @@
+import copy
+import pickle
+import re
+from dataclasses import FrozenInstanceError, replace
+from html import unescape
+from typing import List
+from unittest import TestCase
+from unittest.mock import patch
+
+from defusedxml import ElementTree, EntitiesForbidden
+from requests import Session
+
+from youtube_transcript_api import (
+    FetchedTranscript,
+    FetchedTranscriptSnippet,
+    YouTubeDataUnparsable,
+)
+from youtube_transcript_api._transcripts import (
+    _ColumnarSnippets,
+    _LazyColumnarSnippets,
+    TranscriptList,
+    _TranscriptParser,
+    _TranscriptPullParser,
+    _Json3TranscriptParser,
+    _Srv3TranscriptParser,
+    _COMPACT_FORMAT_ERRORS,
+    _JsVarParser,
+    _WatchPage,
+    _WatchPageReader,
+    TranscriptListFetcher,
+)
+
+from .test_api import get_asset_path
+
+
+class TestJsVarParser(TestCase):
+    def setUp(self):
+        self.parser = _JsVarParser("ytInitialPlayerResponse")
+        self.html = (
+            "<script>var ytInitialPlayerResponse = {"
+            '"streamingData": {"captions": "nested", "formats": [{"url": "a}b"}]}, '
+            '"playabilityStatus" : {"status": "OK"},\n'
+            '"captions": {"playerCaptionsTracklistRenderer": {"captionTracks": []}}, '
+            '"microformat": {"title": "\\"}"}'
+            "};</script>"
+        )
+
+    def test_parse(self):
+        var = self.parser.parse(self.html, "video_id")
+
+        self.assertEqual(
+            list(var.keys()),
+            ["streamingData", "playabilityStatus", "captions", "microformat"],
+        )
+
+    def test_parse_members(self):
+        members = self.parser.parse_members(
+            self.html, "video_id", ("playabilityStatus", "captions")
+        )
+
+        self.assertEqual(
+            members,
+            {
+                "playabilityStatus": {"status": "OK"},
+                "captions": {"playerCaptionsTracklistRenderer": {"captionTracks": []}},
+            },
+        )
+
+    def test_parse_members__missing_member(self):
+        members = self.parser.parse_members(
+            self.html, "video_id", ("playabilityStatus", "storyboards")
+        )
+
+        self.assertEqual(members, {"playabilityStatus": {"status": "OK"}})
+
+    def test_parse_members__unescapes_html_entities(self):
+        members = self.parser.parse_members(
+            'var ytInitialPlayerResponse = {"captions": {"baseUrl": "/a?b=1&amp;c=2"}}',
+            "video_id",
+            ("captions",),
+        )
+
+        self.assertEqual(members, {"captions": {"baseUrl": "/a?b=1&c=2"}})
+
+    def test_parse_members__unparsable(self):
+        for html in (
+            "<html></html>",
+            "var ytInitialPlayerResponse = {",
+            'var ytInitialPlayerResponse = {"captions" {}}',
+            'var ytInitialPlayerResponse = {"a": 1 "captions": {}}',
+        ):
+            with self.assertRaises(YouTubeDataUnparsable):
+                self.parser.parse_members(html, "video_id", ("captions",))
+
+
+class TestWatchPage(TestCase):
+    def _load_page(self, filename: str) -> _WatchPage:
+        return _WatchPage(get_asset_path(filename).read_bytes())
+
+    def test_watch_page(self):
+        page = self._load_page("youtube.html.static")
+
+        self.assertGreater(page.player_response_start, 0)
+        self.assertFalse(page.requires_consent)
+
+    def test_player_response_script(self):
+        page = self._load_page("youtube.html.static")
+
+        script = page.player_response_script()
+
+        self.assertTrue(script.startswith("var ytInitialPlayerResponse = {"))
+        self.assertNotIn("</script", script)
+        self.assertNotEqual(
+            _JsVarParser("ytInitialPlayerResponse").find_var_end(script), -1
+        )
+
+    def test_player_response_script__decodes_page_encoding(self):
+        html = '<script>var ytInitialPlayerResponse = {"a": "café"};</script>'
+        page = _WatchPage(html.encode("latin-1"), "latin-1")
+
+        self.assertEqual(
+            page.player_response_script(),
+            'var ytInitialPlayerResponse = {"a": "café"};',
+        )
+
+    def test_player_response_script__without_player_response(self):
+        page = self._load_page("youtube_consent_page.html.static")
+
+        self.assertEqual(page.player_response_script(), "")
+
+    def test_consent_page(self):
+        page = self._load_page("youtube_consent_page.html.static")
+
+        self.assertEqual(page.player_response_start, -1)
+        self.assertTrue(page.requires_consent)
+        self.assertEqual(page.consent_value, "cb.20210328-17-p0.de+FX+119")
+
+    def test_consent_page__without_consent_value(self):
+        page = self._load_page("youtube_consent_page_invalid.html.static")
+
+        self.assertTrue(page.requires_consent)
+        self.assertIsNone(page.consent_value)
+
+    def test_recaptcha_page(self):
+        page = self._load_page("youtube_too_many_requests.html.static")
+
+        self.assertEqual(page.player_response_start, -1)
+        self.assertFalse(page.requires_consent)
+        self.assertTrue(page.has_recaptcha)
+
+
+class TestWatchPageReader(TestCase):
+    def _read(self, html: bytes, chunk_size: int) -> _WatchPageReader:
+        reader = _WatchPageReader()
+        for chunk_start in range(0, len(html), chunk_size):
+            if reader.feed(html[chunk_start : chunk_start + chunk_size]):
+                break
+        return reader
+
+    def test_feed__stops_after_player_response(self):
+        html = get_asset_path("youtube.html.static").read_bytes()
+        player_response_start = _WatchPage(html).player_response_start
+        player_response = html[player_response_start:].decode()
+        player_response_end = player_response_start + len(
+            player_response[
+                : _JsVarParser("ytInitialPlayerResponse").find_var_end(player_response)
+            ].encode()
+        )
+        for chunk_size in (7, 1000, 16 * 1024):
+            with self.subTest(chunk_size=chunk_size):
+                reader = self._read(html, chunk_size)
+
+                self.assertTrue(reader.is_complete)
+                self.assertGreaterEqual(len(reader.html), player_response_end)
+                self.assertLess(len(reader.html), player_response_end + chunk_size)
+                self.assertEqual(reader.html, html[: len(reader.html)])
+
+    def test_feed__braces_in_strings(self):
+        html = (
+            b'var ytInitialPlayerResponse = {"a": "}}}", "b": {"c": "{"}};'
+            b"</script><p>rest of the page</p>"
+        )
+        reader = self._read(html, 10)
+
+        self.assertTrue(reader.is_complete)
+        self.assertEqual(reader.html, html[:60])
+
+    def test_feed__extra_closing_braces_in_strings(self):
+        html = (
+            b'var ytInitialPlayerResponse = {"a": "}}}}", "b": "'
+            + b"x" * 10000
+            + b'"};</script>'
+            + b"<p>rest of the page</p>" * 1000
+        )
+
+        with patch.object(
+            _JsVarParser,
+            "find_var_end",
+            autospec=True,
+            side_effect=_JsVarParser.find_var_end,
+        ) as find_var_end:
+            reader = self._read(html, 10)
+
+        self.assertTrue(reader.is_complete)
+        self.assertLess(len(reader.html), len(html))
+        # the decoding isn't retried with each of the 1000 chunks of the response
+        self.assertLess(find_var_end.call_count, 20)
+
+    def test_feed__reads_whole_page_without_player_response(self):
+        html = get_asset_path("youtube_consent_page.html.static").read_bytes()
+        reader = self._read(html, 1000)
+
+        self.assertFalse(reader.is_complete)
+        self.assertEqual(reader.html, html)
+
+
+class TestTranscriptListFetcher(TestCase):
+    def _extract_captions_json(self, html: bytes):
+        fetcher = TranscriptListFetcher(Session(), proxy_config=None)
+        try:
+            return fetcher._extract_captions_json(
+                fetcher._extract_video_data(_WatchPage(html), "video_id"), "video_id"
+            )
+        except Exception as exception:
+            return type(exception)
+
+    def test_extract_captions_json__same_as_with_unescaped_page(self):
+        for path in get_asset_path("").glob("youtube*.html.static"):
+            raw_html = path.read_bytes()
+            with self.subTest(asset=path.name):
+                self.assertEqual(
+                    self._extract_captions_json(raw_html),
+                    self._extract_captions_json(unescape(raw_html.decode()).encode()),
+                )
+
+
+def _legacy_parse(raw_data: str, preserve_formatting: bool):
+    if preserve_formatting:
+        formats_regex = "|".join(_TranscriptParser._FORMATTING_TAGS)
+        formats_regex = r"<\/?(?!\/?(" + formats_regex + r")\b).*?\b>"
+        html_regex = re.compile(formats_regex, re.IGNORECASE)
+    else:
+        html_regex = re.compile(r"<[^>]*>", re.IGNORECASE)
+    return [
+        FetchedTranscriptSnippet(
+            text=re.sub(html_regex, "", unescape(xml_element.text)),
+            start=float(xml_element.attrib["start"]),
+            duration=float(xml_element.attrib.get("dur", "0.0")),
+        )
+        for xml_element in ElementTree.fromstring(raw_data)
+        if xml_element.text is not None
+    ]
+
+
+class TestTranscriptParser(TestCase):
+    TEXTS = [
+        "plain text",
+        "it&amp;#39;s &amp;quot;quoted&amp;quot; &amp;amp;amp; &#39;&#x1F600;",
+        "&lt;i&gt;italic&lt;/i&gt; &lt;B>bold&lt;/B> &lt;font color=&quot;red&quot;&gt;red",
+        "&lt;br/&gt;&lt;b&gt;swallowed&lt;//b&gt; &lt;bold&gt; &lt;sup2&gt; &lt;/ i&gt;",
+        "&lt;em class=x&gt;a &lt;\nb&gt; &lt; x &lt;&gt; y&gt; &lt;/&gt; _&gt; \u00fc&gt;",
+        "unterminated &lt;a &lt;b &lt;/i &lt;c",
+        " ",
+    ]
+    ELEMENTS = [
+        '<text start="0" dur="1.54">{}</text>',
+        '<text start="1.54">{}</text>',
+        '<text dur="2" start="5.7" lang="en">{}</text>',
+        '<text start="7"></text><text start="8"/>',
+        '<text  start = "1e3"  dur="0" >{}</text >',
+    ]
+
+    def _document(self, *elements: str, head='<?xml version="1.0" encoding="utf-8" ?>'):
+        return "{}\n<transcript>\n    {}\n</transcript>\n".format(
+            head, "\n    ".join(elements)
+        )
+
+    def assertSameAsLegacyParser(self, raw_data: str):
+        for preserve_formatting in (False, True):
+            for parsed_data in (raw_data, raw_data.encode("utf-8")):
+                with self.subTest(
+                    raw_data=parsed_data, preserve_formatting=preserve_formatting
+                ):
+                    try:
+                        expected = _legacy_parse(raw_data, preserve_formatting)
+                    except Exception as exception:
+                        with self.assertRaises(type(exception)):
+                            _TranscriptParser(preserve_formatting).parse(parsed_data)
+                    else:
+                        self.assertEqual(
+                            _TranscriptParser(preserve_formatting).parse(parsed_data),
+                            expected,
+                        )
+
+    def _same_as_legacy_parser_documents(self) -> List[str]:
+        return [
+            get_asset_path("transcript.xml.static").read_text(encoding="utf-8"),
+            *(
+                self._document(*(element.format(text) for text in self.TEXTS))
+                for element in self.ELEMENTS
+            ),
+            self._document(
+                '<text start="1">&#38;amp;lt;</text>',
+                '<text start="2">&amp;#60; &#x26;#x3C; &#38;#38;</text>',
+            ),
+        ]
+
+    def test_parse__same_as_legacy_parser(self):
+        for raw_data in self._same_as_legacy_parser_documents():
+            self.assertSameAsLegacyParser(raw_data)
+
+    def test_parse__same_as_legacy_parser__in_segments(self):
+        for segment_size in (1, 100, 1000):
+            with patch.object(_TranscriptParser, "_XML_SEGMENT_SIZE", segment_size):
+                for raw_data in self._same_as_legacy_parser_documents():
+                    self.assertSameAsLegacyParser(raw_data)
+                self.test_parse__same_as_legacy_parser__unsupported_xml()
+
+    def test_parse__decodes_encoding(self):
+        raw_data = self._document('<text start="0">caf\u00e9 \u00e0 la carte</text>')
+
+        snippets = _TranscriptParser().parse(raw_data.encode("latin-1"), "latin-1")
+
+        self.assertEqual(snippets.texts, ["caf\u00e9 \u00e0 la carte"])
+
+    def test_parse__same_as_legacy_parser__unsupported_xml(self):
+        element = self.ELEMENTS[0].format(self.TEXTS[2])
+        for raw_data in [
+            self._document(element, head=""),
+            self._document(element, head='<?xml version="1.0"?>\n<!-- comment -->'),
+            self._document(element, "<p start='1'>single quotes</p>"),
+            self._document(element, '<text start="1">a <![CDATA[<b>]]> b</text>'),
+            self._document(element, '<text start="1">a <i>nested</i> b</text>'),
+            self._document(element, '<text start="1">\r\n &#x9; &#13;</text>'),
+            self._document('<text start="1" start="2">duplicate</text>'),
+            self._document('<text start="1" xmlns="urn:x">namespace</text>'),
+            self._document('<text start="1">&unknown;</text>'),
+            self._document('<text start="1">&#0;</text>'),
+            self._document('<text start="1">\x01</text>'),
+            self._document('<text start="1">a & b</text>'),
+            self._document('<text dur="1">no start</text>'),
+            self._document('<text start="a">no number</text>'),
+            self._document('<text start="1">unclosed'),
+            self._document(element) + "trailing",
+            "<transcript><text start='1'>other root</text></transcript>".replace(
+                "transcript", "timedtext"
+            ),
+        ]:
+            self.assertSameAsLegacyParser(raw_data)
+
+    def test_parse__entities_forbidden(self):
+        raw_data = self._document(
+            '<text start="1">&lol;</text>',
+            head='<?xml version="1.0"?><!DOCTYPE transcript [<!ENTITY lol "lol">]>',
+        )
+
+        with self.assertRaises(EntitiesForbidden):
+            _TranscriptParser().parse(raw_data)
+
+    def test_parse__preserve_formatting_in_linear_time(self):
+        text = "&lt;a " * 100_000
+        raw_data = self._document('<text start="0">{}</text>'.format(text))
+
+        snippets = _TranscriptParser(preserve_formatting=True).parse(raw_data)
+
+        self.assertEqual(snippets.texts, [unescape(text)])
+
+
+class TestTranscriptPullParser(TestCase):
+    def _pull_parse(self, raw_data: bytes, chunk_size: int, preserve_formatting: bool):
+        parser = _TranscriptPullParser(preserve_formatting)
+        snippets = []
+        for i in range(0, len(raw_data), chunk_size):
+            parser.feed(raw_data[i : i + chunk_size])
+            snippets.extend(parser.read_snippets())
+        parser.close()
+        snippets.extend(parser.read_snippets())
+        return snippets
+
+    def assertSameAsTranscriptParser(self, raw_data: str):
+        for preserve_formatting in (False, True):
+            for chunk_size in (1, 7, len(raw_data.encode())):
+                with self.subTest(
+                    raw_data=raw_data,
+                    preserve_formatting=preserve_formatting,
+                    chunk_size=chunk_size,
+                ):
+                    try:
+                        expected = list(
+                            _TranscriptParser(preserve_formatting).parse(raw_data)
+                        )
+                    except Exception as exception:
+                        with self.assertRaises(type(exception)):
+                            self._pull_parse(
+                                raw_data.encode(), chunk_size, preserve_formatting
+                            )
+                    else:
+                        self.assertEqual(
+                            self._pull_parse(
+                                raw_data.encode(), chunk_size, preserve_formatting
+                            ),
+                            expected,
+                        )
+
+    def test_parse__same_as_transcript_parser(self):
+        self.assertSameAsTranscriptParser(
+            get_asset_path("transcript.xml.static").read_text(encoding="utf-8")
+        )
+        document = TestTranscriptParser()._document
+        for element in TestTranscriptParser.ELEMENTS:
+            self.assertSameAsTranscriptParser(
+                document(*(element.format(text) for text in TestTranscriptParser.TEXTS))
+            )
+        for raw_data in [
+            document('<text start="1">a <i>nested</i> b</text>'),
+            document('<text start="1"><i>nested</i> b</text>'),
+            document('<text dur="1">no start</text>'),
+            document('<text start="1">unclosed'),
+            document('<text start="1">a</text>') + "trailing",
+        ]:
+            self.assertSameAsTranscriptParser(raw_data)
+
+    def test_read_snippets__as_soon_as_element_is_closed(self):
+        parser = _TranscriptPullParser()
+
+        parser.feed(b'<transcript><text start="1">a</text><text start="2">b')
+        first_snippets = parser.read_snippets()
+        parser.feed(b"</text></transcript>")
+
+        self.assertEqual(first_snippets, [FetchedTranscriptSnippet("a", 1.0, 0.0)])
+        self.assertEqual(
+            parser.read_snippets(), [FetchedTranscriptSnippet("b", 2.0, 0.0)]
+        )
+        self.assertEqual(parser.read_snippets(), [])
+
+    def test_parse__entities_forbidden(self):
+        parser = _TranscriptPullParser()
+
+        with self.assertRaises(EntitiesForbidden):
+            parser.feed(
+                b'<?xml version="1.0"?><!DOCTYPE transcript [<!ENTITY lol "lol">]>'
+                b'<transcript><text start="1">&lol;</text></transcript>'
+            )
+
+
+class TestLazyColumnarSnippets(TestCase):
+    def setUp(self):
+        self.payload = get_asset_path("transcript.xml.static").read_bytes()
+
+    def test_parsed_on_first_access(self):
+        snippets = _LazyColumnarSnippets(self.payload)
+
+        self.assertFalse(snippets.is_parsed)
+        self.assertEqual(len(snippets), 3)
+        self.assertTrue(snippets.is_parsed)
+        self.assertEqual(
+            snippets, _TranscriptParser().parse(self.payload.decode("utf-8"))
+        )
+        self.assertEqual(snippets.payload, self.payload)
+
+    def test_parsed_on_first_access__preserve_formatting(self):
+        snippets = _LazyColumnarSnippets(self.payload, preserve_formatting=True)
+
+        self.assertEqual(snippets[1].text, "this is <i>not</i> the original transcript")
+
+    def test_parsed_on_first_access__encoding(self):
+        payload = '<transcript><text start="0">ünicode</text></transcript>'
+
+        snippets = _LazyColumnarSnippets(payload.encode("latin-1"), "latin-1")
+
+        self.assertEqual(snippets.texts, ["ünicode"])
+
+    def test_parsed_on_first_access__exception_if_invalid(self):
+        snippets = _LazyColumnarSnippets(b"<transcript>")
+
+        with self.assertRaises(ElementTree.ParseError):
+            len(snippets)
+
+    def test_payload(self):
+        transcript = FetchedTranscript(
+            snippets=_LazyColumnarSnippets(self.payload),
+            video_id="video_id",
+            language="English",
+            language_code="en",
+            is_generated=False,
+        )
+
+        self.assertEqual(transcript.payload, self.payload)
+        self.assertFalse(transcript.snippets.is_parsed)
+        self.assertIsNone(replace(transcript, snippets=list(transcript)).payload)
+
+    def test_pickle_and_copy(self):
+        snippets = _LazyColumnarSnippets(self.payload)
+
+        for copied in (
+            pickle.loads(pickle.dumps(snippets)),
+            copy.copy(snippets),
+            copy.deepcopy(snippets),
+        ):
+            self.assertFalse(copied.is_parsed)
+            self.assertEqual(copied.payload, self.payload)
+            self.assertEqual(copied, snippets)
+
+
+class TestCompactFormatParsers(TestCase):
+    def setUp(self):
+        self.snippets = _TranscriptParser().parse(
+            get_asset_path("transcript.xml.static").read_text(encoding="utf-8")
+        )
+
+    def test_json3__same_as_xml(self):
+        raw_data = get_asset_path("transcript.json3.static").read_bytes()
+
+        self.assertEqual(_Json3TranscriptParser().parse(raw_data), self.snippets)
+
+    def test_srv3__same_as_xml(self):
+        raw_data = get_asset_path("transcript.srv3.static").read_bytes()
+
+        self.assertEqual(_Srv3TranscriptParser().parse(raw_data), self.snippets)
+
+    def test_unparsable(self):
+        for parser, raw_data in [
+            (_Json3TranscriptParser(), b""),
+            (_Json3TranscriptParser(), b"[]"),
+            (_Json3TranscriptParser(), b'{"events": [{"segs": [{}]}]}'),
+            (_Json3TranscriptParser(), b'{"events": [{"segs": [{"utf8": "a"}]}]}'),
+            (_Srv3TranscriptParser(), b""),
+            (_Srv3TranscriptParser(), b"<timedtext></timedtext>"),
+            (_Srv3TranscriptParser(), b"<timedtext><body><p>a</p></body></timedtext>"),
+            (
+                _Srv3TranscriptParser(),
+                b'<timedtext><body><p t="x">a</p></body></timedtext>',
+            ),
+        ]:
+            with self.subTest(parser=type(parser).__name__, raw_data=raw_data):
+                with self.assertRaises(_COMPACT_FORMAT_ERRORS):
+                    parser.parse(raw_data)
+
+
+class TestColumnarSnippets(TestCase):
+    def setUp(self):
+        self.snippet_list = [
+            FetchedTranscriptSnippet(text="first", start=0.0, duration=1.5),
+            FetchedTranscriptSnippet(text="", start=1.5, duration=0.0),
+            FetchedTranscriptSnippet(text="thïrd ✓", start=2.25, duration=3.0),
+        ]
+        self.snippets = _ColumnarSnippets.from_snippets(self.snippet_list)
+
+    def test_getitem(self):
+        self.assertEqual(self.snippets[0], self.snippet_list[0])
+        self.assertEqual(self.snippets[2], self.snippet_list[2])
+        self.assertEqual(self.snippets[-2], self.snippet_list[1])
+        self.assertEqual(self.snippets[1:], self.snippet_list[1:])
+        self.assertEqual(self.snippets[::-1], self.snippet_list[::-1])
+        with self.assertRaises(IndexError):
+            self.snippets[3]
+        with self.assertRaises(IndexError):
+            self.snippets[-4]
+
+    def test_iter(self):
+        self.assertEqual(list(self.snippets), self.snippet_list)
+        self.assertEqual(len(self.snippets), 3)
+
+    def test_columns(self):
+        self.assertEqual(self.snippets.texts, ["first", "", "thïrd ✓"])
+        self.assertEqual(list(self.snippets.iter_texts()), ["first", "", "thïrd ✓"])
+        self.assertEqual(list(self.snippets.starts), [0.0, 1.5, 2.25])
+        self.assertEqual(list(self.snippets.durations), [1.5, 0.0, 3.0])
+
+    def test_eq(self):
+        self.assertEqual(self.snippets, self.snippet_list)
+        self.assertEqual(self.snippet_list, self.snippets)
+        self.assertEqual(
+            self.snippets, _ColumnarSnippets.from_snippets(self.snippet_list)
+        )
+        self.assertNotEqual(self.snippets, self.snippet_list[:2])
+        self.assertNotEqual(self.snippets, "first")
+
+    def test_init__columns_of_different_lengths(self):
+        with self.assertRaises(ValueError):
+            _ColumnarSnippets(["a", "b"], [0.0], [1.0])
+
+    def test_compact(self):
+        transcript = FetchedTranscript(
+            snippets=self.snippet_list,
+            video_id="video_id",
+            language="English",
+            language_code="en",
+            is_generated=False,
+        )
+
+        compact_transcript = transcript.compact()
+
+        self.assertIsInstance(compact_transcript.snippets, _ColumnarSnippets)
+        self.assertEqual(compact_transcript, transcript)
+        self.assertEqual(compact_transcript.to_raw_data(), transcript.to_raw_data())
+
+
+class TestDataModel(TestCase):
+    def setUp(self):
+        self.transcript = FetchedTranscript(
+            snippets=[FetchedTranscriptSnippet(text="text", start=1.0, duration=2.0)],
+            video_id="video_id",
+            language="English",
+            language_code="en",
+            is_generated=False,
+        ).compact()
+
+    def test_immutable(self):
+        with self.assertRaises(FrozenInstanceError):
+            self.transcript[0].text = "other text"
+        with self.assertRaises(FrozenInstanceError):
+            self.transcript.language = "German"
+        with self.assertRaises(AttributeError):
+            self.transcript[0].speaker = "speaker"
+
+    def test_replace(self):
+        snippet = replace(self.transcript[0], text="other text")
+
+        self.assertEqual(snippet.text, "other text")
+        self.assertEqual(self.transcript[0].text, "text")
+
+    def test_pickle_and_copy(self):
+        for copied in (
+            pickle.loads(pickle.dumps(self.transcript)),
+            copy.copy(self.transcript),
+            copy.deepcopy(self.transcript),
+        ):
+            self.assertEqual(copied, self.transcript)
+
+    def test_transcript_list__shares_translation_languages(self):
+        html = get_asset_path("youtube.html.static").read_bytes()
+        fetcher = TranscriptListFetcher(Session(), proxy_config=None)
+        captions_json = fetcher._extract_captions_json(
+            fetcher._extract_video_data(_WatchPage(html), "video_id"), "video_id"
+        )
+
+        transcript_list = TranscriptList.build(Session(), "video_id", captions_json)
+
+        translatable_transcripts = [
+            transcript for transcript in transcript_list if transcript.is_translatable
+        ]
+        self.assertGreater(len(translatable_transcripts), 1)
+        for transcript in translatable_transcripts:
+            self.assertIs(
+                transcript.translation_languages,
+                translatable_transcripts[0].translation_languages,
+            )